@@ -0,0 +1,96 @@
+"""
+Benchmark of the batch normalization stage (wiki_scraper.normalize, needs pandas)
+against the per-row cleanup the extractors run without it.
+
+    python benchmarks/bench_normalize.py [--films 5000]
+
+A crawl-sized set of raw field values is generated from the samples below: every
+film has release dates, a running time, languages and countries, every credited
+person a birthplace, and the values repeat the way they do across editions. Every
+value is first checked for identical output, then both paths are timed from cold
+memo caches, over the whole set at once (a run) and edition-sized slices of it.
+"""
+import argparse
+import logging
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from wiki_scraper import text  # noqa: E402
+from wiki_scraper.normalize import PER_ROW, normalize_columns  # noqa: E402
+from wiki_scraper.records import Raw  # noqa: E402
+
+MONTHS = ("January", "February", "March", "May", "July", "September", "November", "December")
+PLACES = ("Los Angeles, California, U.S.", "London, England", "Paris, France[1]", "Mumbai, India",
+          "Toronto, Ontario, Canada", "Sydney, New South Wales, Australia", "Rome, Italy[citation needed]")
+LANGUAGES = ("English", "EnglishSpanish", "English French[2]", "Italian", "Hindi\nEnglish")
+COUNTRIES = ("United States", "United Kingdom", "United States\nUnited Kingdom[3]", "FranceGermany", "Japan")
+FESTIVALS = ("", " (Cannes)", " (United States)[4]", " (Venice)", " (Sundance)")
+CREW = 12  # credited people per film
+EDITION = 60  # films per edition
+
+
+def crawl(films, seed=1):
+    rng = random.Random(seed)
+    raws = []
+    for _ in range(films):
+        year = rng.randint(1927, 2025)
+        for _ in range(rng.randint(1, 4)):
+            shape = rng.random()
+            if shape < 0.5:
+                date = f"{rng.choice(MONTHS)} {rng.randint(1, 28)}, {year}"
+            elif shape < 0.9:
+                date = f"{rng.randint(1, 28)} {rng.choice(MONTHS)} {year}"
+            else:
+                date = f"{rng.choice(MONTHS)} {year}"
+            raws.append(Raw("release_date", date + rng.choice(FESTIVALS)))
+        raws.append(Raw("running_time", f"{rng.randint(70, 200)} minutes[{rng.randint(1, 9)}]"))
+        raws.append(Raw("languages", rng.choice(LANGUAGES)))
+        raws.append(Raw("countries", rng.choice(COUNTRIES)))
+        for _ in range(CREW):
+            name = f"Person {rng.randint(1, films * 3)}"
+            raws.append(Raw("birth_country", rng.choice(PLACES), name))
+    return raws
+
+
+def per_row(raws):
+    return {raw: PER_ROW[raw.kind](raw.text, raw.context) for raw in raws}
+
+
+def check(raws):
+    got, want = normalize_columns(raws), per_row(raws)
+    for raw in raws:
+        if got[raw] != want[raw]:
+            raise SystemExit(f"{raw}: {got[raw]!r} != per-row {want[raw]!r}")
+
+
+def timed(fn, batches):
+    text.clear_caches()
+    start = time.perf_counter()
+    for batch in batches:
+        fn(batch)
+    return time.perf_counter() - start
+
+
+def bench(raws, films):
+    per_film = len(raws) // films
+    print(f"{len(raws)} values, {len(set(raws))} distinct")
+    print(f"{'batches':24} {'per-row':>9} {'batch':>9} {'speedup':>8}")
+    for label, size in (("whole run", len(raws)), (f"editions ({EDITION} films)", EDITION * per_film)):
+        batches = [raws[i:i + size] for i in range(0, len(raws), size)]
+        t_row = timed(per_row, batches)
+        t_batch = timed(normalize_columns, batches)
+        print(f"{label:24} {t_row * 1000:7.0f}ms {t_batch * 1000:7.0f}ms {t_row / t_batch:7.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--films", type=int, default=5000)
+    args = parser.parse_args()
+    logging.getLogger("wiki_scraper").setLevel(logging.ERROR)
+    raws = crawl(args.films)
+    check(raws)
+    bench(raws, args.films)
@@ -0,0 +1,236 @@
+"""
+Benchmark of the memoized text helpers in wiki_scraper.text against the
+per-call regex versions they replaced (kept verbatim below as legacy_*).
+
+    python benchmarks/bench_text.py [--rounds 20]
+
+Every sample is first checked for identical output, then each helper is
+timed over the sample set repeated `rounds` times, which mirrors a crawl
+where the same categories, people and dates come back over and over.
+"""
+import argparse
+import logging
+import os
+import re
+import sys
+import timeit
+from datetime import datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from wiki_scraper import text  # noqa: E402
+
+
+def legacy_format_date(date_str):
+    # remove brackets and their content if present
+    date_clean = re.sub(r'\[.*?\]', '', date_str)
+    # remove parenthesized content
+    date_full_clean = re.sub(r'\(.*?\)', '', " ".join(date_clean.split()).replace(',', '')).strip()
+    try:
+        dt = datetime.strptime(date_full_clean, '%d %B %Y')
+    except ValueError:
+        try:
+            dt = datetime.strptime(date_full_clean, '%B %d %Y')  # handle 'March 2 2025' format
+        except ValueError:
+            raise ValueError(f"Date format not recognized: {date_full_clean}")
+    return dt.strftime("%Y-%m-%d")
+
+
+def legacy_format_movie_date(date_str):
+    # Remove citation references like [2], [3]
+    cleaned = re.sub(r'\[\d+\]', '', date_str)
+
+    # Remove ISO date in parentheses (e.g., (2023-5-21))
+    cleaned = re.sub(r'\(\d{4}-\d{1,2}-\d{1,2}\)', '', cleaned).strip()
+
+    # Remove any other parenthesized content (e.g., (Tribeca))
+    cleaned = re.sub(r'\(.*?\)', '', cleaned).strip()
+
+    # Remove any trailing commas or extra spaces
+    cleaned = cleaned.strip(', ')
+
+    # Ensure the cleaned date contains a valid year
+    if not re.search(r'\b\d{4}\b', cleaned):
+        return None
+
+    # Try three common formats: complete and incomplete dates.
+    possible_formats = ["%B %d, %Y", "%d %B %Y", "%B %Y"]
+    for fmt in possible_formats:
+        try:
+            dt = datetime.strptime(cleaned, fmt)
+            return dt.strftime("%Y-%m-%d")  # Always return in YYYY-MM-DD format.
+        except ValueError:
+            continue
+
+    return None
+
+
+def legacy_format_site(site_str):
+    # remove any bracketed content (including newlines)
+    site_clean = re.sub(r'\[.*?\]', '', site_str, flags=re.DOTALL)
+    # remove parentheses while keeping their content intact
+    site_clean = re.sub(r'\((.*?)\)', r'\1', site_clean)
+    # replace any occurrence of "in" surrounded by whitespace (including newlines) with a comma
+    site_clean = re.sub(r'\s+in\s+', ', ', site_clean)
+    # split on both commas and newlines
+    parts = re.split(r'[,\n]+', site_clean)
+    # strip extra whitespace and remove empty strings
+    parts = [p.strip() for p in parts if p.strip()]
+    return parts
+
+
+def legacy_format_person(host_str):
+    if isinstance(host_str, list):
+        formatted_hosts = []
+        for host in host_str:
+            # remove citations and extra characters
+            host_clean = re.sub(r'\[.*?\]', '', host).strip()
+            # if the host string starts with '#', ignore it
+            if host_clean.startswith("#"):
+                continue
+            words = host_clean.split()  # split into a list of words
+            formatted_hosts.extend(words)  # extend the list instead of appending
+        return formatted_hosts
+    else:
+        host_clean = re.sub(r'\[.*?\]', '', host_str).strip()
+        # If the host string starts with '#', return an empty list.
+        if host_clean.startswith("#"):
+            return []
+        return host_clean.split()
+
+
+def legacy_convert_duration_to_minutes(duration_str):
+    total_minutes = 0
+    # look for a pattern like "Xh" (hours)
+    m = re.search(r'(\d+)\s*h', duration_str)
+    if m:
+        hours = int(m.group(1))
+        total_minutes += hours * 60
+    # look for a pattern like "Ym" (minutes)
+    m = re.search(r'(\d+)\s*m', duration_str)
+    if m:
+        minutes = int(m.group(1))
+        total_minutes += minutes
+    # fallback: if no hours/minutes pattern, try to extract a number followed by "minute"
+    if total_minutes == 0:
+        m = re.search(r'(\d+)\s*minute', duration_str, flags=re.IGNORECASE)
+        if m:
+            total_minutes = int(m.group(1))
+    return total_minutes
+
+
+def legacy_clean_producers(producer_text, movie_title=""):
+    """
+    Cleans producer names by removing extra spaces, unwanted phrases, 
+    and ensuring the movie title is not included.
+    """
+    # Remove trailing "producer(s)" if present
+    producer_text = re.sub(r'\s*(producers?|directors?)$', '', producer_text, flags=re.IGNORECASE).strip()
+
+    # Remove unwanted phrases
+    remove_phrases = [
+        "music and lyrics by", "production design:", "directed by", 
+        "screenplay by", "story by", "set decoration:"
+    ]
+    for phrase in remove_phrases:
+        producer_text = re.sub(rf'(?i){phrase}', '', producer_text)
+
+    # Remove text in parentheses or square brackets (e.g., citations like [32])
+    producer_text = re.sub(r'\[.*?\]|\(.*?\)', '', producer_text)
+
+    # Standardize delimiters
+    producer_text = producer_text.replace(" and ", ", ")
+    
+    # Remove movie title if present
+    if movie_title:
+        producer_text = producer_text.replace(movie_title, "").strip()
+
+    # Remove unwanted symbols
+    producer_text = producer_text.replace("–", "").replace("‡", "").replace("*", "").strip()
+
+    # Extract names
+    if "," in producer_text:
+        producers = [p.strip() for p in producer_text.split(",") if p.strip()]
+    else:
+        # Extract names in "First Last" or similar format
+        producers = re.findall(r'([A-Z][a-zA-Z]*(?:\s+[A-Z][a-zA-Z]+)+)', producer_text)
+
+    # Remove unwanted strings (e.g., "edit" or citation markers)
+    producers = [p for p in producers if p.lower() != "edit" and not re.match(r'^\d+$', p)]
+
+    return producers
+
+
+def legacy_clean_category(category_text):
+    # Remove any content in square brackets, then strip and lowercase.
+    return re.sub(r'\[.*?\]', '', category_text).strip().lower()
+
+
+SAMPLES = {
+    "format_date": [
+        "March 10, 2024", "10 March 2024", "February 26, 2012[1]", "April 3, 1930 (1930-04-03)",
+        "March 27, 2022\n(2022-03-27)", "May 16, 1929",
+    ],
+    "format_movie_date": [
+        "July 21, 2023", "11 May 2023 (Cannes)", "July 21, 2023 (United States)[2]",
+        "May 2023", "2 September 2023 (2023-9-2) (Venice)", "Summer 2023", "February 30, 2020",
+    ],
+    "format_site": [
+        "Dolby Theatre\nHollywood, Los Angeles, California", "Shrine Auditorium in Los Angeles[3]",
+        "Hollywood Roosevelt Hotel (Blossom Room)\nLos Angeles",
+    ],
+    "format_person": ["Jimmy Kimmel", "Billy Crystal[4]", "#cite_note-5", "Conan O'Brien"],
+    "convert_duration_to_minutes": ["3 hours, 23 minutes", "210 minutes", "3h 30m", "2 hours"],
+    "clean_producers": [
+        ("Emma Thomas, Charles Roven and Christopher Nolan, producers", "Oppenheimer"),
+        ("Directed by Martin Scorsese[12]", ""),
+        ("Jonathan Glazer – ‡ producer", "The Zone of Interest"),
+    ],
+    "clean_category": ["Best Picture[a]", "Best Actor in a Leading Role", "  Best Director  "],
+}
+
+
+def _call(fn, sample):
+    args = sample if isinstance(sample, tuple) else (sample,)
+    try:
+        return fn(*args)
+    except ValueError as e:
+        return f"ValueError: {e}"
+
+
+def check():
+    for name, samples in SAMPLES.items():
+        new, old = getattr(text, name), globals()[f"legacy_{name}"]
+        for sample in samples:
+            got, want = _call(new, sample), _call(old, sample)
+            if got != want:
+                raise SystemExit(f"{name}({sample!r}): {got!r} != legacy {want!r}")
+
+
+def bench(rounds):
+    # "cold" clears the memo caches before every pass, so it only measures the
+    # precompiled patterns and the date fast path; "warm" is the memoized steady state
+    print(f"{'helper':30} {'legacy':>9} {'cold':>9} {'warm':>9} {'speedup':>8}")
+    for name, samples in SAMPLES.items():
+        new, old = getattr(text, name), globals()[f"legacy_{name}"]
+        work = samples * rounds
+
+        def cold():
+            text.clear_caches()
+            return [_call(new, s) for s in samples]
+
+        t_old = timeit.timeit(lambda: [_call(old, s) for s in work], number=50)
+        t_cold = timeit.timeit(cold, number=50 * rounds)
+        text.clear_caches()
+        t_new = timeit.timeit(lambda: [_call(new, s) for s in work], number=50)
+        print(f"{name:30} {t_old * 1000:7.1f}ms {t_cold * 1000:7.1f}ms {t_new * 1000:7.1f}ms {t_old / t_new:7.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+    # both versions log unparseable dates; that is expected for some samples
+    logging.getLogger("wiki_scraper").setLevel(logging.ERROR)
+    check()
+    bench(args.rounds)
@@ -0,0 +1,183 @@
+"""
+Benchmark of the fetch transports (plain requests.get vs a shared HTTP/2 httpx client)
+against a local server that answers both HTTP/1.1 and h2c after a fixed delay, so the
+numbers show connection handling rather than Wikipedia's or the network's mood.
+
+    pip install 'httpx[http2]'
+    python benchmarks/bench_transport.py [--requests 300] [--threads 32] [--latency 0.05] [--handshake 0.1]
+
+--handshake delays the first answer on every new connection, standing in for the TCP+TLS
+setup a real connection to en.wikipedia.org costs (on bare localhost it is free, which
+flatters opening a connection per request).
+The same thread pool drives both transports, the way scheduler workers call fetch().
+Reported per transport: wall time, median and p95 request latency, and how many TCP
+connections the server accepted.
+"""
+import argparse
+import asyncio
+import concurrent.futures
+import os
+import statistics
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from wiki_scraper import fetch  # noqa: E402
+
+H2_PREFACE = b"PRI * HTTP/2.0\r\n\r\nSM\r\n\r\n"
+
+
+class Server:
+    """Answers every GET with `size` bytes after `latency` seconds, over HTTP/1.1 or h2c."""
+
+    def __init__(self, latency, size, handshake=0.0):
+        self.latency = latency
+        self.handshake = handshake
+        self.body = b"x" * size
+        self.connections = 0
+        self.loop = asyncio.new_event_loop()
+        self.port = None
+
+    def start(self):
+        ready = threading.Event()
+
+        def run():
+            asyncio.set_event_loop(self.loop)
+            server = self.loop.run_until_complete(asyncio.start_server(self._handle, "127.0.0.1", 0))
+            self.port = server.sockets[0].getsockname()[1]
+            ready.set()
+            self.loop.run_forever()
+
+        threading.Thread(target=run, daemon=True).start()
+        ready.wait()
+        return f"http://127.0.0.1:{self.port}"
+
+    async def _handle(self, reader, writer):
+        self.connections += 1
+        await asyncio.sleep(self.handshake)
+        data = await reader.read(65536)
+        try:
+            if data.startswith(H2_PREFACE):
+                await self._http2(reader, writer, data)
+            else:
+                await self._http1(reader, writer, data)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _http1(self, reader, writer, data):
+        while data:
+            while b"\r\n\r\n" not in data:
+                chunk = await reader.read(65536)
+                if not chunk:
+                    return
+                data += chunk
+            _, data = data.split(b"\r\n\r\n", 1)
+            await asyncio.sleep(self.latency)
+            writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: text/html\r\nContent-Length: %d\r\n\r\n" % len(self.body))
+            writer.write(self.body)
+            await writer.drain()
+            if not data:
+                data = await reader.read(65536)
+
+    async def _http2(self, reader, writer, data):
+        import h2.config
+        import h2.connection
+        import h2.events
+
+        conn = h2.connection.H2Connection(config=h2.config.H2Configuration(client_side=False))
+        conn.initiate_connection()
+        pending = {}  # stream id -> body bytes still to send (flow control)
+
+        def flush():
+            for stream_id in list(pending):
+                body = pending[stream_id]
+                while body:
+                    window = min(conn.local_flow_control_window(stream_id), conn.max_outbound_frame_size)
+                    if window <= 0:
+                        break
+                    conn.send_data(stream_id, body[:window], end_stream=len(body) <= window)
+                    body = body[window:]
+                if body:
+                    pending[stream_id] = body
+                else:
+                    del pending[stream_id]
+            writer.write(conn.data_to_send())
+
+        async def respond(stream_id):
+            await asyncio.sleep(self.latency)
+            conn.send_headers(stream_id, [
+                (":status", "200"), ("content-type", "text/html"), ("content-length", str(len(self.body))),
+            ])
+            pending[stream_id] = self.body
+            flush()
+            await writer.drain()
+
+        while data:
+            for event in conn.receive_data(data):
+                if isinstance(event, h2.events.RequestReceived):
+                    asyncio.ensure_future(respond(event.stream_id))
+                elif isinstance(event, h2.events.WindowUpdated):
+                    flush()
+                elif isinstance(event, h2.events.ConnectionTerminated):
+                    return
+            writer.write(conn.data_to_send())
+            await writer.drain()
+            data = await reader.read(65536)
+
+
+def run(url, count, threads):
+    latencies = []
+
+    def one(i):
+        start = time.perf_counter()
+        response = fetch._http_get(f"{url}/wiki/Page_{i}")
+        assert response.status_code == 200, response.status_code
+        latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    with concurrent.futures.ThreadPoolExecutor(threads) as pool:
+        list(pool.map(one, range(count)))
+    wall = time.perf_counter() - start
+    latencies.sort()
+    return wall, statistics.median(latencies), latencies[int(len(latencies) * 0.95) - 1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=300)
+    parser.add_argument("--threads", type=int, default=32)
+    parser.add_argument("--latency", type=float, default=0.05, help="server delay per response in seconds")
+    parser.add_argument("--handshake", type=float, default=0.1,
+                        help="extra delay on every new connection, like a TLS handshake (seconds)")
+    parser.add_argument("--size", type=int, default=200_000, help="response size in bytes")
+    parser.add_argument("--connections", type=int, default=4, help="HTTP/2 connection limit")
+    args = parser.parse_args()
+
+    import httpx
+
+    clients = {
+        "requests.get (HTTP/1.1)": None,
+        # h2c with prior knowledge: the local server has no TLS to negotiate HTTP/2 with
+        "httpx (HTTP/2)": httpx.Client(
+            http1=False, http2=True, timeout=60,
+            limits=httpx.Limits(max_connections=args.connections, max_keepalive_connections=args.connections),
+        ),
+    }
+    print(f"{args.requests} requests, {args.threads} threads, {args.latency * 1000:.0f} ms server latency, "
+          f"{args.handshake * 1000:.0f} ms per new connection, {args.size // 1000} kB per response")
+    for name, client in clients.items():
+        server = Server(args.latency, args.size, args.handshake)
+        url = server.start()
+        fetch.configure_transport(http2=False, client=client)
+        wall, p50, p95 = run(url, args.requests, args.threads)
+        fetch.configure_transport(http2=False)
+        print(f"{name:<26} {wall:6.2f} s wall  p50 {p50 * 1000:6.1f} ms  p95 {p95 * 1000:6.1f} ms  "
+              f"{server.connections:4d} connections")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+import os
+
+from wiki_scraper import archive
+from wiki_scraper.archive import ArchivedResponse, CrawlArchive
+
+
+def page(url, body):
+    return ArchivedResponse(url, 200, "OK", {"content-type": "text/html; charset=utf-8"}, body)
+
+
+def crash(crawl):
+    """Stop writing without close(), so the index is not updated."""
+    crawl._file.close()
+    if crawl._index is not None:
+        crawl._index.close()
+    os.close(crawl._fd)
+
+
+def test_records_are_found_through_the_index_after_reopening(tmp_path):
+    path = str(tmp_path / "crawl.warc.gz")
+    with CrawlArchive(path) as crawl:
+        crawl.append("https://en.wikipedia.org/wiki/Am%C3%A9lie", page("u", b"<p>first</p>"))
+        crawl.append("https://en.wikipedia.org/wiki/Anora", page("u", b"<p>Anora</p>"))
+    with CrawlArchive(path) as crawl:
+        # the same page under another spelling of its URL
+        assert crawl.get("https://en.wikipedia.org/wiki/Amélie").content == b"<p>first</p>"
+        assert "https://en.wikipedia.org/wiki/Conclave" not in crawl
+        crawl.append("https://en.wikipedia.org/wiki/Amélie", page("u", b"<p>second</p>"))
+    with CrawlArchive(path) as crawl:
+        # a page fetched again replaces the older copy
+        assert crawl.get("https://en.wikipedia.org/wiki/Am%C3%A9lie").content == b"<p>second</p>"
+
+
+def test_records_left_unindexed_by_a_crash_are_found_again(tmp_path):
+    path = str(tmp_path / "crawl.warc.gz")
+    with CrawlArchive(path) as crawl:
+        crawl.append("https://en.wikipedia.org/wiki/Anora", page("u", b"<p>Anora</p>"))
+    crawl = CrawlArchive(path)
+    crawl.append("https://en.wikipedia.org/wiki/Conclave", page("u", b"<p>Conclave</p>"))
+    crash(crawl)
+    with CrawlArchive(path) as crawl:
+        assert crawl.get("https://en.wikipedia.org/wiki/Conclave").content == b"<p>Conclave</p>"
+        assert crawl.get("https://en.wikipedia.org/wiki/Anora").content == b"<p>Anora</p>"
+
+
+def test_urls_sharing_a_hash_are_told_apart_by_the_record(tmp_path, monkeypatch):
+    monkeypatch.setattr(archive, "_url_hash", lambda canonical: 42)
+    path = str(tmp_path / "crawl.warc.gz")
+    with CrawlArchive(path) as crawl:
+        crawl.append("https://en.wikipedia.org/wiki/Anora", page("u", b"<p>Anora</p>"))
+        crawl.append("https://en.wikipedia.org/wiki/Conclave", page("u", b"<p>Conclave</p>"))
+    with CrawlArchive(path) as crawl:
+        assert crawl.get("https://en.wikipedia.org/wiki/Anora").content == b"<p>Anora</p>"
+        assert crawl.get("https://en.wikipedia.org/wiki/Conclave").content == b"<p>Conclave</p>"
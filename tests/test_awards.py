@@ -0,0 +1,49 @@
+import pytest
+
+from wiki_scraper import cli
+from wiki_scraper.awards import (
+    ACADEMY_AWARDS, SOURCES, AwardSource, current_source, parse_sources, register_source, source_context,
+    source_editions,
+)
+
+
+class FakeAwards(AwardSource):
+    """A body with its own parsers, as a new award body is added."""
+
+    def scrape_info(self, n):
+        return ("info", current_source().key, n)
+
+    def scrape_awards(self, n):
+        return ("awards", current_source().key, n)
+
+
+@pytest.fixture
+def fake_source(monkeypatch):
+    monkeypatch.setattr("wiki_scraper.awards.SOURCES", dict(SOURCES))
+    return register_source(FakeAwards("fake", "Fake Awards", "{ordinal} Fake Awards", 10))
+
+
+def test_only_bodies_with_checked_parsers_are_registered():
+    assert list(SOURCES) == ["oscars"]
+    with pytest.raises(ValueError):
+        parse_sources("oscars,globes")
+
+
+def test_adapters_run_with_their_source_current(fake_source):
+    assert parse_sources("oscars, fake") == [ACADEMY_AWARDS, fake_source]
+    assert fake_source.ceremony_title(3) == "3rd Fake Awards"
+    assert fake_source.edition_key(3) == "fake:3"
+    with source_context(fake_source):
+        assert fake_source.scrape_info(3) == ("info", "fake", 3)
+    assert current_source() is ACADEMY_AWARDS
+
+
+def test_editions_are_clamped_to_what_each_body_has_held(fake_source):
+    assert source_editions(fake_source) == list(range(10, 0, -1))
+    assert source_editions(fake_source, [12, 10, 9]) == [10, 9]
+    assert source_editions(ACADEMY_AWARDS, [12, 10, 9]) == [12, 10, 9]
+
+
+def test_editions_past_a_bodys_latest_are_rejected():
+    with pytest.raises(SystemExit):
+        cli.main(["-e", str(ACADEMY_AWARDS.latest + 1)])
@@ -0,0 +1,31 @@
+from wiki_scraper.bulkload import _drop_secondary_indexes, _add_indexes
+
+
+class FakeCursor:
+    def __init__(self, statistics, foreign):
+        self.results = {"STATISTICS": statistics, "KEY_COLUMN_USAGE": foreign}
+        self.statements = []
+        self.rows = ()
+
+    def execute(self, query, params=()):
+        self.statements.append(query)
+        self.rows = next((rows for table, rows in self.results.items() if table in query), ())
+
+    def fetchall(self):
+        return self.rows
+
+
+def test_only_plain_indexes_not_needed_by_a_foreign_key_are_dropped():
+    cursor = FakeCursor(
+        [("movie_name_idx", "movie_name", 50), ("movie_title_idx", "wiki_title", None),
+         ("crew_person_idx", "person_id", 8), ("crew_person_idx", "position_id", None)],
+        [("person_id",)],
+    )
+    dropped = _drop_secondary_indexes(cursor, "movie_crew")
+    assert dropped == {"movie_name_idx": ["`movie_name`(50)"], "movie_title_idx": ["`wiki_title`"]}
+    # unique indexes are never selected, so they are never dropped
+    assert "NON_UNIQUE = 1" in cursor.statements[0]
+    assert cursor.statements[-1] == "ALTER TABLE movie_crew DROP INDEX `movie_name_idx`, DROP INDEX `movie_title_idx`"
+    _add_indexes(cursor, "movie_crew", dropped)
+    assert cursor.statements[-1] == ("ALTER TABLE movie_crew ADD INDEX `movie_name_idx` (`movie_name`(50)), "
+                                     "ADD INDEX `movie_title_idx` (`wiki_title`)")
@@ -0,0 +1,29 @@
+from wiki_scraper import scraper
+from wiki_scraper.records import PersonRef
+
+
+def test_people_credited_in_several_rows_are_resolved_once(monkeypatch):
+    batches, inserted = [], []
+
+    def scrape_people(people):
+        batches.append(people)
+        return [(f"born {person.parts[-1]}", None, None) for person, _ in people]
+
+    monkeypatch.setattr(scraper, "scrape_people", scrape_people)
+    monkeypatch.setattr(scraper, "insert_people", inserted.extend)
+    baker = PersonRef(("Sean", "Baker"), "/wiki/Sean_Baker")
+    credits = [
+        ("Director", "director", [baker]),
+        ("Writer", "writer", [PersonRef(("Sean", "Baker"), None)]),
+        ("Producer", "producer", [baker, PersonRef(("Alex", "Coco"), None), PersonRef((), None)]),
+    ]
+    connections = scraper.credit_people("Anora", "Anora", credits)
+    assert len(batches) == 1
+    assert [person for person, _ in batches[0]] == [baker, PersonRef(("Alex", "Coco"), None)]
+    assert [person for person, _ in inserted] == [baker, PersonRef(("Alex", "Coco"), None)]
+    assert connections == [
+        ("Anora", "Sean", "Baker", "born Baker", "Director", "Anora", "/wiki/Sean_Baker"),
+        ("Anora", "Sean", "Baker", "born Baker", "Writer", "Anora", "/wiki/Sean_Baker"),
+        ("Anora", "Sean", "Baker", "born Baker", "Producer", "Anora", "/wiki/Sean_Baker"),
+        ("Anora", "Alex", "Coco", "born Coco", "Producer", "Anora", None),
+    ]
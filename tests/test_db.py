@@ -0,0 +1,45 @@
+import pytest
+
+from wiki_scraper import db
+from wiki_scraper.people import PersonIndex
+
+
+class FakeConnection:
+    def __init__(self, opened):
+        self.opened = opened
+        opened.append(self)
+        self.closed = False
+
+    def cursor(self):
+        return self
+
+    def execute(self, query, params=()):
+        pass
+
+    def fetchone(self):
+        return None
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def connections(monkeypatch):
+    opened = []
+    monkeypatch.setattr(db, "connect_db", lambda **options: FakeConnection(opened))
+    return opened
+
+
+def test_person_exists_answered_by_the_index_opens_no_connection(monkeypatch, connections):
+    index = PersonIndex()
+    index.add(7, "Sean", None, "Baker", "1971-02-26")
+    monkeypatch.setattr(db, "person_index", lambda: index)
+    assert db.person_exists(["Sean", "Baker"], "1971-02-26") == 7
+    assert db.person_exists(["Mikey", "Madison"], "1999-03-25") is None
+    assert connections == []
+
+
+def test_person_exists_closes_the_fallback_connection(monkeypatch, connections):
+    monkeypatch.setattr(db, "person_index", lambda: None)
+    assert db.person_exists(["Mikey", "Madison"], "1999-03-25") is None
+    assert len(connections) == 1 and connections[0].closed
@@ -0,0 +1,39 @@
+import pytest
+
+from wiki_scraper.awards import AwardSource, source_context
+from wiki_scraper.extracts import configure_extracts, close_extracts, extracted
+from wiki_scraper.fetch import configure_memory, low_memory
+
+
+@pytest.fixture
+def cache(tmp_path):
+    configure_extracts(str(tmp_path / "extracts.db"))
+    yield
+    close_extracts()
+
+
+def test_extracts_are_kept_apart_per_mode_and_award_body(cache):
+    page = b"<html>same page</html>"
+    parsed = []
+
+    def parse(label):
+        def run():
+            parsed.append(label)
+            return label
+        return run
+
+    was_low_memory = low_memory()
+    try:
+        configure_memory(low_memory=False)
+        assert extracted("nominations", page, parse("full")) == "full"
+        assert extracted("nominations", page, parse("again")) == "full"
+        with source_context(AwardSource("globes", "Golden Globe Awards", "{ordinal} Golden Globe Awards", 82)):
+            assert extracted("nominations", page, parse("globes")) == "globes"
+            # films and people do not depend on the award body
+            assert extracted("film", page, parse("film")) == "film"
+        assert extracted("film", page, parse("again")) == "film"
+        configure_memory(low_memory=True)
+        assert extracted("nominations", page, parse("trimmed")) == "trimmed"
+    finally:
+        configure_memory(low_memory=was_low_memory)
+    assert parsed == ["full", "globes", "film", "trimmed"]
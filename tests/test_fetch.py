@@ -0,0 +1,53 @@
+import threading
+
+from wiki_scraper import fetch, seen
+from wiki_scraper.pages import PageIndex, page_title
+
+
+class FakeResponse:
+    status_code = 200
+    content = b""
+
+    def __init__(self, url):
+        self.url = url
+
+
+def test_prefetch_skips_stored_pages_and_counts_hits(monkeypatch):
+    fetched = []
+    lock = threading.Lock()
+
+    def fake_fetch(url, page_type=None):
+        with lock:
+            fetched.append(url)
+        return FakeResponse(url)
+
+    index = PageIndex()
+    index.add("person", page_title("/wiki/Sean_Baker"), 1)
+    monkeypatch.setattr(fetch, "_fetch", fake_fetch)
+    monkeypatch.setattr(fetch, "page_index", lambda: index)
+    monkeypatch.setattr(seen, "is_done", lambda key: key == "film:/wiki/Anora")
+    fetch.configure_prefetch(4)
+    try:
+        fetch.prefetch(["/wiki/Sean_Baker", "/wiki/Anora", "/wiki/Mikey_Madison", "/wiki/File:Anora.jpg"])
+        prefetcher = fetch._prefetcher
+        assert prefetcher.take("https://en.wikipedia.org/wiki/Mikey_Madison", "person") is not None
+        assert prefetcher.take("https://en.wikipedia.org/wiki/Sean_Baker", "person") is None
+        assert prefetcher.hits == 1
+    finally:
+        fetch.configure_prefetch(0)
+    assert fetched == ["https://en.wikipedia.org/wiki/Mikey_Madison"]
+
+
+def test_compact_fetches_are_only_compared_with_full_pages_on_request(monkeypatch):
+    full = []
+    monkeypatch.setattr(fetch, "_http_get", lambda url, **kwargs: full.append(url) or FakeResponse(url))
+    monkeypatch.setattr(fetch, "_received", {})
+    monkeypatch.setattr(fetch, "_samples", {})
+    monkeypatch.setattr(fetch, "_compact_samples", 0)
+    response = FakeResponse("https://en.wikipedia.org/wiki/Anora")
+    fetch._count("film", response.url, "lead", response)
+    assert full == []
+    fetch.configure_compact(samples=1)
+    fetch._count("film", response.url, "lead", response)
+    fetch._count("film", response.url, "lead", response)
+    assert full == [response.url]
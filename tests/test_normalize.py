@@ -0,0 +1,31 @@
+import pytest
+
+from wiki_scraper.normalize import PER_ROW, normalize_columns
+from wiki_scraper.records import Raw
+
+pytest.importorskip("pandas")
+
+RELEASE_DATES = (
+    "March 5, 2020", "5 March 2020", "March 2020", "March 5, 2020[1]", "5 March 2020 (Cannes)",
+    # leading and trailing noise the shapes must not search past
+    "5 March 2020 United States", "1999 film March 2001", "Premiere: March 5, 2020", "March 5, 2020 and later",
+    "Released 5 March 2020", "March 2020 (limited), 2021", "February 30, 2020", "30 February 2020",
+    "March 05, 2020", "2020", "TBA", "", ", March 5, 2020 ,",
+)
+BIRTHPLACES = (
+    "", " , ,", "Paris, France,", "Rome, Italy (citation needed)", "London, 1950", "John Smith, Kent",
+    "Berlin , Germany[2] ,\n", "(Ohio)", ", , USA)",
+)
+
+
+@pytest.mark.parametrize("kind, texts, context", [
+    ("release_date", RELEASE_DATES, None),
+    ("birth_country", BIRTHPLACES, "John Smith"),
+    ("running_time", ("96 minutes[1]", "1 minute", "TBA", "100 Minutes"), None),
+    ("duration", ("3h 20m", "3 hours", "190 minutes", ""), None),
+])
+def test_columns_match_the_per_row_path(kind, texts, context):
+    raws = [Raw(kind, text, context) for text in texts]
+    cleaned = normalize_columns(raws)
+    for raw in raws:
+        assert cleaned[raw] == PER_ROW[kind](raw.text, raw.context), raw.text
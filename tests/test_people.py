@@ -0,0 +1,71 @@
+import threading
+import time
+
+from wiki_scraper import db
+from wiki_scraper.pages import PageIndex
+from wiki_scraper.people import PersonIndex
+
+
+class FakeDatabase:
+    """person rows; an INSERT takes a while, so two threads overlap inside it."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.rows = []
+
+    def connect(self, session=None):
+        return FakeConnection(self)
+
+
+class FakeConnection:
+    def __init__(self, database):
+        self.database = database
+        self.lastrowid = None
+
+    def cursor(self):
+        return self
+
+    def execute(self, query, params=()):
+        if query.startswith("INSERT INTO person"):
+            time.sleep(0.05)
+            with self.database.lock:
+                self.database.rows.append(params)
+                self.lastrowid = len(self.database.rows)
+
+    def fetchone(self):
+        return None
+
+    def commit(self):
+        pass
+
+    def close(self):
+        pass
+
+
+def test_index_matches_folded_names_and_spelling_variants():
+    index = PersonIndex()
+    index.add(1, "Pedro", None, "Almodóvar", "1949-09-25")
+    index.add(2, "Alfred", None, "Hitchcock", "1899-08-13")
+    assert index.find("pedro", None, "ALMODOVAR", "1949-09-25") == 1
+    assert index.find("Alfred", None, "Hitchcok", "1899-08-13") == 2
+    assert index.find("Alfred", None, "Hitchcock", "1900-01-01") is None
+    assert index.find("Alfred", None, "Hitchcock", None, any_birth_date=True) == 2
+
+
+def test_two_threads_insert_the_same_new_person_once(monkeypatch):
+    database = FakeDatabase()
+    index = PersonIndex()
+    monkeypatch.setattr(db, "person_index", lambda: index)
+    monkeypatch.setattr(db, "page_index", lambda pages=PageIndex(): pages)
+    monkeypatch.setattr(db, "_connect", database.connect)
+
+    def insert(name):
+        db.insert_people([(name, ("1971-02-26", "United States", None))])
+
+    threads = [threading.Thread(target=insert, args=(name,)) for name in ("Sean Baker", "sean baker")]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(database.rows) == 1
+    assert index.find("Sean", None, "Baker", "1971-02-26") == 1
@@ -0,0 +1,49 @@
+import contextvars
+import threading
+
+from wiki_scraper.scheduler import CostModel, Scheduler, run_tasks
+
+edition = contextvars.ContextVar("edition", default=None)
+
+
+def test_finer_and_costlier_tasks_run_first(tmp_path):
+    order = []
+    gate = threading.Event()
+    with Scheduler(1, CostModel(str(tmp_path / "timings.json"))) as scheduler:
+        scheduler.submit("edition", None, gate.wait, cost=0)
+        futures = [
+            scheduler.submit("edition", 90, order.append, "edition 90"),
+            scheduler.submit("edition", 97, order.append, "edition 97"),
+            scheduler.submit("film", None, order.append, "short film", cost=1),
+            scheduler.submit("film", None, order.append, "long film", cost=20),
+            scheduler.submit("person", None, order.append, "person"),
+        ]
+        gate.set()
+        scheduler.wait(futures)
+    assert order == ["person", "long film", "short film", "edition 97", "edition 90"]
+
+
+def test_an_edition_waiting_on_its_films_runs_them_itself(tmp_path):
+    def film(n):
+        return (edition.get(), n)
+
+    def scrape(n):
+        edition.set(n)
+        return run_tasks("film", film, [1, 2, 3], keys=[f"{n}:{i}" for i in (1, 2, 3)])
+
+    costs = CostModel(str(tmp_path / "timings.json"))
+    # one worker: a blocking wait on the films would never finish
+    with Scheduler(1, costs) as scheduler:
+        result = scheduler.submit("edition", 97, scrape, 97).result(timeout=5)
+    assert result == [(97, 1), (97, 2), (97, 3)]
+    assert costs.estimate("film", "97:1") < 1.0
+
+
+def test_timings_are_averaged_and_saved(tmp_path):
+    path = str(tmp_path / "timings.json")
+    costs = CostModel(path)
+    assert costs.estimate("edition", 97) > costs.estimate("edition", 1)
+    costs.record("film", "/wiki/Anora", 10.0)
+    costs.record("film", "/wiki/Anora", 20.0)
+    costs.save()
+    assert CostModel.load(path).estimate("film", "/wiki/Anora") == 0.7 * 10.0 + 0.3 * 20.0
@@ -0,0 +1,45 @@
+import pytest
+
+from wiki_scraper import db
+
+
+class FakeConnection:
+    def __init__(self, columns, statements):
+        self.columns = columns
+        self.statements = statements
+
+    def cursor(self):
+        return self
+
+    def execute(self, query, params=()):
+        self.statements.append(query)
+
+    def fetchall(self):
+        return list(self.columns)
+
+    def commit(self):
+        pass
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def schema(monkeypatch):
+    columns, statements = {("person", "wiki_title")}, []
+    monkeypatch.setattr(db, "connect_db", lambda **options: FakeConnection(columns, statements))
+    monkeypatch.setattr(db, "_columns_checked", False)
+    return columns, statements
+
+
+def test_missing_columns_fail_without_changing_the_schema(schema):
+    columns, statements = schema
+    with pytest.raises(RuntimeError, match="movie.wiki_title, award_edition.award_body.*--migrate"):
+        db.ensure_columns()
+    assert not any(query.startswith("ALTER") for query in statements)
+
+
+def test_migrate_adds_only_the_missing_columns(schema):
+    columns, statements = schema
+    assert db.migrate_schema() == [("movie", "wiki_title"), ("award_edition", "award_body")]
+    assert [query.split()[2] for query in statements if query.startswith("ALTER")] == ["movie", "award_edition"]
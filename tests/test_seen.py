@@ -0,0 +1,34 @@
+from wiki_scraper.seen import SeenFilter, _HEADER, _hash
+
+
+def test_filter_hits_are_confirmed_against_the_exact_set(tmp_path):
+    path = str(tmp_path / "seen")
+    seen = SeenFilter(path)
+    seen.add("film:/wiki/Anora")
+    seen.add("edition:97:info")
+    assert "film:/wiki/Anora" in seen
+    # every bit set: the filter says "maybe" to any key, and only the exact set can say no
+    size = len(seen._map) - _HEADER.size
+    seen._map[_HEADER.size:] = b"\xff" * size
+    assert seen.maybe(_hash("film:/wiki/Conclave"))
+    assert "film:/wiki/Conclave" not in seen
+    assert "film:/wiki/Anora" in seen
+    seen.close()
+
+
+def test_keys_survive_a_save_and_reopen(tmp_path):
+    path = str(tmp_path / "seen")
+    seen = SeenFilter(path)
+    keys = [f"film:/wiki/Film_{i}" for i in range(1000)]
+    for key in keys:
+        seen.add(key)
+    seen.save()
+    seen.close()
+    seen = SeenFilter(path)
+    assert len(seen) == 1000
+    assert all(key in seen for key in keys)
+    # with every bit set, the sorted key array on disk alone tells keys apart
+    seen._map[_HEADER.size:] = b"\xff" * (len(seen._map) - _HEADER.size)
+    assert all(key in seen for key in keys)
+    assert not any(f"film:/wiki/Other_{i}" in seen for i in range(1000))
+    seen.close()
@@ -0,0 +1,13 @@
+import logging
+
+from wiki_scraper.text import clear_caches, format_movie_date
+
+
+def test_format_movie_date_warns_about_every_bad_date(caplog):
+    clear_caches()
+    with caplog.at_level(logging.WARNING):
+        assert format_movie_date("TBA[1]") is None
+        assert format_movie_date("TBA[1]") is None
+        assert format_movie_date("March 5, 2020[2]") == "2020-03-05"
+    warnings = [r for r in caplog.records if "Date format not recognized: TBA" in r.getMessage()]
+    assert len(warnings) == 2
@@ -0,0 +1,58 @@
+from wiki_scraper import cli, db, tune
+from wiki_scraper.fetch import configure_prefetch
+
+FILMS = ("/wiki/Anora", "/wiki/The_Brutalist", "/wiki/Conclave", "/wiki/Emilia_P%C3%A9rez")
+
+
+class FakeConnection:
+    """Runs the tuner's schema statements against a dict of databases -> stored films."""
+
+    def __init__(self, databases, statements):
+        self.databases = databases
+        self.statements = statements
+        self.rows = ()
+
+    def cursor(self):
+        return self
+
+    def execute(self, query, params=()):
+        self.statements.append(query)
+        name = query.split("`")[1] if "`" in query else None
+        if query.startswith("CREATE DATABASE"):
+            self.databases[name] = set()
+        elif query.startswith("DROP DATABASE"):
+            self.databases.pop(name, None)
+        self.rows = [("movie",), ("person",)] if "information_schema.TABLES" in query else ()
+
+    def fetchall(self):
+        return self.rows
+
+    def close(self):
+        pass
+
+
+def test_trials_after_warm_up_measure_films(monkeypatch):
+    databases = {"oscars": set(FILMS)}
+    statements = []
+    monkeypatch.setattr(db, "_db_config", {"database": "oscars"})
+    monkeypatch.setattr(db, "connect_db", lambda **options: FakeConnection(databases, statements))
+
+    def run_crawl(editions, workers, stages, costs):
+        # like scrape_nominated_films: only films the database lacks are scraped
+        stored = databases[db.get_db_config()["database"]]
+        for film in FILMS:
+            if film not in stored:
+                costs.record("film", film, 0.25)
+                stored.add(film)
+
+    monkeypatch.setattr(cli, "run_crawl", run_crawl)
+    try:
+        best, trials = tune.tune([97], {"workers": 15, "prefetch": 0}, max_trials=3)
+    finally:
+        configure_prefetch(0)
+    assert len(trials) == 3
+    assert all(trial.p50 > 0 and trial.p95 > 0 for trial in trials)
+    # the configured database is left as it was and every scratch copy is dropped
+    assert databases == {"oscars": set(FILMS)}
+    assert db.get_db_config()["database"] == "oscars"
+    assert any(query.startswith("CREATE TABLE") for query in statements)
@@ -0,0 +1,60 @@
+import pytest
+
+from wiki_scraper import workqueue
+from wiki_scraper.workqueue import SQLiteWorkQueue
+
+
+class Clock:
+    now = 1000.0
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(workqueue, "time", clock)
+    return clock
+
+
+@pytest.fixture
+def queue(tmp_path, clock):
+    queue = SQLiteWorkQueue(str(tmp_path / "queue.db"), lease_timeout=60, max_attempts=2)
+    queue.create()
+    queue.enqueue("film", "/wiki/Anora", ["Anora", "/wiki/Anora"])
+    return queue
+
+
+def test_an_expired_lease_is_reclaimed_by_another_worker(queue, clock):
+    item = queue.lease("a")
+    assert item.key == "/wiki/Anora" and item.payload == ["Anora", "/wiki/Anora"]
+    assert queue.lease("b") is None
+    clock.now += 61
+    reclaimed = queue.lease("b")
+    assert reclaimed.key == item.key
+    # the worker that lost the lease can no longer finish the item
+    queue.complete(item, "a", "late")
+    assert queue.results("film", [item.key])[item.key][0] == "leased"
+    queue.complete(reclaimed, "b", "done")
+    assert queue.results("film", [item.key])[item.key] == ("done", "done", None)
+    assert queue.drained()
+
+
+def test_a_heartbeat_keeps_the_lease(queue, clock):
+    queue.lease("a")
+    clock.now += 50
+    queue.heartbeat("a")
+    clock.now += 50
+    assert queue.lease("b") is None
+
+
+def test_an_item_whose_leases_keep_expiring_is_failed(queue, clock):
+    queue.lease("a")
+    clock.now += 61
+    queue.lease("b")
+    clock.now += 61
+    assert queue.lease("c") is None
+    assert queue.drained()
+    status, _, error = queue.results("film", ["/wiki/Anora"])["/wiki/Anora"]
+    assert status == "failed" and "expired" in error
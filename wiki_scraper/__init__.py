@@ -0,0 +1,12 @@
+"""
+Scraper for the Academy Awards pages on Wikipedia.
+
+Importing the package is cheap and has no side effects: requests, bs4/lxml,
+pymysql and dotenv are only loaded by the modules that need them.
+"""
+
+# latest ceremony the crawler knows about
+LATEST_EDITION = 97
+
+# stages of a single edition, in the order they run
+STAGES = ("info", "awards")
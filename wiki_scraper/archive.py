@@ -0,0 +1,238 @@
+import os
+import mmap
+import uuid
+import zlib
+import gzip
+import struct
+import hashlib
+import threading
+from datetime import datetime, timezone
+from urllib.parse import unquote
+
+from .logs import get_logger
+
+log = get_logger("archive")
+
+# index file: magic, number of entries, archive bytes covered, then entries sorted by (url hash, offset)
+_INDEX_MAGIC = b"WSIDX001"
+_INDEX_HEADER = struct.Struct("<8sQQ")
+_INDEX_ENTRY = struct.Struct("<QQI")
+
+# headers requests has already undone (decompressed / de-chunked body), so they are not archived
+_DROPPED_HEADERS = {"content-encoding", "transfer-encoding", "content-length"}
+
+
+def canonical_url(url):
+    """/wiki/Am%C3%A9lie and /wiki/Amélie, or spaces and underscores, name the same page."""
+    return unquote(url).replace(" ", "_")
+
+
+def _url_hash(canonical):
+    return int.from_bytes(hashlib.blake2b(canonical.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+class ArchivedResponse:
+    """The parts of a requests.Response the scraper uses, for responses built locally (archive records, API answers)."""
+
+    __slots__ = ("url", "status_code", "reason", "headers", "content")
+
+    def __init__(self, url, status_code, reason, headers, content):
+        self.url = url
+        self.status_code = status_code
+        self.reason = reason
+        self.headers = headers
+        self.content = content
+
+    @property
+    def encoding(self):
+        content_type = self.headers.get("content-type", "")
+        if "charset=" in content_type:
+            return content_type.split("charset=", 1)[1].split(";")[0].strip()
+        return "utf-8"
+
+    @property
+    def text(self):
+        return self.content.decode(self.encoding, errors="replace")
+
+
+def _warc_record(url, response):
+    # requests calls it reason, httpx reason_phrase
+    reason = getattr(response, "reason", None) or getattr(response, "reason_phrase", None) or ""
+    headers = "".join(
+        f"{name}: {value}\r\n" for name, value in response.headers.items()
+        if name.lower() not in _DROPPED_HEADERS
+    )
+    block = (
+        f"HTTP/1.1 {response.status_code} {reason}\r\n{headers}Content-Length: {len(response.content)}\r\n\r\n"
+    ).encode("latin-1", errors="replace") + response.content
+    head = (
+        "WARC/1.1\r\n"
+        "WARC-Type: response\r\n"
+        f"WARC-Record-ID: <urn:uuid:{uuid.uuid4()}>\r\n"
+        f"WARC-Date: {datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')}\r\n"
+        f"WARC-Target-URI: {url}\r\n"
+        "Content-Type: application/http;msgtype=response\r\n"
+        f"Content-Length: {len(block)}\r\n\r\n"
+    ).encode("utf-8")
+    return head + block + b"\r\n\r\n"
+
+
+def _parse_headers(lines):
+    headers = {}
+    for line in lines:
+        name, _, value = line.partition(":")
+        headers[name.strip().lower()] = value.strip()
+    return headers
+
+
+def _parse_record(data):
+    """(target url, ArchivedResponse) of one decompressed WARC record."""
+    head, _, rest = data.partition(b"\r\n\r\n")
+    warc = _parse_headers(head.decode("utf-8").split("\r\n")[1:])
+    block = rest[:int(warc["content-length"])]
+    http_head, _, body = block.partition(b"\r\n\r\n")
+    status_line, *header_lines = http_head.decode("latin-1").split("\r\n")
+    _, status, reason = (status_line.split(" ", 2) + [""])[:3]
+    url = warc["warc-target-uri"]
+    return url, ArchivedResponse(url, int(status), reason, _parse_headers(header_lines), body)
+
+
+class CrawlArchive:
+    """
+    Append-only archive of fetched responses: WARC/1.1 records, each one its own gzip member,
+    so the file is a regular .warc.gz that other WARC tools can read.
+    <path>.idx maps a URL hash to the record's offset and length; it is memory-mapped and
+    binary searched, so looking up one page of a many-gigabyte archive reads a few index
+    pages and one compressed record. Records appended by this process are indexed in memory
+    and merged into the index file on close(); records an interrupted run left unindexed
+    are found again by scanning the archive tail on open.
+    One process writes an archive at a time (give every node of a distributed crawl its own).
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.index_path = f"{path}.idx"
+        self._lock = threading.Lock()
+        self._file = open(path, "ab")
+        self._fd = os.open(path, os.O_RDONLY)
+        self._index = None
+        self._index_count = 0
+        self._new = {}
+        self._load_index()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _load_index(self):
+        covered = 0
+        try:
+            with open(self.index_path, "rb") as f:
+                magic, count, covered = _INDEX_HEADER.unpack(f.read(_INDEX_HEADER.size))
+                if magic != _INDEX_MAGIC:
+                    raise ValueError(f"{self.index_path} is not a crawl archive index")
+                if count:
+                    self._index = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                    self._index_count = count
+        except FileNotFoundError:
+            pass
+        end = os.fstat(self._fd).st_size
+        if covered < end:
+            log.info("Indexing %s bytes of %s missing from its index", end - covered, self.path)
+            for url, offset, length in self._scan(covered, end):
+                self._new[url] = (offset, length)
+
+    def _scan(self, start, end):
+        """Yield (url, offset, length) of the records between two member boundaries."""
+        offset = start
+        while offset < end:
+            # read as much as needed to reach the end of the next gzip member
+            decompressor = zlib.decompressobj(wbits=31)
+            pos, chunks = offset, []
+            while not decompressor.eof and pos < end:
+                data = os.pread(self._fd, min(1 << 20, end - pos), pos)
+                chunks.append(decompressor.decompress(data))
+                pos += len(data)
+            if not decompressor.eof:
+                log.warning("Truncated record at %s in %s; ignoring the rest", offset, self.path)
+                return
+            length = pos - offset - len(decompressor.unused_data)
+            url, _ = _parse_record(b"".join(chunks))
+            yield canonical_url(url), offset, length
+            offset += length
+
+    def append(self, url, response):
+        record = gzip.compress(_warc_record(url, response), compresslevel=6)
+        with self._lock:
+            offset = self._file.tell()
+            self._file.write(record)
+            self._file.flush()
+            self._new[canonical_url(url)] = (offset, len(record))
+
+    def _candidates(self, url):
+        canonical = canonical_url(url)
+        found = self._new.get(canonical)
+        if found:
+            yield found
+        if not self._index_count:
+            return
+        key = _url_hash(canonical)
+        lo, hi = 0, self._index_count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if _INDEX_ENTRY.unpack_from(self._index, _INDEX_HEADER.size + mid * _INDEX_ENTRY.size)[0] < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        matches = []
+        while lo < self._index_count:
+            entry_hash, offset, length = _INDEX_ENTRY.unpack_from(
+                self._index, _INDEX_HEADER.size + lo * _INDEX_ENTRY.size
+            )
+            if entry_hash != key:
+                break
+            matches.append((offset, length))
+            lo += 1
+        # newest first: a page fetched again later replaces the older copy
+        yield from reversed(matches)
+
+    def get(self, url):
+        """The latest archived response for url, or None."""
+        for offset, length in self._candidates(url):
+            target, response = _parse_record(gzip.decompress(os.pread(self._fd, length, offset)))
+            # different URLs may share a 64-bit hash, the record itself says which one it is
+            if canonical_url(target) == canonical_url(url):
+                return response
+        return None
+
+    def __contains__(self, url):
+        return self.get(url) is not None
+
+    def close(self):
+        with self._lock:
+            if self._file.closed:
+                return
+            self._file.close()
+            if self._new or not os.path.exists(self.index_path):
+                self._write_index()
+            if self._index is not None:
+                self._index.close()
+            os.close(self._fd)
+
+    def _write_index(self):
+        entries = [
+            _INDEX_ENTRY.unpack_from(self._index, _INDEX_HEADER.size + i * _INDEX_ENTRY.size)
+            for i in range(self._index_count)
+        ]
+        entries.extend((_url_hash(url), offset, length) for url, (offset, length) in self._new.items())
+        entries.sort()
+        covered = os.path.getsize(self.path)
+        tmp = f"{self.index_path}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(_INDEX_HEADER.pack(_INDEX_MAGIC, len(entries), covered))
+            for entry in entries:
+                f.write(_INDEX_ENTRY.pack(*entry))
+        os.replace(tmp, self.index_path)
+        log.info("Archive %s: %s records indexed", self.path, len(entries))
@@ -0,0 +1,96 @@
+import contextvars
+from contextlib import contextmanager
+
+from . import LATEST_EDITION
+from .text import ordinal
+
+
+class AwardSource:
+    """
+    An award body with one Wikipedia article per ceremony, e.g. "97th Academy Awards".
+    key names it on the command line and in task, queue and seen-filter keys; name is what
+    award_edition.award_body holds. scrape_info and scrape_awards read a ceremony's infobox
+    and its nominations; the default ones are the parsers written for the Academy Awards
+    pages (infobox vevent, categories as bold divs over lists of nominees), so a body whose
+    pages look the same only needs a title. Films and people go through the same helpers
+    whatever the body, so everything already scraped for another body is found, not fetched.
+    """
+
+    def __init__(self, key, name, title, latest):
+        self.key = key
+        self.name = name
+        self.title = title  # article title with {ordinal} for the edition, e.g. "{ordinal} Academy Awards"
+        self.latest = latest
+
+    def __repr__(self):
+        return f"AwardSource({self.key!r})"
+
+    def ceremony_title(self, n):
+        return self.title.format(ordinal=ordinal(n), n=n)
+
+    def ceremony_url(self, n):
+        return "https://en.wikipedia.org/wiki/" + self.ceremony_title(n).replace(" ", "_")
+
+    def edition_key(self, n):
+        """Key of edition n in timings, queues and logs (the bare number for the Academy Awards)."""
+        return n if self is ACADEMY_AWARDS else f"{self.key}:{n}"
+
+    def scrape_info(self, n):
+        from .scraper import scrape_award_info_data
+        return scrape_award_info_data(n)
+
+    def scrape_awards(self, n):
+        from .scraper import scrape_awards
+        return scrape_awards(n)
+
+
+ACADEMY_AWARDS = AwardSource("oscars", "Academy Awards", "{ordinal} Academy Awards", LATEST_EDITION)
+
+SOURCES = {}
+
+
+# function to make an award body available to --awards and the queue workers
+def register_source(source):
+    SOURCES[source.key] = source
+    return source
+
+
+# another body is added with its own parsers (an AwardSource subclass overriding
+# scrape_info and scrape_awards) once they are checked against its articles
+register_source(ACADEMY_AWARDS)
+
+
+# function to turn "oscars,..." into award sources
+def parse_sources(spec):
+    return [get_source(key.strip()) for key in spec.split(",") if key.strip()]
+
+
+# function to get the editions of source to crawl: the given ones it has held, or all of them (newest first)
+def source_editions(source, editions=None):
+    if editions:
+        return [n for n in editions if 1 <= n <= source.latest]
+    return list(range(source.latest, 0, -1))
+
+
+def get_source(key):
+    try:
+        return SOURCES[key]
+    except KeyError:
+        raise ValueError(f"Unknown award body {key}; choose from {', '.join(SOURCES)}") from None
+
+
+# award body of the edition being scraped; scheduler tasks inherit it with the context
+_current = contextvars.ContextVar("wiki_scraper_award_source", default=ACADEMY_AWARDS)
+
+
+def current_source():
+    return _current.get()
+
+
+@contextmanager
+def source_context(source):
+    token = _current.set(source)
+    try:
+        yield source
+    finally:
+        _current.reset(token)
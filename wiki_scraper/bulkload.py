@@ -0,0 +1,199 @@
+import os
+from contextlib import contextmanager
+
+from .logs import get_logger
+from .session import EditionSession, Ref, NAMED_TABLES, LINK_TABLES, resolve, share_session
+from .pages import PAGE_TABLES
+
+log = get_logger("bulkload")
+
+# entity tables in load order (a table only refers to the ones before it): id column, columns
+ENTITY_TABLES = {
+    "venue": ("venue_id", ("venue_name", "neighborhood", "city", "state", "country")),
+    "person": ("person_id", ("first_name", "middle_name", "last_name", "birthDate", "country", "deathDate")),
+    **{table: (id_col, (name_col, *extra)) for table, (id_col, name_col, extra) in NAMED_TABLES.items()},
+    "award_edition": ("award_edition_id", ("edition", "aYear", "cDate", "venue_id", "duration", "network", "award_body")),
+    "nomination": ("nomination_id", ("award_edition_id", "movie_id", "category_id", "won", "submitted_by")),
+}
+
+_LOAD = (
+    "LOAD DATA LOCAL INFILE %s INTO TABLE {table} CHARACTER SET utf8mb4 "
+    "FIELDS TERMINATED BY '\\t' ESCAPED BY '\\\\' LINES TERMINATED BY '\\n' ({columns})"
+)
+
+
+def _tsv_field(value):
+    if value is None:
+        return "\\N"
+    return str(value).replace("\\", "\\\\").replace("\t", "\\t").replace("\n", "\\n")
+
+
+class _EmptyCursor:
+    def execute(self, query, params=()):
+        pass
+
+    def fetchone(self):
+        return None
+
+    def fetchall(self):
+        return ()
+
+    def close(self):
+        pass
+
+
+class _EmptyDatabase:
+    """Reads against the tables of a bulk load: they were empty when it started, so no round trip."""
+
+    def cursor(self):
+        return _EmptyCursor()
+
+    def commit(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class BulkLoad(EditionSession):
+    """
+    Session shared by every edition of a full rebuild. New rows get their surrogate keys
+    here as they are recorded (the tables start empty), so nothing is read back from MySQL;
+    at the end each table is written to a TSV file and loaded with LOAD DATA LOCAL INFILE,
+    in dependency order, with the plain (non-unique) secondary indexes dropped during the
+    load and rebuilt once afterwards; unique indexes stay and keep rejecting duplicates.
+    """
+
+    def __init__(self, directory):
+        super().__init__("Bulk load")
+        self.directory = directory
+        self._ids = {}
+
+    def _new(self, table, row):
+        self._ids[table] = self._ids.get(table, 0) + 1
+        return Ref(table, row, self._ids[table])
+
+    def connection(self):
+        return _EmptyDatabase()
+
+    def check_empty(self):
+        from .db import connect_db, ensure_columns
+
+        ensure_columns()
+        conn = connect_db()
+        cursor = conn.cursor()
+        try:
+            filled = []
+            for table in (*ENTITY_TABLES, *LINK_TABLES):
+                cursor.execute(f"SELECT EXISTS (SELECT 1 FROM {table})")
+                if cursor.fetchone()[0]:
+                    filled.append(table)
+        finally:
+            cursor.close()
+            conn.close()
+        if filled:
+            raise RuntimeError(f"--bulk-load rebuilds into empty tables, but {', '.join(filled)} already hold rows")
+
+    def _entities(self, table):
+        if table == "venue":
+            return self.venues.values()
+        if table == "person":
+            return self.persons.values()
+        if table == "award_edition":
+            return self.editions.values()
+        if table == "nomination":
+            return self.nominations
+        return self.named[table].values()
+
+    def _write(self, table, rows):
+        path = os.path.join(self.directory, f"{table}.tsv")
+        with open(path, "w", encoding="utf-8", newline="\n") as f:
+            for row in rows:
+                f.write("\t".join(map(_tsv_field, row)) + "\n")
+        return path
+
+    def write_files(self):
+        """[(table, columns, TSV path, row count)] in load order."""
+        os.makedirs(self.directory, exist_ok=True)
+        files = []
+        for table, (id_col, columns) in ENTITY_TABLES.items():
+            rows = [(ref.id, *map(resolve, ref.row)) for ref in self._entities(table)]
+            if table in PAGE_TABLES:
+                rows = [(*row, self.page_titles.get((table, ref))) for row, ref in zip(rows, self._entities(table))]
+                columns = (*columns, "wiki_title")
+            files.append((table, (id_col, *columns), self._write(table, rows), len(rows)))
+        for table, (columns, _) in LINK_TABLES.items():
+            rows = sorted({tuple(map(resolve, values)) for values in self.links[table]}, key=str)
+            files.append((table, columns, self._write(table, rows), len(rows)))
+        return files
+
+    def flush(self):
+        from .db import connect_db
+
+        with self._lock:
+            files = self.write_files()
+            conn = connect_db(local_infile=True)
+            cursor = conn.cursor()
+            dropped = {}
+            try:
+                cursor.execute("SET foreign_key_checks = 0")
+                for table, columns, path, count in files:
+                    dropped[table] = _drop_secondary_indexes(cursor, table)
+                    if count:
+                        cursor.execute(_LOAD.format(table=table, columns=", ".join(columns)), (path,))
+                        log.info("Loaded %s rows into %s", count, table)
+                conn.commit()
+                self._flushed()
+            finally:
+                # one index build per table from the loaded rows, even if a load failed
+                for table, indexes in dropped.items():
+                    _add_indexes(cursor, table, indexes)
+                cursor.execute("SET foreign_key_checks = 1")
+                cursor.close()
+                conn.close()
+
+
+def _drop_secondary_indexes(cursor, table):
+    """Drop the table's non-unique secondary indexes and return their definitions (index name -> columns)."""
+    cursor.execute(
+        "SELECT INDEX_NAME, COLUMN_NAME, SUB_PART FROM information_schema.STATISTICS "
+        "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND INDEX_NAME <> 'PRIMARY' AND NON_UNIQUE = 1 "
+        "ORDER BY INDEX_NAME, SEQ_IN_INDEX", (table,)
+    )
+    indexes = {}
+    leading = {}
+    for name, column, sub_part in cursor.fetchall():
+        indexes.setdefault(name, []).append(f"`{column}`({sub_part})" if sub_part else f"`{column}`")
+        leading.setdefault(name, column)
+    # indexes a foreign key needs (those led by its column, prefix or not) cannot be dropped,
+    # they stay and are maintained during the load
+    cursor.execute(
+        "SELECT DISTINCT COLUMN_NAME FROM information_schema.KEY_COLUMN_USAGE "
+        "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND REFERENCED_TABLE_NAME IS NOT NULL", (table,)
+    )
+    foreign = {column for column, in cursor.fetchall()}
+    indexes = {name: columns for name, columns in indexes.items() if leading[name] not in foreign}
+    if indexes:
+        cursor.execute(f"ALTER TABLE {table} " + ", ".join(f"DROP INDEX `{name}`" for name in indexes))
+    return indexes
+
+
+def _add_indexes(cursor, table, indexes):
+    if indexes:
+        cursor.execute(f"ALTER TABLE {table} " + ", ".join(
+            f"ADD INDEX `{name}` ({', '.join(columns)})" for name, columns in indexes.items()
+        ))
+
+
+# function to collect every edition crawled inside the block and load them in one go at the end
+@contextmanager
+def bulk_load(directory):
+    session = BulkLoad(directory)
+    session.check_empty()
+    share_session(session)
+    try:
+        yield session
+    finally:
+        share_session(None)
+    log.info("Crawl done; loading %s rows", session.pending_rows())
+    session.flush()
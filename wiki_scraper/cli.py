@@ -0,0 +1,273 @@
+import argparse
+import concurrent.futures
+
+from . import LATEST_EDITION, STAGES
+from .logs import get_logger, configure_logging
+from .scheduler import Scheduler, CostModel
+from .tune import load_tuning, apply_tuning
+from .awards import ACADEMY_AWARDS, SOURCES, parse_sources, source_editions
+from . import memory, profiling, sqlstats
+
+log = get_logger("cli")
+
+
+# function to turn "97", "90-97" or "1-5,90-97" into a list of editions (newest first)
+def parse_editions(spec):
+    editions = set()
+    for part in spec.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        if "-" in part:
+            start, end = (int(p) for p in part.split("-", 1))
+            if start > end:
+                start, end = end, start
+            editions.update(range(start, end + 1))
+        else:
+            editions.add(int(part))
+    if any(n < 1 for n in editions):
+        raise argparse.ArgumentTypeError(f"Editions start at 1: {spec}")
+    return sorted(editions, reverse=True)
+
+
+# function to turn "info,awards" into a tuple of known stages
+def parse_stages(spec):
+    stages = tuple(s.strip() for s in spec.split(",") if s.strip())
+    unknown = [s for s in stages if s not in STAGES]
+    if unknown:
+        raise argparse.ArgumentTypeError(f"Unknown stage(s) {', '.join(unknown)}; choose from {', '.join(STAGES)}")
+    return stages
+
+
+def parse_award_sources(spec):
+    try:
+        return parse_sources(spec)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e)) from None
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="wiki_scraper",
+        description="Scrape the Academy Awards ceremony pages on Wikipedia into the database.",
+    )
+    parser.add_argument("-e", "--editions", type=parse_editions, default=None,
+                        help=f"editions to crawl, e.g. 97, 90-97 or 1-5,90-97 (default: every edition of each award "
+                             f"body, 1-{LATEST_EDITION} for the Academy Awards)")
+    parser.add_argument("-a", "--awards", type=parse_award_sources, default=[ACADEMY_AWARDS],
+                        help=f"comma separated award bodies to crawl, sharing films and people "
+                             f"(default: oscars; choose from {', '.join(SOURCES)})")
+    parser.add_argument("-w", "--workers", type=int, default=None,
+                        help="threads of the shared priority pool that runs the edition, film and person tasks "
+                             "(default: the tuned value or 15)")
+    parser.add_argument("-s", "--stages", type=parse_stages, default=STAGES,
+                        help=f"comma separated stages to run per edition (default: {','.join(STAGES)})")
+    parser.add_argument("--timings", default=None,
+                        help="per-task timings of previous runs used to order the work queue "
+                             "(default: SCRAPER_TIMINGS or .scrape_timings.json)")
+    parser.add_argument("--queue", default=None,
+                        help="work from a shared lease-based queue instead of a local pool: a SQLite file "
+                             "or 'mysql' for a table in the scraper database")
+    parser.add_argument("--seed", action="store_true",
+                        help="with --queue: add the selected editions to the queue before working")
+    parser.add_argument("--lease-timeout", type=float, default=300,
+                        help="with --queue: seconds before a silent worker's items are handed out again (default: 300)")
+    parser.add_argument("--low-memory", action="store_true", default=None,
+                        help="keep only the infobox/wikitable part of each parsed page (default: SCRAPER_LOW_MEMORY)")
+    parser.add_argument("--max-parsed", type=int, default=None,
+                        help="with --low-memory: full pages parsed at the same time (default: SCRAPER_MAX_PARSED or 4)")
+    parser.add_argument("--memory-report", action="store_true",
+                        help="trace allocations and log the peak memory of every stage at the end")
+    parser.add_argument("--sql-report", action="store_true", default=None,
+                        help="time every SQL statement and log them by shape, with the call sites that repeat one "
+                             "per row and should be batched (default: SCRAPER_SQL_REPORT)")
+    parser.add_argument("--profile", default=None, metavar="DIR",
+                        help="sample the scraping threads and write per-edition collapsed stacks (flamegraph.pl, "
+                             "speedscope) and a merged top-functions report to DIR (default: SCRAPER_PROFILE)")
+    parser.add_argument("--prefetch", type=int, default=None,
+                        help="threads fetching linked film/person pages ahead of the scraper, 0 to disable "
+                             "(default: SCRAPER_PREFETCH or 0)")
+    parser.add_argument("--http2", action="store_true", default=None,
+                        help="fetch over HTTP/2 streams on a few shared connections; needs httpx[http2] "
+                             "(default: SCRAPER_HTTP2)")
+    parser.add_argument("--http2-connections", type=int, default=None,
+                        help="with --http2: connections to open at most (default: 4)")
+    parser.add_argument("--compact", action="store_true", default=None,
+                        help="fetch only the lead section of film/person pages and the bare article body of "
+                             "ceremonies through the API, instead of full pages (default: SCRAPER_COMPACT)")
+    parser.add_argument("--compact-samples", type=int, default=None, metavar="N",
+                        help="with --compact: also fetch N full pages per page type to report what compact "
+                             "fetching saves (default: SCRAPER_COMPACT_SAMPLES or 0, no extra requests)")
+    parser.add_argument("--archive", default=None,
+                        help="crawl archive (.warc.gz) to write every fetched page to, or to replay from")
+    parser.add_argument("--archive-mode", choices=("record", "replay", "offline"), default="record",
+                        help="with --archive: record live fetches, replay archived pages (fetching what is "
+                             "missing) or replay offline only (default: record)")
+    parser.add_argument("--ingest", nargs="+", default=None, metavar="DUMP",
+                        help="with --archive: first fill the archive from Wikimedia Enterprise HTML dumps "
+                             "(NDJSON in tar.gz), then crawl offline from it")
+    parser.add_argument("--wikidata", default=None,
+                        help="person index built by `python -m wiki_scraper.wikidata`, consulted before "
+                             "fetching a person's page (default: SCRAPER_WIKIDATA)")
+    parser.add_argument("--write-behind", action="store_true", default=None,
+                        help="collect each edition's rows in memory and write them in one transaction once the "
+                             "edition is scraped (default: SCRAPER_WRITE_BEHIND)")
+    parser.add_argument("--batch-size", type=int, default=None,
+                        help="with --write-behind: rows per IN list / executemany batch (default: SCRAPER_BATCH_SIZE, "
+                             "the tuned value or 500)")
+    parser.add_argument("--seen", default=None, metavar="PATH",
+                        help="filter of finished editions and films, loaded at startup and saved at the end; "
+                             "work it holds is skipped without a db lookup (default: SCRAPER_SEEN)")
+    parser.add_argument("--extract-cache", default=None, metavar="PATH",
+                        help="SQLite file of what was extracted from each page, by content hash; unchanged pages "
+                             "are not parsed again (default: SCRAPER_EXTRACTS)")
+    parser.add_argument("--batch-normalize", action="store_true", default=None,
+                        help="clean release dates, running times, languages, countries, birth countries and venues "
+                             "a column at a time with pandas once an edition's pages are extracted, instead of "
+                             "one value at a time (default: SCRAPER_BATCH_NORMALIZE)")
+    parser.add_argument("--tuning", default=None,
+                        help="settings recommended by `python -m wiki_scraper.tune`, used for every option not given "
+                             "(default: SCRAPER_TUNING or .scrape_tuning.json)")
+    parser.add_argument("--bulk-load", default=None, metavar="DIR",
+                        help="full rebuild into empty tables: keep every row in memory, write one TSV per table "
+                             "to DIR and load them with LOAD DATA LOCAL INFILE at the end")
+    parser.add_argument("--migrate", action="store_true",
+                        help="add the columns this version needs (article titles, award body) to an older schema, "
+                             "then exit")
+    parser.add_argument("--log-level", default=None, help="DEBUG, INFO, WARNING, ... (default: SCRAPER_LOG_LEVEL or INFO)")
+    parser.add_argument("-q", "--quiet", action="store_true", default=None, help="only log warnings and errors")
+    parser.add_argument("--log-format", choices=("text", "json"), default=None, help="log output format")
+    return parser
+
+
+# function to crawl the given editions (None: all of them) of each award body with the cost-aware scheduler
+# (costs: a CostModel to use instead of loading and saving the timings file)
+def run_crawl(editions, workers=15, stages=STAGES, timings=None, costs=None, sources=(ACADEMY_AWARDS,)):
+    # the scraper pulls in requests, bs4 and lxml, so only import it once we actually crawl
+    from .scraper import scrape_data
+
+    save = costs is None
+    if save:
+        costs = CostModel.load(timings)
+    with Scheduler(workers, costs) as scheduler:
+        # editions go in as coarse tasks (largest estimate first); their films and people
+        # are queued as finer tasks while they run, so no worker idles on a long tail.
+        # every award body runs in the same scheduler, so a film nominated for several
+        # is scraped once, by whichever edition gets to it first
+        futures = {}
+        for source in sources:
+            for i in source_editions(source, editions):
+                key = source.edition_key(i)
+                futures[scheduler.submit("edition", key, scrape_data, i, stages, source)] = key
+        for future in concurrent.futures.as_completed(futures):
+            try:
+                future.result()
+            except Exception as e:
+                log.exception("Error in processing edition %s: %s", futures[future], e)
+    if save:
+        costs.save()
+
+
+# function to work as one node of a multi-process / multi-machine crawl
+def run_distributed(queue_spec, editions, workers=15, stages=STAGES, seed=False, lease_timeout=300, timings=None,
+                    sources=(ACADEMY_AWARDS,)):
+    from .scraper import TASK_HANDLERS
+    from .workqueue import open_queue, QueueWorker
+
+    queue = open_queue(queue_spec, lease_timeout)
+    if seed:
+        costs = CostModel.load(timings)
+        seeded = 0
+        for source in sources:
+            extra = [] if source is ACADEMY_AWARDS else [source.key]
+            for n in source_editions(source, editions):
+                key = source.edition_key(n)
+                queue.enqueue("edition", key, [n, list(stages), *extra], priority=costs.estimate("edition", key))
+                seeded += 1
+        log.info("Seeded %s editions into %s", seeded, queue_spec)
+    worker = QueueWorker(queue, TASK_HANDLERS, workers)
+    log.info("Worker %s pulling from %s", worker.owner, queue_spec)
+    worker.run()
+    log.info("Queue drained: %s", queue.stats())
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.ingest:
+        if not args.archive:
+            parser.error("--ingest needs --archive to write the pages to")
+        args.archive_mode = "offline"
+    if args.bulk_load and args.queue:
+        parser.error("--bulk-load collects the whole crawl in one process and cannot be used with --queue")
+    if args.seen and args.queue:
+        parser.error("--seen records one process's work and cannot be used with --queue")
+    if args.batch_normalize and args.queue:
+        parser.error("--batch-normalize cleans the films of an edition together and cannot be used with --queue")
+    for source in args.awards:
+        if args.editions and max(args.editions) > source.latest:
+            parser.error(f"--editions goes up to {max(args.editions)}, but {source.name} has held {source.latest}")
+    configure_logging(level=args.log_level, quiet=args.quiet, fmt=args.log_format)
+    from .db import ensure_columns, migrate_schema
+    if args.migrate:
+        migrate_schema()
+        return
+    # the scraper never changes the schema itself, so check it before crawling anything
+    try:
+        ensure_columns()
+    except RuntimeError as e:
+        parser.error(str(e))
+    apply_tuning(args, load_tuning(args.tuning))
+    from .fetch import (
+        configure_memory, configure_transport, configure_compact, configure_archive, close_archive,
+        configure_prefetch, fetch_report,
+    )
+    configure_memory(low_memory=args.low_memory, max_parsed=args.max_parsed)
+    configure_transport(http2=args.http2, max_connections=args.http2_connections)
+    configure_compact(args.compact, samples=args.compact_samples)
+    if args.ingest:
+        from .dumps import ingest_dumps
+        ingest_dumps(args.ingest, args.archive, args.editions, workers=args.workers, sources=args.awards)
+    configure_archive(args.archive, args.archive_mode)
+    configure_prefetch(args.prefetch)
+    from .wikidata import configure_wikidata
+    configure_wikidata(args.wikidata)
+    from .session import configure_write_behind
+    configure_write_behind(args.write_behind, batch_size=args.batch_size)
+    from .seen import configure_seen, close_seen
+    if not args.queue:
+        configure_seen(args.seen)
+    from .normalize import configure_normalize
+    configure_normalize(args.batch_normalize)
+    from .extracts import configure_extracts, close_extracts
+    configure_extracts(args.extract_cache)
+    if args.queue:
+        # other nodes insert people too, and a process-wide person index would not see them
+        from .people import configure_person_index
+        configure_person_index(False)
+    if args.memory_report:
+        memory.start_report()
+    profiling.start_profiling(args.profile)
+    sqlstats.start_report(args.sql_report)
+    try:
+        if args.queue:
+            run_distributed(args.queue, args.editions, workers=args.workers, stages=args.stages, seed=args.seed,
+                            lease_timeout=args.lease_timeout, timings=args.timings, sources=args.awards)
+        elif args.bulk_load:
+            from .bulkload import bulk_load
+            with bulk_load(args.bulk_load):
+                run_crawl(args.editions, workers=args.workers, stages=args.stages, timings=args.timings,
+                          sources=args.awards)
+        else:
+            run_crawl(args.editions, workers=args.workers, stages=args.stages, timings=args.timings,
+                      sources=args.awards)
+    finally:
+        configure_prefetch(0)
+        fetch_report()
+        configure_transport(http2=False)
+        close_archive()
+        close_seen()
+        close_extracts()
+        memory.finish_report()
+        profiling.finish_profiling()
+        sqlstats.finish_report()
@@ -0,0 +1,1030 @@
+import os
+import re
+import csv
+import threading
+from datetime import datetime
+
+from .logs import get_logger
+from .text import is_link, flatten, format_date, normalize_movie_name
+from .records import PersonRef
+from .session import current_session
+from .awards import ACADEMY_AWARDS, current_source
+from .people import person_index, configure_person_index
+from .pages import PAGE_TABLES, page_index, page_title, reset_page_index
+from .sqlstats import sql_stats, cursor_class
+
+log = get_logger("db")
+
+_db_config = None
+
+
+# function to read the db settings (the .env file is only loaded on first use)
+def get_db_config():
+    global _db_config
+    if _db_config is None:
+        from dotenv import load_dotenv
+        load_dotenv()
+        _db_config = {
+            'host': os.getenv('DB_HOST'),
+            'user': os.getenv('DB_USER'),
+            'password': os.getenv('DB_PASSWORD'),
+            'database': os.getenv('DB_NAME'),
+            'charset': os.getenv('DB_CHARSET')
+        }
+    return _db_config
+
+
+# function to point this process's connections at another database (None: DB_NAME again);
+# what was loaded from the previous one (person and page index, column check) reloads on next use
+def use_database(name=None):
+    global _columns_checked
+    get_db_config()['database'] = name or os.getenv('DB_NAME')
+    _columns_checked = False
+    configure_person_index()
+    reset_page_index()
+
+# function to connect to the database (options are passed on to pymysql.connect)
+def connect_db(**options):
+    import pymysql
+    stats = sql_stats()
+    if stats is not None:
+        stats.connected()
+        options.setdefault("cursorclass", cursor_class())
+    return pymysql.connect(**get_db_config(), **options)
+
+
+_columns_checked = False
+_columns_lock = threading.Lock()
+
+
+# columns newer code relies on that a schema from before them lacks, with the statement adding
+# each one; --migrate runs them, the scraper itself never changes the schema
+MIGRATIONS = {
+    ("person", "wiki_title"):
+        "ALTER TABLE person ADD COLUMN wiki_title VARCHAR(255) NULL, ADD INDEX person_wiki_title (wiki_title)",
+    ("movie", "wiki_title"):
+        "ALTER TABLE movie ADD COLUMN wiki_title VARCHAR(255) NULL, ADD INDEX movie_wiki_title (wiki_title)",
+    # every edition stored so far is an Academy Awards ceremony
+    ("award_edition", "award_body"):
+        f"ALTER TABLE award_edition ADD COLUMN award_body VARCHAR(64) NOT NULL DEFAULT '{ACADEMY_AWARDS.name}', "
+        "ADD INDEX award_edition_body (award_body, edition)",
+}
+
+
+def _missing_columns(cursor):
+    cursor.execute(
+        "SELECT TABLE_NAME, COLUMN_NAME FROM information_schema.COLUMNS "
+        "WHERE TABLE_SCHEMA = DATABASE() AND COLUMN_NAME IN ('wiki_title', 'award_body')"
+    )
+    present = set(cursor.fetchall())
+    return [column for column in MIGRATIONS if column not in present]
+
+
+# function to check (once per process) that the schema has the columns of MIGRATIONS
+def ensure_columns():
+    global _columns_checked
+    if _columns_checked:
+        return
+    with _columns_lock:
+        if _columns_checked:
+            return
+        conn = connect_db()
+        cursor = conn.cursor()
+        try:
+            missing = _missing_columns(cursor)
+        finally:
+            cursor.close()
+            conn.close()
+        if missing:
+            raise RuntimeError(
+                f"The database lacks {', '.join(f'{table}.{column}' for table, column in missing)}; "
+                "add them with `python -m wiki_scraper --migrate`"
+            )
+        _columns_checked = True
+
+
+# function to add the columns of MIGRATIONS the schema lacks; returns the ones added
+def migrate_schema():
+    conn = connect_db()
+    cursor = conn.cursor()
+    try:
+        missing = _missing_columns(cursor)
+        for table, column in missing:
+            cursor.execute(MIGRATIONS[table, column])
+            log.info("Added %s.%s", table, column)
+        conn.commit()
+    finally:
+        cursor.close()
+        conn.close()
+    if not missing:
+        log.info("The schema is up to date")
+    return missing
+
+
+# function to get the award body the current edition's rows belong to
+def _award_body():
+    ensure_columns()
+    return current_source().name
+
+
+# function to connect for a helper: inside a write-behind session its reads share the
+# session's connection and its writes are recorded instead of executed
+def _connect(session):
+    return session.connection() if session is not None else connect_db()
+
+
+def _lookup(cursor, pending, query, params):
+    # row of a pending session entity, or of the db
+    if pending is not None:
+        return (pending,)
+    cursor.execute(query, params)
+    return cursor.fetchone()
+
+
+# function to find the row of an article (None when its title is unknown)
+def _page_id(session, table, title):
+    if not title:
+        return None
+    if session is not None:
+        found = session.page(table, title)
+        if found is not None:
+            return found
+    return page_index().get(table, title)
+
+
+# function to store the article title of a row that was found by name
+def _remember_page(cursor, session, table, row_id, title):
+    if not title or row_id is None:
+        return
+    if session is not None:
+        session.set_page(table, row_id, title)
+        return
+    cursor.execute(
+        f"UPDATE {table} SET wiki_title = %s WHERE {PAGE_TABLES[table]} = %s AND wiki_title IS NULL", (title, row_id)
+    )
+    page_index().add(table, title, row_id)
+
+
+def _person_row(cursor, session, first_name, last_name, date_of_birth, link=None):
+    person_id = _page_id(session, "person", page_title(link))
+    if person_id is not None:
+        return (person_id,)
+    index = person_index()
+    if index is not None:
+        # a person being inserted right now is found once the insert is done
+        with index.claim(first_name):
+            person_id = index.find(first_name, None, last_name, date_of_birth, any_birth_date=True)
+        if person_id is None and session is not None:
+            person_id = session.find_person(first_name, None, last_name, date_of_birth, any_birth_date=True)
+        return (person_id,) if person_id is not None else None
+    pending = session.find_person(first_name, None, last_name, date_of_birth, any_birth_date=True) if session else None
+    if date_of_birth:
+        return _lookup(cursor, pending,
+                       "SELECT person_id FROM person WHERE first_name = %s AND last_name = %s AND birthDate = %s",
+                       (first_name, last_name, date_of_birth))
+    return _lookup(cursor, pending, "SELECT person_id FROM person WHERE first_name = %s AND last_name = %s",
+                   (first_name, last_name))
+
+
+# function to insert venue into db
+def insert_venue(venue_list):
+    session = current_session()
+    conn = _connect(session)
+    cursor = conn.cursor()
+    
+    for venue in venue_list:
+        # Remove empty or whitespace-only items.
+        venue = [v.strip() for v in venue if v.strip()]
+        
+        if len(venue) == 1:
+            # Format: [venue_name]
+            venue_name = venue[0]
+            neighborhood = None
+            city = None
+            state = "California"
+            country = "U.S."
+        elif len(venue) == 2:
+            # Format: [venue_name, city]
+            venue_name, city = venue
+            neighborhood = None
+            state = "California"
+            country = "U.S."
+        elif len(venue) == 3:
+            if venue[1].lower() == "hollywood":
+                # Format: [venue_name, neighborhood, state]
+                venue_name, neighborhood, state = venue
+                city = "Los Angeles"
+                country = "U.S."
+            else:
+                # Format: [venue_name, city, state]
+                venue_name, city, state = venue
+                neighborhood = None
+                country = "U.S."
+        elif len(venue) == 4:
+            if venue[1].lower() == "hollywood":
+                # Format: [venue_name, neighborhood, state, country]
+                venue_name, neighborhood, state, country = venue
+                city = "Los Angeles"
+            else:
+                # Format: [venue_name, city, state, country]
+                venue_name, city, state, country = venue
+                neighborhood = None
+        elif len(venue) >= 5:
+            # Format: [venue_name, neighborhood, city, state, country] (ignore extras)
+            venue_name, neighborhood, city, state, country = venue[:5]
+            # if neighborhood equals venue_name (ignoring case), clear it
+            if neighborhood and venue_name.lower() == neighborhood.lower():
+                neighborhood = None
+        else:
+            log.warning("Invalid venue format: %s", venue)
+            continue
+
+        if session is not None:
+            session.add_venue(venue_name, neighborhood, city, state, country)
+            continue
+
+        # Normalize the venue name by removing a leading "the " (case-insensitive)
+        norm_venue_name = re.sub(r'^the\s+', '', venue_name, flags=re.IGNORECASE).lower()
+        # Build two variants: one without and one with "the " prefix.
+        variant1 = norm_venue_name
+        variant2 = "the " + norm_venue_name
+
+        # Only compare venue names for duplicates.
+        select_query = """
+            SELECT venue_id
+            FROM venue
+            WHERE LOWER(venue_name) = %s OR LOWER(venue_name) = %s
+        """
+        cursor.execute(select_query, (variant1, variant2))
+            
+        result = cursor.fetchone()
+        if result is None:
+            cursor.execute(
+                "INSERT INTO venue (venue_name, neighborhood, city, state, country) VALUES (%s, %s, %s, %s, %s)",
+                (venue_name, neighborhood, city, state, country)
+            )
+        else:
+            log.debug("Venue '%s' already exists (ID: %s).", venue_name, result[0])
+            
+    conn.commit()
+    cursor.close()
+    conn.close()
+
+
+# function to insert person into db
+def insert_person(person_list, person_info=None):
+    insert_people([(person, person_info) for person in person_list])
+
+
+# function to insert people with their own (birth date, birth country, death date) over one connection
+def insert_people(people):
+    session = current_session()
+    index = person_index()
+    page_index()  # checks that person.wiki_title exists
+    conn = _connect(session)
+    cursor = conn.cursor()
+    
+    name_parts_list = []
+    for person, person_info in people:
+        if isinstance(person, PersonRef):
+            # already split into words, no need to flatten and re-split
+            name_parts_list.append((person.parts, page_title(person.link), person_info))
+            continue
+        # Extract only the name, ensuring links are ignored
+        if isinstance(person, list):
+            person = [p for p in person if not is_link(p)]  # Remove links
+        flat_person = flatten(person)  # Convert to a single name string
+        if flat_person:
+            name_parts_list.append((flat_person.split(), None, person_info))  # Splitting by whitespace
+    
+    for parts, page, person_info in name_parts_list:
+        if not parts:
+            continue  # Skip empty entries
+        
+        first_name = parts[0]
+        # If first name starts with "#cite", ignore this entry.
+        if first_name.startswith("#cite"):
+            continue
+
+        middle_name = None
+        last_name = ""
+
+        if len(parts) == 3:
+            middle_name = parts[1]
+            last_name = parts[2]
+        elif len(parts) >= 2:
+            last_name = parts[1]
+        
+        date_of_birth = person_info[0]
+        birth_country = person_info[1]
+        date_of_death = person_info[2]
+
+        # Ensure birth_country is not numeric.
+        if isinstance(birth_country, (int, float)) or str(birth_country).isdigit():
+            birth_country = None
+
+        # a known article needs no matching by name at all
+        if _page_id(session, "person", page) is not None:
+            log.debug("Person '%s %s' already exists.", first_name, last_name)
+            continue
+
+        if index is not None and session is None:
+            # the index holds the whole table, a miss means the person is new; find and insert
+            # under the claim on the name, so editions running at once insert them only once
+            with index.claim(first_name):
+                person_id = index.find(first_name, middle_name, last_name, date_of_birth,
+                                       any_birth_date=date_of_birth is None)
+                if person_id is None:
+                    cursor.execute(
+                        "INSERT INTO person (first_name, middle_name, last_name, birthDate, country, deathDate, wiki_title) VALUES (%s, %s, %s, %s, %s, %s, %s)",
+                        (first_name, middle_name, last_name, date_of_birth, birth_country, date_of_death, page)
+                    )
+                    index.add(cursor.lastrowid, first_name, middle_name, last_name, date_of_birth)
+                    page_index().add("person", page, cursor.lastrowid)
+                    continue
+            log.debug("Person '%s %s' already exists.", first_name, last_name)
+            _remember_page(cursor, session, "person", person_id, page)
+            continue
+
+        person_id = index.find(first_name, middle_name, last_name, date_of_birth,
+                               any_birth_date=date_of_birth is None) if index is not None else None
+        if person_id is not None:
+            log.debug("Person '%s %s' already exists.", first_name, last_name)
+            _remember_page(cursor, session, "person", person_id, page)
+            continue
+
+        if session is not None:
+            person_id = session.add_person(first_name, middle_name, last_name, date_of_birth, birth_country, date_of_death)
+            _remember_page(cursor, session, "person", person_id, page)
+            continue
+
+        if date_of_birth is not None:
+            select_query = """
+                SELECT person_id
+                FROM person
+                WHERE first_name = %s AND last_name = %s AND birthDate = %s
+            """
+            cursor.execute(select_query, (first_name, last_name, date_of_birth))
+        else: 
+            select_query = """
+                SELECT person_id
+                FROM person
+                WHERE first_name = %s AND last_name = %s
+            """
+            cursor.execute(select_query, (first_name, last_name))
+
+        row = cursor.fetchone()
+        if row is None:
+            cursor.execute(
+                "INSERT INTO person (first_name, middle_name, last_name, birthDate, country, deathDate, wiki_title) VALUES (%s, %s, %s, %s, %s, %s, %s)",
+                (first_name, middle_name, last_name, date_of_birth, birth_country, date_of_death, page)
+            )
+            page_index().add("person", page, cursor.lastrowid)
+        else:
+            log.debug("Person '%s %s' already exists.", first_name, last_name)
+            _remember_page(cursor, session, "person", row[0], page)
+    
+    conn.commit()
+    cursor.close()
+    conn.close()
+
+
+# function to get the venue id
+def get_venue_id(venue_name):
+    session = current_session()
+    conn = _connect(session)
+    cursor = conn.cursor()
+    venue_id = _lookup(cursor, session.venue(venue_name) if session else None,
+                       "SELECT venue_id FROM venue WHERE venue_name = %s", (venue_name,))
+    cursor.close()
+    conn.close()
+    return venue_id
+
+
+# function to insert award into db
+def insert_award(n, event_date, venue_ids, duration, network):
+    session = current_session()
+    conn = _connect(session)
+    cursor = conn.cursor()
+    
+    # ensure network is a string
+    network_param = ', '.join(network) if isinstance(network, list) else network
+    body = _award_body()
+
+    for venue_id in venue_ids:
+        # extract the actual venue id from the tuple if necessary
+        vid = venue_id[0] if isinstance(venue_id, tuple) else venue_id
+        if session is not None:
+            session.add_edition(n, datetime.strptime(format_date(event_date), "%Y-%m-%d").year,
+                                format_date(event_date), vid, duration, network_param, body)
+            continue
+        cursor.execute(
+            "SELECT award_edition_id FROM award_edition WHERE award_body = %s AND edition = %s AND venue_id = %s AND network = %s",
+            (body, n, vid, network_param)
+        )
+        if cursor.fetchone() is not None:
+            log.debug("Award %s at venue %s already exists.", n, vid)
+        else:
+            cursor.execute(
+                "INSERT INTO award_edition (edition, aYear, cDate, venue_id, duration, network, award_body) VALUES (%s, %s, %s, %s, %s, %s, %s)",
+                (
+                    n,
+                    datetime.strptime(format_date(event_date), "%Y-%m-%d").year,
+                    format_date(event_date),
+                    vid,
+                    duration,
+                    network_param,
+                    body
+                )
+            )
+    conn.commit()
+    cursor.close()
+    conn.close()
+
+
+# function to insert award into a CSV file
+def insert_award_csv(n, event_date, venue_ids, duration, network, csv_file="awards.csv"):
+
+    # Ensure network is a string.
+    network_param = ', '.join(network) if isinstance(network, list) else network
+
+    # Prepare data for each venue
+    rows = []
+    for venue_id in venue_ids:
+        vid = venue_id[0] if isinstance(venue_id, tuple) else venue_id
+        try:
+            formatted_date = format_date(event_date)
+            rows.append({
+                "Edition": n,
+                "Year": datetime.strptime(formatted_date, "%Y-%m-%d").year,
+                "Date": formatted_date,
+                "Venue ID": vid,
+                "Duration": duration,
+                "Network": network_param
+            })
+        except Exception as e:
+            log.warning("Error formatting date for event %s: %s", n, e)
+            rows.append({
+                "Edition": n,
+                "Year": "Error",
+                "Date": f"Error: {e}",
+                "Venue ID": vid,
+                "Duration": duration,
+                "Network": network_param
+            })
+
+    # write to CSV
+    file_exists = os.path.isfile(csv_file)
+    with open(csv_file, mode="a", newline="", encoding="utf-8") as file:
+        writer = csv.DictWriter(file, fieldnames=["Edition", "Year", "Date", "Venue ID", "Duration", "Network"])
+        if not file_exists:
+            writer.writeheader()  # write header only if file doesn't exist
+        writer.writerows(rows)
+    log.info("Award %s details written to %s.", n, csv_file)
+
+
+# function to insert new positions into the db
+def insert_position(position_list):
+    session = current_session()
+    conn = _connect(session)
+    cursor = conn.cursor()
+
+    for position in position_list:
+        position_title = position
+        if position_title and session is not None:
+            session.add_named("positions", position_title)
+        elif position_title:
+            cursor.execute(
+                "SELECT position_id FROM positions WHERE title = %s", (position_title,)
+            )
+            already_exists = cursor.fetchone()
+            if already_exists is None:
+                cursor.execute(
+                    "INSERT INTO positions (title) VALUES (%s)", (position_title,)
+                )
+            else: 
+                log.debug("Position %s already exists.", position_title)
+        else:
+            log.warning("Failed to get position title from position list.")
+    
+    conn.commit()
+    cursor.close()
+    conn.close()
+
+
+# function to insert the person, positon, and award connection into the db
+def insert_person_connection(connection_list):
+    session = current_session()
+    body = _award_body()
+    conn = _connect(session)
+    cursor = conn.cursor()
+    for connection in connection_list:
+        # optionally followed by the person's article link
+        award_num, first_name, last_name, date_of_birth, position, *link = connection
+        # Fetch person_id based on the article, or first name, last name, and date of birth
+        person_id = _person_row(cursor, session, first_name, last_name, date_of_birth, *link)
+
+        # fetch award_id based on award number
+        award_id = _lookup(cursor, session.edition(award_num, body) if session else None,
+                           "SELECT award_edition_id FROM award_edition WHERE award_body = %s AND edition = %s",
+                           (body, award_num))
+
+        # fetch position_id based on position
+        position_id = _lookup(cursor, session.named_ref("positions", position) if session else None,
+                              "SELECT position_id FROM positions WHERE title = %s", (position,))
+
+        # Use logical AND (and) instead of bitwise (&)
+        if person_id and award_id and position_id and session is not None:
+            session.add_link("award_edition_person", award_id[0], person_id[0], position_id[0])
+        elif person_id and award_id and position_id:
+            person_id = person_id[0]
+            award_id = award_id[0]
+            position_id = position_id[0]
+            # check if the connection already exists
+            cursor.execute(
+                "SELECT * FROM award_edition_person WHERE award_id = %s AND person_id = %s AND position_id = %s",
+                (award_id, person_id, position_id)
+            )
+            if cursor.fetchone() is None:
+                # Insert the connection into the database
+                cursor.execute(
+                    "INSERT INTO award_edition_person (award_id, person_id, position_id) VALUES (%s, %s, %s)",
+                    (award_id, person_id, position_id)
+                )
+            else:
+                log.debug("Connection for award %s, person %s %s, position %s already exists.", award_num, first_name, last_name, position)
+        else:
+            log.warning("Missing data for award %s, person %s %s, position %s.", award_num, first_name, last_name, position)
+
+    conn.commit()
+    cursor.close()
+    conn.close()
+
+
+def insert_movie_person(connection_list):
+    session = current_session()
+    conn = _connect(session)
+    cursor = conn.cursor()
+    log.debug("Linking %s crew entries to their movies.", len(connection_list))
+    for connection in connection_list:
+        # optionally followed by the movie's article title and the person's article link
+        movie_name, first_name, last_name, date_of_birth, position, *pages = connection
+        movie_page, person_link = pages or (None, None)
+        # fetch person_id based on the article, or first name, last name, and date of birth
+        person_id = _person_row(cursor, session, first_name, last_name, date_of_birth, person_link)
+
+        # fetch movie_id based on the article, or movie_name
+        movie_id = _page_id(session, "movie", movie_page)
+        pending = movie_id if movie_id is not None else session.named_ref("movie", movie_name) if session else None
+        movie_id = _lookup(cursor, pending, "SELECT movie_id FROM movie WHERE movie_name = %s", (movie_name,))
+
+        # fetch position_id based on position
+        position_id = _lookup(cursor, session.named_ref("positions", position) if session else None,
+                              "SELECT position_id FROM positions WHERE title = %s", (position,))
+
+        # Use logical AND (and) instead of bitwise (&)
+        if person_id and movie_id and position_id and session is not None:
+            session.add_link("movie_crew", movie_id[0], person_id[0], position_id[0])
+        elif person_id and movie_id and position_id:
+            person_id = person_id[0]
+            movie_id = movie_id[0]
+            position_id = position_id[0]
+            # check if the connection already exists
+            cursor.execute(
+                "SELECT * FROM movie_crew WHERE movie_id = %s AND person_id = %s AND position_id = %s",
+                (movie_id, person_id, position_id)
+            )
+            if cursor.fetchone() is None:
+                # Insert the connection into the database
+                cursor.execute(
+                    "INSERT INTO movie_crew (movie_id, person_id, position_id) VALUES (%s, %s, %s)",
+                    (movie_id, person_id, position_id)
+                )
+            else:
+                log.debug("Connection for award %s, person %s %s, position %s already exists.", movie_name, first_name, last_name, position)
+        else:
+            log.warning("Missing data for award %s, person %s %s, position %s.", movie_name, first_name, last_name, position)
+
+    conn.commit()
+    cursor.close()
+    conn.close()
+
+
+def insert_movie(movie_name, release_dates, in_language, run_time, country, production_companies, page=None):
+    session = current_session()
+    page_index()  # checks that movie.wiki_title exists
+    if session is not None:
+        movie_id = _page_id(session, "movie", page)
+        if movie_id is None:
+            movie_id = session.add_named("movie", movie_name, run_time)
+            session.set_page("movie", movie_id, page)
+        for table, values in (("movie_release_date", release_dates), ("movie_language", in_language),
+                              ("movie_country", country)):
+            for value in values:
+                if value:
+                    session.add_link(table, movie_id, value)
+        for company in production_companies:
+            if company:
+                session.add_link("movie_produced_by", movie_id, session.add_named("production_company", company))
+        return
+
+    conn = connect_db()
+    cursor = conn.cursor()
+    
+    log.debug("Inserting movie %s.", movie_name)
+    movie_row = _page_id(None, "movie", page)
+    if movie_row is not None:
+        movie_row = (movie_row,)
+    else:
+        # Check if the movie already exists.
+        cursor.execute("SELECT movie_id FROM movie WHERE movie_name = %s", (movie_name,))
+        movie_row = cursor.fetchone()
+        if movie_row is None:
+            cursor.execute(
+                "INSERT INTO movie (movie_name, run_time, wiki_title) VALUES (%s, %s, %s)", (movie_name, run_time, page)
+            )
+            movie_row = (cursor.lastrowid,)
+            page_index().add("movie", page, cursor.lastrowid)
+        else:
+            log.debug("Movie %s already exists.", movie_name)
+            _remember_page(cursor, None, "movie", movie_row[0], page)
+    if movie_row:
+        movie_id = movie_row[0]
+    else:
+        log.warning("Failed to retrieve movie_id for %s.", movie_name)
+        conn.commit()
+        cursor.close()
+        conn.close()
+        return
+
+    # Insert release dates if they exist.
+    for release_date in release_dates:
+        if not release_date:
+            continue
+        cursor.execute(
+            "SELECT * FROM movie_release_date WHERE movie_id = %s AND release_date = %s", 
+            (movie_id, release_date)
+        )
+        if cursor.fetchone() is None:
+            cursor.execute(
+                "INSERT INTO movie_release_date (movie_id, release_date) VALUES (%s, %s)",
+                (movie_id, release_date)
+            )
+        else: 
+            log.debug("Movie %s and date %s already exists.", movie_name, release_date)
+    
+    # Insert languages.
+    for lang in in_language:
+        if not lang:
+            continue
+        cursor.execute(
+            "SELECT * FROM movie_language WHERE movie_id = %s AND in_language = %s", 
+            (movie_id, lang)
+        )
+        if cursor.fetchone() is None:
+            cursor.execute(
+                "INSERT INTO movie_language (movie_id, in_language) VALUES (%s, %s)",
+                (movie_id, lang)
+            )
+        else: 
+            log.debug("Movie %s and lang %s already exists.", movie_name, lang)
+    
+    # Insert countries.
+    for con in country:
+        if not con:
+            continue
+        cursor.execute(
+            "SELECT * FROM movie_country WHERE movie_id = %s AND country = %s", 
+            (movie_id, con)
+        )
+        if cursor.fetchone() is None:
+            cursor.execute(
+                "INSERT INTO movie_country (movie_id, country) VALUES (%s, %s)",
+                (movie_id, con)
+            )
+        else: 
+            log.debug("Movie %s and country %s already exists.", movie_name, con)
+    
+    # Insert production companies.
+    for company in production_companies:
+        if not company:
+            continue
+        cursor.execute(
+            "SELECT pd_id FROM production_company WHERE company_name = %s", (company,)
+        )
+        company_row = cursor.fetchone()
+        if company_row:
+            company_id = company_row[0]
+            cursor.execute(
+                "SELECT * FROM movie_produced_by WHERE movie_id = %s AND pd_id = %s", 
+                (movie_id, company_id)
+            )
+            if cursor.fetchone() is None:
+                cursor.execute(
+                    "INSERT INTO movie_produced_by (movie_id, pd_id) VALUES (%s, %s)", 
+                    (movie_id, company_id)
+                )
+            else:
+                log.debug("Entry for movie_id=%s and pd_id=%s already exists.", movie_id, company_id)
+        else: 
+            log.debug("No company with name %s exists", company)
+
+    conn.commit()
+    cursor.close()
+    conn.close()
+
+
+def insert_noinfobox_movie(movie_title, page=None):
+    session = current_session()
+    page_index()  # checks that movie.wiki_title exists
+    if _page_id(session, "movie", page) is not None:
+        log.debug("Movie %s already exists", movie_title)
+        return
+    if session is not None:
+        session.set_page("movie", session.add_named("movie", movie_title, None), page)
+        return
+
+    conn = connect_db()
+    cursor = conn.cursor()
+
+    cursor.execute(
+            "SELECT movie_id FROM movie WHERE movie_name = %s", (movie_title,)
+        )
+    movie_id = cursor.fetchone()
+
+    if not movie_id:
+        cursor.execute(
+            "INSERT INTO movie (movie_name, wiki_title) VALUES (%s, %s)", (movie_title, page)
+        )
+        page_index().add("movie", page, cursor.lastrowid)
+    else: 
+        log.debug("Movie %s already exists", movie_title)
+        _remember_page(cursor, None, "movie", movie_id[0], page)
+    conn.commit()
+    cursor.close()
+    conn.close()
+
+
+def insert_category(cat):
+    session = current_session()
+    conn = _connect(session)
+    cursor = conn.cursor()
+
+    # Query for the category.
+    row = _lookup(cursor, session.named_ref("category", cat) if session else None,
+                  "SELECT category_id FROM category WHERE category_name = %s", (cat,))
+    if row is None and session is not None:
+        # inserted when the session flushes
+        cursor.close()
+        return session.add_named("category", cat)
+    if row is None:
+        cursor.execute("INSERT INTO category (category_name) VALUES (%s)", (cat,))
+        conn.commit()
+        # Requery to get the new category id.
+        cursor.execute("SELECT category_id FROM category WHERE category_name = %s", (cat,))
+        row = cursor.fetchone()
+    else:
+        log.debug("Category '%s' already exists.", cat)
+    
+    cursor.close()
+    conn.close()
+    return row[0] if row else None
+
+
+def insert_production_company(production_companies):
+    session = current_session()
+    if session is not None:
+        for company in production_companies or ():
+            session.add_named("production_company", company)
+        return
+
+    conn = connect_db()
+    cursor = conn.cursor()
+
+    if production_companies:
+        for company in production_companies:
+            log.debug("Executing query for company: %s", company)
+
+            cursor.execute(
+                "SELECT * FROM production_company WHERE company_name = %s", (company,)
+            )
+            if cursor.fetchone() is None:
+                cursor.execute(
+                    "INSERT INTO production_company (company_name) VALUES (%s)", (company,)
+                )
+            else:
+                log.debug("Company %s already exists.", company)
+    else: 
+        log.debug("No Prod Company to add. Skipping.")
+
+    conn.commit()
+    cursor.close()
+    conn.close()
+
+
+def award_edition_exists(n):
+    session = current_session()
+    body = _award_body()
+    conn = _connect(session)
+    cursor = conn.cursor()
+    result = _lookup(cursor, session.edition(n, body) if session else None,
+                     "SELECT award_edition_id FROM award_edition WHERE award_body = %s AND edition = %s", (body, n))
+    conn.commit()
+    cursor.close()
+    conn.close()
+
+    if result: 
+        # If result is already a tuple just return it.
+        # But if it is an int, wrap it in a tuple.
+        if isinstance(result, int):
+            return (result,)
+        return result
+    return None
+
+
+def movie_exists(movie_name, link=None):
+    session = current_session()
+    # the film's article, if it is known, identifies it whatever title it is listed under
+    movie_id = _page_id(session, "movie", page_title(link))
+    if movie_id is not None:
+        return (movie_id,)
+
+    # Normalize the movie_name so it's always a string.
+    movie_name = normalize_movie_name(movie_name)
+
+    conn = _connect(session)
+    cursor = conn.cursor()
+    result = _lookup(cursor, session.named_ref("movie", movie_name) if session else None,
+                     "SELECT movie_id FROM movie WHERE movie_name = %s", (movie_name,))
+    cursor.close()
+    conn.close()
+    # Return a tuple (or the full row) rather than an int
+    if result:
+        if isinstance(result, int):
+            return (result,)
+        return result
+    return None
+
+
+def person_exists(fullname, birthdate, ignore=None):
+    session = current_session()
+    if isinstance(fullname, PersonRef) and fullname.link:
+        person_id = _page_id(session, "person", page_title(fullname.link))
+        if person_id is not None:
+            return person_id
+
+    log.debug("Fullname and birthdate: %s %s", fullname, birthdate)
+    
+    # Ensure fullname is a non-empty list
+    if not fullname or not isinstance(fullname, (list, tuple)):
+        log.warning("Error: Fullname is empty or not a list: %s", fullname)
+        return None
+    
+    # If the first element is a list, extract it; otherwise, assume fullname is already flat.
+    if isinstance(fullname, PersonRef):
+        name_parts = fullname.parts
+    elif isinstance(fullname[0], list) and fullname[0]:
+        name_parts = fullname[0]
+    else:
+        name_parts = fullname
+
+    # Ensure there are actual name parts
+    name_parts = [part.strip() for part in name_parts if part and part.strip()]
+    
+    if not name_parts:  # Avoid further errors if name_parts is still empty
+        log.warning("Error: No valid name parts found.")
+        return None
+    
+    # Assign first, (optional middle), and last name based on available parts
+    if len(name_parts) == 1:
+        fname, mname, lname = name_parts[0], None, ""
+    elif len(name_parts) == 2:
+        fname, lname = name_parts
+        mname = None
+    else:
+        fname, mname, lname = name_parts[0], name_parts[1], name_parts[-1]
+
+    log.debug("Parsed name -> First: %s Middle: %s Last: %s", fname, mname, lname)
+    
+    # Ensure birthdate is a single value
+    if birthdate and isinstance(birthdate, (tuple, list)):
+        birthdate = birthdate[0] if birthdate else None
+    
+    log.debug("Using birthdate: %s", birthdate)
+    
+    if not (birthdate and birthdate.strip()):
+        birthdate = None
+    index = person_index()
+    if index is not None:
+        with index.claim(fname):
+            person_id = index.find(fname, mname, lname, birthdate)
+        if person_id is not None:
+            return person_id
+    if session is not None:
+        pending = session.find_person(fname, mname, lname, birthdate)
+        if pending is not None or index is not None:
+            return pending
+    elif index is not None:
+        return None
+
+    # only the SQL fallback needs a connection
+    conn = _connect(session)
+    cursor = conn.cursor()
+    try:
+        # Build SQL query based on available data
+        if birthdate:
+            cursor.execute(
+                "SELECT person_id FROM person WHERE first_name = %s AND last_name = %s AND birthDate = %s",
+                (fname, lname, birthdate)
+            )
+        elif mname:
+            cursor.execute(
+                "SELECT person_id FROM person WHERE first_name = %s AND middle_name = %s AND last_name = %s AND birthDate IS NULL",
+                (fname, mname, lname)
+            )
+        else:
+            cursor.execute(
+                "SELECT person_id FROM person WHERE first_name = %s AND last_name = %s AND birthDate IS NULL",
+                (fname, lname)
+            )
+        person_id = cursor.fetchone()  # Fetch result
+    finally:
+        cursor.close()
+        conn.close()
+    
+    return person_id[0] if person_id else None
+
+
+#not used--- not needed
+def get_position_id(cat):
+    conn = connect_db()
+    cursor = conn.cursor()
+    cat_lower = cat.lower()
+
+    position_id = None
+    if "actor" in cat_lower or "actress" in cat_lower:
+        cursor.execute("SELECT position_id FROM positions WHERE title = %s"), ("Star")
+        position_id = cursor.fetchone()
+    elif "directing" in cat_lower or "international film" in cat_lower:
+        cursor.execute("SELECT position_id FROM positions WHERE title = %s"), ("Director")
+        position_id = cursor.fetchone()
+    elif "writing" in cat_lower:
+        cursor.execute("SELECT position_id FROM positions WHERE title = %s"), ("Writer")
+        position_id = cursor.fetchone()
+    elif "picture" in cat_lower:
+        cursor.execute("SELECT position_id FROM positions WHERE title = %s"), ("Producer")
+        position_id = cursor.fetchone()
+
+    cursor.close()
+    conn.close()
+    return position_id
+
+
+def insert_nomination_one(award_edition_id, movie_id, category_id, won, submitted_by=None):
+    """
+    Insert a nomination record into the nomination table.
+    """
+    session = current_session()
+    if session is not None:
+        return session.add_nomination(award_edition_id, movie_id, category_id, won, submitted_by)
+
+    conn = connect_db()
+    cursor = conn.cursor()
+    query = """
+        INSERT INTO nomination (award_edition_id, movie_id, category_id, won, submitted_by)
+        VALUES (%s, %s, %s, %s, %s)
+    """
+    cursor.execute(query, (award_edition_id, movie_id, category_id, won, submitted_by))
+    nomination_id = cursor.lastrowid  # Get the auto-generated nomination_id
+    log.debug("nomid: %s", nomination_id)
+    conn.commit()
+    cursor.close()
+    conn.close()
+    return nomination_id
+
+
+def insert_nomination_person(nomination_id, person_id):
+    session = current_session()
+    if session is not None:
+        session.add_link("nomination_person", nomination_id, person_id)
+        return
+
+    conn = connect_db()
+    cursor = conn.cursor()
+
+    # Check if entry already exists
+    cursor.execute(
+        "SELECT 1 FROM nomination_person WHERE nomination_id = %s AND person_id = %s",
+        (nomination_id, person_id),
+    )
+    
+    if cursor.fetchone():
+        log.debug("Entry (%s, %s) already exists. Skipping insertion.", nomination_id, person_id)
+    else:
+        query = "INSERT INTO nomination_person (nomination_id, person_id) VALUES (%s, %s)"
+        cursor.execute(query, (nomination_id, person_id))
+        conn.commit()
+        log.debug("Inserted (%s, %s) successfully.", nomination_id, person_id)
+
+    cursor.close()
+    conn.close()
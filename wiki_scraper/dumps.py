@@ -0,0 +1,173 @@
+import re
+import gzip
+import json
+import tarfile
+import concurrent.futures
+from html import escape
+from urllib.parse import quote
+
+from .logs import get_logger
+from .text import title_key, link_title
+
+log = get_logger("dumps")
+
+# lines handed to a worker process at once, and batches allowed in flight: together they
+# bound how much of the (decompressed) dump is held in memory at any time
+BATCH_LINES = 64
+BATCHES_PER_WORKER = 2
+
+# ceremony pages -> the films/people they link -> the people in those films' infoboxes
+ROUNDS = ("ceremony", "film", "person")
+
+_BODY_TAG = re.compile(r"(<body[^>]*>)")
+_targets = frozenset()
+_round = None
+
+
+def page_url(title):
+    return "https://en.wikipedia.org/wiki/" + quote(title.replace(" ", "_"), safe="/:(),'!*&")
+
+
+def article_page(title, html):
+    """
+    Make article HTML (a dump article, an action=parse answer) look like the page the scraper
+    fetches: it has no h1#firstHeading or canonical link, and Parsoid HTML links as ./Title
+    instead of /wiki/Title.
+    """
+    html = html.replace('href="./', 'href="/wiki/')
+    canonical = f'<link rel="canonical" href="/wiki/{quote(title.replace(" ", "_"), safe="/:(),!*")}">'
+    heading = f'{canonical}<h1 id="firstHeading">{escape(title)}</h1>'
+    if _BODY_TAG.search(html):
+        return _BODY_TAG.sub(lambda m: m.group(1) + heading, html, count=1)
+    return f"<html><body>{heading}{html}</body></html>"
+
+
+def _page_links(page_type, content):
+    # only the links the scraper follows from this kind of page
+    from bs4 import BeautifulSoup
+    from .fetch import PAGE_KEEP
+    from .scraper import infobox_person_links
+
+    soup = BeautifulSoup(content, 'lxml')
+    if page_type == "ceremony":
+        links = [a.get("href") for tag in soup.find_all(PAGE_KEEP["ceremony"]) for a in tag.find_all("a")]
+    else:
+        infobox = soup.find("table", {'class': 'infobox vevent'})
+        links = infobox_person_links(infobox) if infobox else []
+    soup.decompose()
+    return [title for title in map(link_title, links) if title]
+
+
+def _init_worker(targets, round_name):
+    global _targets, _round
+    _targets = targets
+    _round = round_name
+
+
+def _filter_batch(lines):
+    """Runs in a worker process: [(titles, html, linked titles)] of the wanted pages among lines."""
+    found = []
+    for line in lines:
+        try:
+            page = json.loads(line)
+        except ValueError:
+            continue
+        names = [page.get("name")] + [r.get("name") for r in page.get("redirects") or ()]
+        titles = [title_key(n) for n in names if n and title_key(n) in _targets]
+        html = (page.get("article_body") or {}).get("html")
+        if not titles or not html:
+            continue
+        content = article_page(page["name"], html).encode("utf-8")
+        links = _page_links(_round, content) if _round != ROUNDS[-1] else []
+        found.append((titles, content, links))
+    return found
+
+
+def _dump_lines(path):
+    """Stream the NDJSON lines of an Enterprise HTML dump (.tar.gz of .ndjson files, or .ndjson[.gz])."""
+    if path.endswith((".tar.gz", ".tgz")):
+        with tarfile.open(path, "r|gz") as tar:
+            for member in tar:
+                if member.isfile():
+                    yield from tar.extractfile(member)
+    else:
+        opener = gzip.open if path.endswith(".gz") else open
+        with opener(path, "rb") as f:
+            yield from f
+
+
+def _batches(paths):
+    batch = []
+    for path in paths:
+        for line in _dump_lines(path):
+            batch.append(line)
+            if len(batch) >= BATCH_LINES:
+                yield batch
+                batch = []
+    if batch:
+        yield batch
+
+
+def _ingest_round(paths, archive, targets, round_name, workers):
+    from .archive import ArchivedResponse
+
+    headers = {"Content-Type": "text/html; charset=utf-8"}
+    found, links = set(), set()
+    with concurrent.futures.ProcessPoolExecutor(
+        workers, initializer=_init_worker, initargs=(frozenset(targets), round_name)
+    ) as pool:
+        pending = set()
+        batches = _batches(paths)
+        while True:
+            # decompression happens here, parsing in the pool; never more than a few batches queued
+            while len(pending) < workers * BATCHES_PER_WORKER:
+                batch = next(batches, None)
+                if batch is None:
+                    break
+                pending.add(pool.submit(_filter_batch, batch))
+            if not pending:
+                break
+            done, pending = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+            for future in done:
+                for titles, content, page_links in future.result():
+                    for title in titles:
+                        url = page_url(title)
+                        archive.append(url, ArchivedResponse(url, 200, "OK", headers, content))
+                    found.update(titles)
+                    links.update(page_links)
+    return found, links
+
+
+# function to fill a crawl archive with every page a crawl of the editions (None: all of them)
+# of the award bodies reads, from dump files
+def ingest_dumps(paths, archive_path, editions, workers=4, sources=None):
+    from .archive import CrawlArchive
+    from .awards import ACADEMY_AWARDS, source_editions
+
+    for path in paths:
+        if ".xml" in path:
+            raise ValueError(
+                f"{path}: pages-articles XML dumps hold wikitext, but the scraper reads rendered HTML; "
+                "use an Enterprise HTML dump (NDJSON in tar.gz)"
+            )
+    targets = {title_key(source.ceremony_title(n))
+               for source in sources or (ACADEMY_AWARDS,) for n in source_editions(source, editions)}
+    seen = set()
+    with CrawlArchive(archive_path) as archive:
+        for round_name in ROUNDS:
+            # pages already in the archive (an earlier ingest) are not looked for again,
+            # but their links still need following
+            wanted = {t for t in targets - seen if page_url(t) not in archive}
+            log.info("Ingest %s pages: %s wanted, %s already archived",
+                     round_name, len(wanted), len(targets - seen) - len(wanted))
+            links = set()
+            if wanted:
+                found, links = _ingest_round(paths, archive, wanted, round_name, workers)
+                log.info("Found %s of %s %s pages", len(found), len(wanted), round_name)
+            if round_name != ROUNDS[-1]:
+                for title in targets - seen - wanted:
+                    links.update(_page_links(round_name, archive.get(page_url(title)).content))
+            seen |= targets
+            targets = links - seen
+            if not targets:
+                break
@@ -0,0 +1,178 @@
+import os
+import json
+import sqlite3
+import hashlib
+import threading
+import dataclasses
+
+from .logs import get_logger
+from .awards import current_source
+from .fetch import low_memory
+from .normalize import batch_normalizing
+from .records import PersonRef, FilmRef, Nomination, EditionInfo, FilmInfo, Raw, intern_text
+
+log = get_logger("extracts")
+
+# version of every extractor whose output is cached; bump one when its parsing changes and
+# only the pages of that kind are parsed again
+EXTRACTORS = {
+    "person": 2,  # _scrape_person_page: (birth date, birth country, death date)
+    "film": 2,  # load_film_page: FilmInfo, or None without an infobox
+    "ceremony_info": 2,  # scrape_award_info_data: EditionInfo of the ceremony infobox
+    "nominations": 2,  # scrape_awards: (nominations_by_category, link_by_person)
+}
+
+# kinds read by the award body's own parsers (AwardSource.scrape_info / scrape_awards)
+PER_SOURCE = {"ceremony_info", "nominations"}
+
+# extracts written between commits; a crash loses at most these, which are parsed again
+COMMIT_EVERY = 200
+
+_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS extracts (
+        kind VARCHAR(16) NOT NULL,
+        content_hash CHAR(32) NOT NULL,
+        version INTEGER NOT NULL,
+        data TEXT NOT NULL,
+        PRIMARY KEY (kind, content_hash)
+    )
+"""
+
+# record types an extract may hold, by the name they are stored under
+_TYPES = {cls.__name__: cls for cls in (PersonRef, FilmRef, Nomination, EditionInfo, FilmInfo, Raw)}
+
+
+# function to get the key of a page's extract: a hash of its content plus whatever else
+# the extractor reads (e.g. the person's name)
+def content_key(content, *variant):
+    h = hashlib.blake2b(content, digest_size=16)
+    for part in variant:
+        h.update(b"\0" + str(part).encode("utf-8"))
+    return h.hexdigest()
+
+
+def _encode(value):
+    if dataclasses.is_dataclass(value):
+        return {"@": type(value).__name__,
+                "f": {f.name: _encode(getattr(value, f.name)) for f in dataclasses.fields(value)}}
+    if isinstance(value, tuple) and hasattr(value, "_fields"):
+        return {"@": type(value).__name__, "v": [_encode(v) for v in value]}
+    if isinstance(value, (list, tuple)):
+        return [_encode(v) for v in value]
+    if isinstance(value, dict):
+        return {k: _encode(v) for k, v in value.items()}
+    return value
+
+
+def _decode(value):
+    if isinstance(value, list):
+        return [_decode(v) for v in value]
+    if not isinstance(value, dict):
+        return value
+    if "@" not in value:
+        return {intern_text(k): _decode(v) for k, v in value.items()}
+    cls = _TYPES[value["@"]]
+    if "f" in value:
+        return cls(**{k: _decode(v) for k, v in value["f"].items()})
+    # the named tuples hold their words and names as tuples of shared strings
+    return cls(*(tuple(map(intern_text, v)) if isinstance(v, list) else _decode(v) for v in value["v"]))
+
+
+class ExtractCache:
+    """
+    What the extractors read from each page (infobox fields, nominations by category,
+    person tuples), keyed by page kind and content hash in a SQLite file. A page whose
+    content is unchanged since it was last extracted skips BeautifulSoup and the regex
+    cleanup entirely, whether it came from the archive or was fetched again. Rows carry
+    the extractor's version; rows of an older version are dropped on open, so bumping
+    one entry of EXTRACTORS re-parses that kind of page only.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(_SCHEMA)
+        self._pending = 0
+        self.hits = 0
+        self.misses = 0
+        for kind, version in EXTRACTORS.items():
+            dropped = self._conn.execute(
+                "DELETE FROM extracts WHERE kind = ? AND version <> ?", (kind, version)
+            ).rowcount
+            if dropped:
+                log.info("Dropped %s %s extracts of an older extractor version", dropped, kind)
+        self._conn.commit()
+
+    def get(self, kind, key):
+        """(True, extract) when the page was extracted before, else (False, None)."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data FROM extracts WHERE kind = ? AND content_hash = ?", (kind, key)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return False, None
+            self.hits += 1
+        return True, _decode(json.loads(row[0]))
+
+    def put(self, kind, key, extract):
+        data = json.dumps(_encode(extract), ensure_ascii=False, separators=(",", ":"))
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO extracts (kind, content_hash, version, data) VALUES (?, ?, ?, ?)",
+                (kind, key, EXTRACTORS[kind], data),
+            )
+            self._pending += 1
+            if self._pending >= COMMIT_EVERY:
+                self._conn.commit()
+                self._pending = 0
+
+    def close(self):
+        with self._lock:
+            self._conn.commit()
+            self._conn.close()
+        log.info("Extract cache %s: %s pages parsed, %s reused", self.path, self.misses, self.hits)
+
+
+_cache = None
+
+
+def configure_extracts(path=None):
+    """Cache extractor output in path (default: SCRAPER_EXTRACTS; off when neither is set)."""
+    global _cache
+    close_extracts()
+    path = path or os.getenv("SCRAPER_EXTRACTS")
+    if path:
+        _cache = ExtractCache(path)
+
+
+def close_extracts():
+    global _cache
+    cache, _cache = _cache, None
+    if cache is not None:
+        cache.close()
+
+
+# function to run an extractor through the cache: its stored output for this page content,
+# or parse() (which builds the soup itself, so a hit never parses) and store what it returns
+def extracted(kind, content, parse, *variant):
+    cache = _cache
+    if cache is None:
+        return parse()
+    # extracts of low-memory mode (trimmed trees) are kept apart from full-page ones, ceremony
+    # extracts per award body, and with the batch stage on extracts hold Raw field values
+    variant += ("low-memory" if low_memory() else "full",)
+    if kind in PER_SOURCE:
+        variant += (current_source().key,)
+    if batch_normalizing():
+        variant += ("raw",)
+    key = content_key(content, *variant)
+    found, extract = cache.get(kind, key)
+    if found:
+        return extract
+    extract = parse()
+    cache.put(kind, key, extract)
+    return extract
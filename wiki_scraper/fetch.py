@@ -0,0 +1,392 @@
+import os
+import re
+import threading
+import concurrent.futures
+from collections import OrderedDict
+from urllib.parse import unquote
+
+import requests
+from bs4 import BeautifulSoup
+
+from .logs import get_logger
+from .text import link_title
+from .pages import PAGE_TABLES, page_index, page_title, remember_redirect
+
+log = get_logger("fetch")
+
+
+def _has_class(tag, name):
+    return name in (tag.get("class") or [])
+
+
+# the parts of each page type the extractors actually read; in low-memory mode everything
+# else is decomposed right after parsing
+PAGE_KEEP = {
+    "ceremony": lambda tag: tag.name == "table" and (_has_class(tag, "infobox") or _has_class(tag, "wikitable")),
+    "film": lambda tag: (tag.name == "h1" and tag.get("id") == "firstHeading")
+                        or (tag.name == "table" and _has_class(tag, "infobox")),
+    "person": lambda tag: tag.name == "table" and _has_class(tag, "infobox"),
+    "disambiguation": lambda tag: tag.name == "div" and _has_class(tag, "hatnote"),
+}
+
+_low_memory = os.getenv("SCRAPER_LOW_MEMORY", "").lower() in ("1", "true", "yes")
+_parse_slots = threading.BoundedSemaphore(int(os.getenv("SCRAPER_MAX_PARSED", "4")))
+
+
+def configure_memory(low_memory=None, max_parsed=None):
+    """
+    Turn the memory-bounded mode on or off.
+    max_parsed caps how many full BeautifulSoup trees may exist at the same time; the
+    trimmed trees handed back to the extractors are small and not counted.
+    """
+    global _low_memory, _parse_slots
+    if low_memory is not None:
+        _low_memory = low_memory
+    if max_parsed is not None:
+        _parse_slots = threading.BoundedSemaphore(max(1, max_parsed))
+
+
+def low_memory():
+    return _low_memory
+
+
+_client = None
+
+
+def configure_transport(http2=None, max_connections=None, client=None):
+    """
+    Send the scraper's requests over HTTP/2 (httpx with h2, an optional dependency) instead of
+    one requests.get per page. Every worker thread shares one client, whose requests run as
+    concurrent streams over at most max_connections connections to en.wikipedia.org.
+    client: an httpx.Client to use as is (e.g. an h2c client for a local test server).
+    """
+    global _client
+    if http2 is None:
+        http2 = os.getenv("SCRAPER_HTTP2", "").lower() in ("1", "true", "yes")
+    if _client is not None:
+        _client.close()
+        _client = None
+    if client is not None:
+        _client = client
+    elif http2:
+        try:
+            import httpx
+            import h2  # noqa: F401  (httpx only speaks HTTP/2 with it installed)
+        except ImportError as e:
+            raise RuntimeError("HTTP/2 needs httpx with h2: pip install 'httpx[http2]'") from e
+        limits = httpx.Limits(max_connections=max_connections or 4, max_keepalive_connections=max_connections or 4)
+        _client = httpx.Client(http2=True, limits=limits, follow_redirects=True, timeout=60)
+
+
+def _http_get(url, params=None):
+    client = _client
+    if client is None:
+        return requests.get(url, params=params)
+    return client.get(url, params=params)
+
+
+# smallest representation each page type's extractor still works with, when compact fetching is on:
+# lead = the rendered lead section (infobox and hatnotes live there), body = the rendered article
+# without skin, scripts and navigation. Ceremonies need the body: scrape_awards picks the winners
+# table by its position among all the page's wikitables, and that differs between layouts.
+REPRESENTATIONS = {
+    "person": "lead",
+    "disambiguation": "lead",
+    "film": "lead",
+    "ceremony": "body",
+}
+# full pages also fetched per page type to measure what the compact representation saves;
+# off unless asked for, as every sample is one more request
+_compact_samples = int(os.getenv("SCRAPER_COMPACT_SAMPLES", "0"))
+
+_API = "https://en.wikipedia.org/w/api.php"
+_compact = os.getenv("SCRAPER_COMPACT", "").lower() in ("1", "true", "yes")
+_stats_lock = threading.Lock()
+_received = {}
+_samples = {}
+_fetched = 0
+
+
+def configure_compact(enabled=None, samples=None):
+    """Fetch compact representations; samples: full pages also fetched per page type to report the saving."""
+    global _compact, _compact_samples
+    if enabled is not None:
+        _compact = enabled
+    if samples is not None:
+        _compact_samples = samples
+
+
+def _representation(page_type):
+    return REPRESENTATIONS.get(page_type, "full") if _compact else "full"
+
+
+def _fetch_compact(url, representation):
+    from .archive import ArchivedResponse
+    from .dumps import article_page
+
+    title = unquote(url.split("/wiki/", 1)[1])
+    params = {
+        "action": "parse", "page": title, "prop": "text", "redirects": "1",
+        "format": "json", "formatversion": "2",
+        "disableeditsection": "1", "disabletoc": "1", "disablelimitreport": "1",
+    }
+    if representation == "lead":
+        params["section"] = "0"
+    response = _http_get(_API, params=params)
+    if response.status_code != 200:
+        return response
+    data = response.json()
+    if "error" in data:
+        # what the article URL would answer, so can_follow_link's checks still work
+        return ArchivedResponse(url, 404, "Not Found", {}, b"Wikipedia does not have an article with this exact name.")
+    parsed = data["parse"]
+    content = article_page(parsed["title"], parsed["text"]).encode("utf-8")
+    return ArchivedResponse(url, 200, "OK", {"content-type": "text/html; charset=utf-8"}, content)
+
+
+def _count(page_type, url, representation, response):
+    size = len(response.content)
+    with _stats_lock:
+        pages = _received.setdefault(page_type, [0, 0])
+        pages[0] += 1
+        pages[1] += size
+        sample = _samples.setdefault(page_type, [0, 0, 0])
+        take_sample = representation != "full" and response.status_code == 200 and sample[0] < _compact_samples
+        if take_sample:
+            sample[0] += 1
+    if take_sample:
+        full = len(_http_get(url).content)
+        with _stats_lock:
+            sample[1] += full
+            sample[2] += size
+
+
+def fetch_report():
+    """Log the pages and bytes received per page type (and what compact fetching saved on a sample)."""
+    with _stats_lock:
+        received = {k: list(v) for k, v in _received.items()}
+        samples = {k: list(v) for k, v in _samples.items()}
+    for page_type, (pages, size) in sorted(received.items()):
+        line = f"{page_type or 'other'}: {pages} pages, {size / 2**20:.1f} MiB ({size / max(pages, 1) / 1024:.0f} KiB/page)"
+        sampled, full, compact = samples.get(page_type, (0, 0, 0))
+        if sampled and full:
+            line += f", {_representation(page_type)} is {100 * (1 - compact / full):.0f}% smaller than the full page"
+        log.info("Fetched %s", line)
+
+
+# function to get how many pages the scraper has asked for so far (from the web, the archive or prefetched)
+def fetch_count():
+    return _fetched
+
+
+ARCHIVE_MODES = ("record", "replay", "offline")
+
+_archive = None
+_archive_mode = "record"
+
+
+def configure_archive(path=None, mode="record"):
+    """
+    Keep fetched responses in a crawl archive (see archive.CrawlArchive).
+    record: always fetch live and append; replay: answer from the archive and fetch (and
+    append) only what it lacks; offline: answer from the archive only, a page it lacks
+    comes back as a 404, the same as a missing article.
+    """
+    global _archive, _archive_mode
+    from .archive import CrawlArchive
+
+    if mode not in ARCHIVE_MODES:
+        raise ValueError(f"Unknown archive mode {mode}; choose from {', '.join(ARCHIVE_MODES)}")
+    close_archive()
+    _archive_mode = mode
+    if path:
+        _archive = CrawlArchive(path)
+
+
+def close_archive():
+    global _archive
+    if _archive is not None:
+        _archive.close()
+        _archive = None
+
+
+class Prefetcher:
+    """
+    Fetches pages in the background into a bounded cache shared by every worker, so a page
+    whose link was seen earlier (a nominee on the ceremony page, a director in a film
+    infobox) is usually local by the time the scraper gets to it.
+    Entries stay after use (a person page is read by can_follow_link and scrape_person);
+    once capacity is reached the oldest finished entries make room, and new links are
+    dropped while everything cached is still in flight.
+    """
+
+    def __init__(self, workers=8, capacity=256):
+        self.capacity = capacity
+        self._pool = concurrent.futures.ThreadPoolExecutor(workers, thread_name_prefix="prefetch")
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+
+    def prefetch(self, urls, page_type=None):
+        representation = _representation(page_type)
+        with self._lock:
+            for url in urls:
+                key = (url, representation)
+                if key in self._cache:
+                    continue
+                if len(self._cache) >= self.capacity and not self._evict():
+                    return
+                self._cache[key] = self._pool.submit(_fetch, url, page_type)
+
+    def _evict(self):
+        for key, future in self._cache.items():
+            if future.done():
+                del self._cache[key]
+                return True
+        return False
+
+    def take(self, url, page_type=None):
+        """The prefetched response for url (waiting if its fetch is still running), or None."""
+        key = (url, _representation(page_type))
+        with self._lock:
+            future = self._cache.get(key)
+        if future is None:
+            return None
+        try:
+            response = future.result()
+        except Exception as e:
+            log.debug("Prefetch of %s failed (%s), fetching again", url, e)
+            with self._lock:
+                self._cache.pop(key, None)
+            return None
+        with self._lock:
+            self.hits += 1
+        return response
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
+        with self._lock:
+            self._cache.clear()
+
+
+_prefetcher = None
+
+
+def configure_prefetch(workers=None, capacity=None):
+    """Start (workers > 0) or stop (0) background prefetching; defaults from SCRAPER_PREFETCH(_CACHE)."""
+    global _prefetcher
+    if workers is None:
+        workers = int(os.getenv("SCRAPER_PREFETCH", "0"))
+    if capacity is None:
+        capacity = int(os.getenv("SCRAPER_PREFETCH_CACHE", "256"))
+    if _prefetcher is not None:
+        log.debug("Prefetch cache hits: %s", _prefetcher.hits)
+        _prefetcher.shutdown()
+        _prefetcher = None
+    if workers > 0:
+        _prefetcher = Prefetcher(workers, capacity)
+
+
+# function to tell whether the page a link points to is stored already: a film finished in
+# this or an earlier run (its scraper.film_key), or a person or film row with that article
+def _stored(link, index):
+    from .seen import is_done
+
+    if is_done(f"film:{link}"):
+        return True
+    title = page_title(link)
+    return any(index.get(table, title) is not None for table in PAGE_TABLES)
+
+
+# function to queue background fetches of the /wiki/ links found on a page (no-op unless prefetching);
+# pages already stored are skipped, the scraper would not read them
+def prefetch(links, page_type="person"):
+    prefetcher = _prefetcher
+    if prefetcher is None:
+        return
+    index = page_index()
+    urls = []
+    for link in links:
+        # same url the scraper builds from a link later; skip File:, Help:, ... and red links
+        if link and link.startswith("/wiki/") and ":" not in link and not _stored(link, index):
+            urls.append(f"https://en.wikipedia.org{link}")
+    prefetcher.prefetch(urls, page_type)
+
+
+# function to fetch a url (every request of the scraper goes through here);
+# page_type lets compact fetching pick a smaller representation of the page
+def fetch(url, page_type=None):
+    global _fetched
+    with _stats_lock:
+        _fetched += 1
+    prefetcher = _prefetcher
+    response = prefetcher.take(url, page_type) if prefetcher is not None else None
+    if response is None:
+        response = _fetch(url, page_type)
+    remember_redirect(url, canonical_title(response))
+    return response
+
+
+_CANONICAL = re.compile(rb'<link rel="canonical" href="[^"]*?/wiki/([^"#?]+)"')
+
+
+def canonical_title(response):
+    """Title of the article a response holds (the target if the request hit a redirect), or None."""
+    if response.status_code != 200:
+        return None
+    found = _CANONICAL.search(response.content)
+    if found:
+        return link_title("/wiki/" + found.group(1).decode("utf-8", errors="replace"))
+    return page_title(str(response.url))
+
+
+def _fetch(url, page_type=None):
+    representation = _representation(page_type)
+    # compact answers are archived apart from full pages; a full page serves every representation
+    key = url if representation == "full" else f"{url}?representation={representation}"
+    archive = _archive
+    if archive is not None and _archive_mode != "record":
+        response = archive.get(key)
+        if response is None and key != url:
+            response = archive.get(url)
+        if response is not None:
+            return response
+        if _archive_mode == "offline":
+            from .archive import ArchivedResponse
+            log.debug("Not in the archive: %s", url)
+            return ArchivedResponse(url, 404, "Not Found", {}, b"")
+    if representation == "full":
+        response = _http_get(url)
+    else:
+        response = _fetch_compact(url, representation)
+    _count(page_type, url, representation, response)
+    if archive is not None:
+        archive.append(key, response)
+    return response
+
+
+# function to parse a page; page_type picks the subtrees kept in low-memory mode
+def parse_page(content, page_type=None):
+    if not _low_memory or page_type not in PAGE_KEEP:
+        return BeautifulSoup(content, 'lxml')
+    with _parse_slots:
+        soup = BeautifulSoup(content, 'lxml')
+        kept = _keep_only(soup, PAGE_KEEP[page_type])
+        soup.decompose()
+    return kept
+
+
+def load_page(url, page_type=None):
+    return parse_page(fetch(url, page_type).content, page_type)
+
+
+def _keep_only(soup, keep):
+    """Move the subtrees matching keep into a fresh, small document (outermost match wins)."""
+    trimmed = BeautifulSoup("", 'lxml')
+    matches = soup.find_all(keep)
+    matched = set(map(id, matches))
+    for tag in matches:
+        if any(id(parent) in matched for parent in tag.parents):
+            continue
+        trimmed.append(tag.extract())
+    return trimmed
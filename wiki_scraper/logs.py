@@ -0,0 +1,143 @@
+import os
+import sys
+import json
+import queue
+import atexit
+import logging
+import logging.handlers
+import contextvars
+from contextlib import contextmanager
+
+# root logger name shared by every module of the scraper
+LOGGER_NAME = "wiki_scraper"
+
+# context fields attached to every record (edition number, current film, ...)
+_log_context = contextvars.ContextVar("wiki_scraper_log_context", default={})
+
+_listener = None
+
+
+def get_logger(name=None):
+    """Return the scraper logger, or a named child of it."""
+    if not name:
+        return logging.getLogger(LOGGER_NAME)
+    return logging.getLogger(f"{LOGGER_NAME}.{name}")
+
+
+@contextmanager
+def log_context(**fields):
+    """Attach extra fields (e.g. edition=97) to every record logged inside the block."""
+    token = _log_context.set({**_log_context.get(), **fields})
+    try:
+        yield
+    finally:
+        _log_context.reset(token)
+
+
+def edition_context(n):
+    return log_context(edition=n)
+
+
+# function to get the edition the current code runs for (None outside an edition)
+def current_edition():
+    return _log_context.get().get("edition")
+
+
+class ContextFilter(logging.Filter):
+    """Copies the current context fields onto the record so formatters can use them."""
+
+    def filter(self, record):
+        fields = _log_context.get()
+        record.context = fields
+        record.edition = fields.get("edition", "-")
+        return True
+
+
+class _DeferredQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler that does not format in the calling thread.
+    The stock prepare() renders the message before enqueueing, which would put the
+    string formatting of large nomination dicts back on the scraping thread.
+    Records are only passed between threads of this process so they can travel as-is.
+    """
+
+    def prepare(self, record):
+        return record
+
+
+class TextFormatter(logging.Formatter):
+    def __init__(self):
+        super().__init__("%(asctime)s %(levelname)-7s [ed=%(edition)s] %(name)s: %(message)s")
+
+    def format(self, record):
+        if not hasattr(record, "edition"):
+            record.edition = "-"
+        return super().format(record)
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line, with the context fields as top-level keys."""
+
+    def format(self, record):
+        entry = {
+            "ts": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        entry.update(getattr(record, "context", {}))
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+def configure_logging(level=None, quiet=None, fmt=None, stream=None):
+    """
+    Set up the queue-based logging pipeline.
+    Records are put on an unbounded queue by the scraping threads and written by a
+    single background listener thread, so worker threads never wait on the stdout lock.
+    Defaults come from SCRAPER_LOG_LEVEL, SCRAPER_QUIET and SCRAPER_LOG_FORMAT.
+    Quiet mode raises the level to WARNING; disabled records are rejected by the
+    logger before any argument is formatted.
+    """
+    global _listener
+
+    if quiet is None:
+        quiet = os.getenv("SCRAPER_QUIET", "").lower() in ("1", "true", "yes")
+    if level is None:
+        level = "WARNING" if quiet else os.getenv("SCRAPER_LOG_LEVEL", "INFO")
+    if fmt is None:
+        fmt = os.getenv("SCRAPER_LOG_FORMAT", "text")
+    if isinstance(level, str):
+        level = logging.getLevelName(level.upper())
+        if not isinstance(level, int):
+            level = logging.INFO
+
+    shutdown_logging()
+
+    target = logging.StreamHandler(stream or sys.stdout)
+    target.setFormatter(JsonFormatter() if fmt == "json" else TextFormatter())
+
+    log_queue = queue.SimpleQueue()
+    handler = _DeferredQueueHandler(log_queue)
+    handler.addFilter(ContextFilter())
+
+    logger = get_logger()
+    logger.handlers[:] = [handler]
+    logger.setLevel(level)
+    logger.propagate = False
+
+    _listener = logging.handlers.QueueListener(log_queue, target)
+    _listener.start()
+    return logger
+
+
+def shutdown_logging():
+    """Flush whatever is still queued and stop the listener thread."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+atexit.register(shutdown_logging)
@@ -0,0 +1,95 @@
+import threading
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager
+
+from .logs import get_logger
+
+log = get_logger("memory")
+
+# seconds between tracemalloc samples while a report is running
+SAMPLE_INTERVAL = 0.05
+
+_report = None
+
+
+class MemoryReport:
+    """
+    Peak traced memory per crawl stage.
+    tracemalloc only knows the process-wide total, and with many threads stages overlap,
+    so a sampler thread reads the total every SAMPLE_INTERVAL and charges it to every
+    stage active at that moment: a stage's peak is the highest total seen while it ran.
+    """
+
+    def __init__(self):
+        self.peaks = Counter()
+        self._active = Counter()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._sample_loop, name="memory-sampler", daemon=True)
+
+    def start(self):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        return peak
+
+    def enter(self, name):
+        with self._lock:
+            self._active[name] += 1
+        self._sample()
+
+    def exit(self, name):
+        self._sample()
+        with self._lock:
+            self._active[name] -= 1
+
+    def _sample(self):
+        current = tracemalloc.get_traced_memory()[0]
+        with self._lock:
+            for name, count in self._active.items():
+                if count and current > self.peaks[name]:
+                    self.peaks[name] = current
+
+    def _sample_loop(self):
+        while not self._stop.wait(SAMPLE_INTERVAL):
+            self._sample()
+
+
+@contextmanager
+def stage(name):
+    """Charge the memory in use inside the block to a stage (no-op unless a report is running)."""
+    report = _report
+    if report is None:
+        yield
+        return
+    report.enter(name)
+    try:
+        yield
+    finally:
+        report.exit(name)
+
+
+def start_report():
+    global _report
+    _report = MemoryReport()
+    _report.start()
+
+
+def finish_report():
+    """Stop tracing and log the peak memory of every stage."""
+    global _report
+    report, _report = _report, None
+    if report is None:
+        return {}
+    peak = report.stop()
+    log.info("Peak traced memory: %.1f MiB", peak / 2**20)
+    for name, size in report.peaks.most_common():
+        log.info("  %-10s %8.1f MiB", name, size / 2**20)
+    return dict(report.peaks)
@@ -0,0 +1,237 @@
+import os
+import re
+import time
+import dataclasses
+from collections import defaultdict
+
+from .logs import get_logger
+from .records import Raw
+from .text import (
+    format_movie_date, format_site, convert_duration_to_minutes, running_time_minutes, split_languages,
+    split_countries, format_birth_country, _MOVIE_DATE_NOISE, _YEAR, _MONTHS, _MONTH_DAY_YEAR, _DAY_MONTH_YEAR,
+    _MONTH_YEAR, _BRACKETS, _BRACKETS_DOTALL, _PARENS_KEEP, _SPACED_IN, _COMMA_OR_NEWLINE, _HOURS, _MINUTES,
+    _MINUTE_WORD, _RUNNING_TIME, _LANGUAGE_WORD, _CAPITALIZED_WORD, _BRACKETS_OR_DIGITS, _DIGIT,
+    _CITATION_NEEDED,
+)
+
+log = get_logger("normalize")
+
+_enabled = os.getenv("SCRAPER_BATCH_NORMALIZE", "").lower() in ("1", "true", "yes")
+
+# the one-value-at-a-time cleanup of every kind of field (what the extractors run when the
+# batch stage is off, and the fallback for values the column versions cannot settle)
+PER_ROW = {
+    "release_date": lambda text, context: format_movie_date(text),
+    "running_time": lambda text, context: running_time_minutes(text),
+    "languages": lambda text, context: split_languages(text),
+    "countries": lambda text, context: split_countries(text),
+    "birth_country": lambda text, context: format_birth_country(text, context),
+    "duration": lambda text, context: convert_duration_to_minutes(text),
+    "site": lambda text, context: [format_site(text)],
+}
+
+# line breaks str.splitlines() splits on
+_LINE_BREAKS = r'[\n\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029]+'
+_TRAILING_SEPARATORS = re.compile(r'[\s,]+$')
+
+
+def _whole(shape):
+    """shape anchored at both ends: str.extract searches, format_movie_date needs a fullmatch."""
+    return re.compile(r'\A(?:' + shape.pattern + r')\Z', shape.flags)
+
+
+# the shapes format_movie_date tries first, in its order
+_DATE_SHAPES = tuple(map(_whole, (_MONTH_DAY_YEAR, _DAY_MONTH_YEAR, _MONTH_YEAR)))
+
+
+def configure_normalize(enabled=None):
+    """
+    Leave dates, durations, countries, languages and venues raw while pages are extracted
+    and clean them a column at a time with pandas (an optional dependency) once a batch of
+    pages is in; default from SCRAPER_BATCH_NORMALIZE.
+    """
+    global _enabled
+    if enabled is None:
+        enabled = os.getenv("SCRAPER_BATCH_NORMALIZE", "").lower() in ("1", "true", "yes")
+    if enabled:
+        try:
+            import numpy  # noqa: F401
+            import pandas  # noqa: F401
+        except ImportError as e:
+            raise RuntimeError("batch normalization needs pandas and NumPy: pip install pandas") from e
+    _enabled = bool(enabled)
+
+
+def batch_normalizing():
+    return _enabled
+
+
+# function to clean one field value now, or keep it raw for the batch stage when that is on
+def normalized(kind, text, context=None):
+    if _enabled:
+        return Raw(kind, text, context)
+    return PER_ROW[kind](text, context)
+
+
+def _collect(value, found):
+    if isinstance(value, Raw):
+        found.append(value)
+    elif isinstance(value, str) or value is None:
+        return
+    elif dataclasses.is_dataclass(value):
+        for f in dataclasses.fields(value):
+            _collect(getattr(value, f.name), found)
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            _collect(item, found)
+    elif isinstance(value, dict):
+        for item in value.values():
+            _collect(item, found)
+
+
+def _replace(value, cleaned):
+    if isinstance(value, Raw):
+        return cleaned[value]
+    if isinstance(value, str) or value is None:
+        return value
+    if dataclasses.is_dataclass(value):
+        for f in dataclasses.fields(value):
+            setattr(value, f.name, _replace(getattr(value, f.name), cleaned))
+    elif isinstance(value, list):
+        value[:] = [_replace(item, cleaned) for item in value]
+    elif isinstance(value, tuple):
+        items = [_replace(item, cleaned) for item in value]
+        return type(value)(*items) if hasattr(value, "_fields") else tuple(items)
+    elif isinstance(value, dict):
+        for key, item in value.items():
+            value[key] = _replace(item, cleaned)
+    return value
+
+
+# function to replace the Raw values anywhere in records (lists, tuples, dicts, dataclasses)
+# with their cleaned values; lists, dicts and dataclasses are updated in place
+def normalize_records(records):
+    found = []
+    _collect(records, found)
+    if not found:
+        return records
+    return _replace(records, normalize_columns(found))
+
+
+# function to clean Raw values a column (kind) at a time, each distinct one once; returns {raw: value}
+def normalize_columns(raws):
+    import pandas as pd
+
+    start = time.perf_counter()
+    columns = defaultdict(list)
+    for raw in dict.fromkeys(raws):
+        columns[raw.kind].append(raw)
+    cleaned = {}
+    for kind, column in columns.items():
+        texts = pd.Series([raw.text for raw in column], dtype=object)
+        contexts = pd.Series([raw.context for raw in column], dtype=object)
+        cleaned.update(zip(column, COLUMNS[kind](texts, contexts)))
+    log.debug("Normalized %s values (%s distinct) in %s columns in %.1f ms", len(raws), len(cleaned),
+              len(columns), (time.perf_counter() - start) * 1000)
+    return cleaned
+
+
+def _values(series):
+    """A column as a list, with None where pandas has NaN."""
+    return series.astype(object).where(series.notna(), None).tolist()
+
+
+def _lists(pieces, index):
+    """Per-row lists of the non-empty stripped pieces of an exploded column."""
+    pieces = pieces.explode().str.strip()
+    pieces = pieces[pieces.notna() & (pieces != "")]
+    grouped = pieces.groupby(level=0).agg(list)
+    return [grouped.get(i, []) for i in index]
+
+
+def _release_dates(texts, contexts):
+    import pandas as pd
+
+    cleaned = texts.str.replace(_MOVIE_DATE_NOISE, "", regex=True).str.strip().str.strip(", ")
+    dates = pd.Series(None, index=texts.index, dtype=object)
+    pending = cleaned.str.contains(_YEAR, regex=True)
+    # the first shape that matches the whole value decides
+    for shape in _DATE_SHAPES:
+        parts = cleaned[pending].str.extract(shape)
+        parts = parts[parts["year"].notna()]
+        if parts.empty:
+            continue
+        day = parts["day"].astype(int) if "day" in parts else 1
+        found = pd.to_datetime(
+            pd.DataFrame({"year": parts["year"].astype(int), "month": parts["month"].str.lower().map(_MONTHS),
+                          "day": day}),
+            errors="coerce",
+        )
+        dates[found.index] = found.dt.strftime("%Y-%m-%d")
+        pending[parts.index] = False
+    # invalid dates and the shapes only strptime knows go the per-row way, which also logs them
+    result = _values(dates)
+    for i in texts.index[dates.isna()]:
+        result[i] = format_movie_date(texts[i])
+    return result
+
+
+def _running_times(texts, contexts):
+    return _values(texts.str.strip().str.extract(_RUNNING_TIME)[0].astype("Int64"))
+
+
+def _durations(texts, contexts):
+    hours = texts.str.extract(_HOURS)[0].astype(float).fillna(0)
+    minutes = texts.str.extract(_MINUTES)[0].astype(float).fillna(0)
+    total = hours * 60 + minutes
+    # no hours/minutes pattern: a number followed by "minute"
+    fallback = texts.str.extract(_MINUTE_WORD)[0].astype(float).fillna(0)
+    total = total.where(total != 0, fallback)
+    return [int(minutes) for minutes in total]
+
+
+def _languages(texts, contexts):
+    cleaned = texts.str.strip().str.replace(_BRACKETS, "", regex=True)
+    words = cleaned.str.findall(_LANGUAGE_WORD)
+    capitals = cleaned.str.findall(_CAPITALIZED_WORD)
+    return capitals.where(~cleaned.str.contains(" ", regex=False), words).tolist()
+
+
+def _countries(texts, contexts):
+    cleaned = texts.str.strip().str.replace(_BRACKETS, "", regex=True).str.strip()
+    capitals = cleaned.str.findall(_CAPITALIZED_WORD)
+    lines = _lists(cleaned.str.split(_LINE_BREAKS, regex=True), texts.index)
+    split = ~cleaned.str.contains(" ", regex=False) & (capitals.str.len() > 1)
+    return [capitals[i] if split[i] else lines[i] for i in texts.index]
+
+
+def _birth_countries(texts, contexts):
+    import pandas as pd
+
+    cleaned = texts.str.strip().str.replace(_BRACKETS_OR_DIGITS, "", regex=True).str.strip()
+    # the last comma-separated part that is not blank
+    last = cleaned.str.replace(_TRAILING_SEPARATORS, "", regex=True).str.rsplit(",", n=1).str[-1].str.strip()
+    country = last.where(last != "").str.rstrip(")").str.replace(_CITATION_NEEDED, "", regex=True).str.strip()
+    # a "country" holding digits or the person's own name is not one
+    digits = country.str.contains(_DIGIT, regex=True).fillna(False).astype(bool)
+    own_name = pd.Series([bool(place) and name.lower() in place.lower()
+                          for name, place in zip(contexts.fillna(""), country.fillna(""))], index=texts.index)
+    return _values(country.where(~(digits | own_name)))
+
+
+def _sites(texts, contexts):
+    cleaned = (texts.str.replace(_BRACKETS_DOTALL, "", regex=True).str.replace(_PARENS_KEEP, r"\1", regex=True)
+               .str.replace(_SPACED_IN, ", ", regex=True))
+    return [[parts] for parts in _lists(cleaned.str.split(_COMMA_OR_NEWLINE, regex=True), texts.index)]
+
+
+# the column versions of PER_ROW: (texts, contexts) Series of distinct values -> cleaned values in order
+COLUMNS = {
+    "release_date": _release_dates,
+    "running_time": _running_times,
+    "languages": _languages,
+    "countries": _countries,
+    "birth_country": _birth_countries,
+    "duration": _durations,
+    "site": _sites,
+}
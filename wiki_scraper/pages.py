@@ -0,0 +1,87 @@
+import threading
+
+from .logs import get_logger
+from .text import link_title
+
+log = get_logger("pages")
+
+# tables whose rows store the canonical title of their article (wiki_title): id column
+PAGE_TABLES = {"person": "person_id", "movie": "movie_id"}
+
+# title of a requested page -> title of the article it redirected to, for this process
+_redirects = {}
+
+
+def _wiki_path(url):
+    return "/wiki/" + url.split("/wiki/", 1)[1] if url and "/wiki/" in url else None
+
+
+def remember_redirect(url, canonical):
+    requested = link_title(_wiki_path(url))
+    if requested and canonical and requested != canonical:
+        _redirects[requested] = canonical
+
+
+# function to get the canonical title of the article a /wiki/ link or URL points to
+# (a redirect resolves once its page has been fetched)
+def page_title(link):
+    title = link_title(_wiki_path(link))
+    return _redirects.get(title, title) if title else None
+
+
+class PageIndex:
+    """Row id per canonical article title, for each table in PAGE_TABLES."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._ids = {table: {} for table in PAGE_TABLES}
+
+    def __len__(self):
+        return sum(len(ids) for ids in self._ids.values())
+
+    def get(self, table, title):
+        return self._ids[table].get(title) if title else None
+
+    def add(self, table, title, id):
+        if title and id is not None:
+            with self._lock:
+                self._ids[table].setdefault(title, id)
+
+
+_index = None
+_load_lock = threading.Lock()
+
+
+# function to get the page index of the person and movie tables, loaded on first use
+def page_index():
+    global _index
+    if _index is None:
+        with _load_lock:
+            if _index is None:
+                _index = _load()
+    return _index
+
+
+def reset_page_index():
+    """Drop the loaded index (e.g. when the database changes); it reloads on next use."""
+    global _index
+    _index = None
+
+
+def _load():
+    from .db import connect_db, ensure_columns
+
+    ensure_columns()
+    index = PageIndex()
+    conn = connect_db()
+    cursor = conn.cursor()
+    try:
+        for table, id_col in PAGE_TABLES.items():
+            cursor.execute(f"SELECT {id_col}, wiki_title FROM {table} WHERE wiki_title IS NOT NULL")
+            for id, title in cursor.fetchall():
+                index.add(table, title, id)
+    finally:
+        cursor.close()
+        conn.close()
+    log.info("Loaded %s article titles into the page index", len(index))
+    return index
@@ -0,0 +1,148 @@
+import os
+import threading
+
+from .logs import get_logger
+from .text import fold_name
+
+log = get_logger("people")
+
+# trigram overlap (Jaccard) above which two names born on the same day are the same person
+SIMILARITY = 0.7
+
+
+def _trigrams(name):
+    padded = f"  {name} "
+    return frozenset(padded[i:i + 3] for i in range(len(padded) - 2))
+
+
+def _similarity(a, b):
+    return len(a & b) / len(a | b) if a and b else 0.0
+
+
+class _Entry:
+    __slots__ = ("id", "middle", "birth_date", "name", "trigrams")
+
+    def __init__(self, id, first, middle, last, birth_date):
+        self.id = id
+        self.middle = fold_name(middle) or None
+        self.birth_date = str(birth_date) if birth_date else None
+        self.name = " ".join(filter(None, (fold_name(first), self.middle, fold_name(last))))
+        self.trigrams = _trigrams(self.name)
+
+
+class PersonIndex:
+    """
+    People by folded first and last name (case, accents and punctuation ignored), matched
+    with the rules person_exists and insert_person apply in SQL. A person with a birth date
+    that has no exact match is also compared to the people born the same day whose folded
+    name starts alike (the blocking key), and taken if their trigrams are similar enough,
+    which catches spelling variants such as "Alfred Hitchcok".
+    The lock makes it safe for the scheduler's worker threads; every operation is a few
+    dict lookups, so they do not queue on it for long.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._by_name = {}
+        self._by_block = {}
+        self._ids = set()
+        self._claims = {}
+
+    def __len__(self):
+        return len(self._ids)
+
+    def claim(self, first):
+        """
+        Lock to hold across find, INSERT and add for a person with this first name, so two
+        threads that meet the same new person at once cannot both insert them. It covers
+        every name that could match (exactly or by similarity): all start with the same letter.
+        """
+        key = fold_name(first)[:1]
+        with self._lock:
+            claim = self._claims.get(key)
+            if claim is None:
+                claim = self._claims[key] = threading.RLock()
+        return claim
+
+    def add(self, id, first, middle, last, birth_date):
+        entry = _Entry(id, first, middle, last, birth_date)
+        with self._lock:
+            if id in self._ids:
+                return
+            self._ids.add(id)
+            self._by_name.setdefault((fold_name(first), fold_name(last)), []).append(entry)
+            if entry.birth_date:
+                self._by_block.setdefault((entry.birth_date, entry.name[:1]), []).append(entry)
+
+    def find(self, first, middle, last, birth_date, any_birth_date=False):
+        """
+        Id of the person, or None. With a birth date: same name and birth date (or a near-
+        duplicate name born that day). Without one: any namesake if any_birth_date (the rule
+        insert_person and the connection helpers use), else a namesake without a birth date
+        and with the same middle name, if one is given (person_exists).
+        """
+        birth_date = str(birth_date) if birth_date else None
+        middle = fold_name(middle) or None
+        with self._lock:
+            candidates = self._by_name.get((fold_name(first), fold_name(last)), ())
+            for entry in candidates:
+                if birth_date:
+                    if entry.birth_date == birth_date:
+                        return entry.id
+                elif any_birth_date or (entry.birth_date is None and (middle is None or entry.middle == middle)):
+                    return entry.id
+            if not birth_date:
+                return None
+            name = " ".join(filter(None, (fold_name(first), middle, fold_name(last))))
+            trigrams = _trigrams(name)
+            best, best_score = None, SIMILARITY
+            for entry in self._by_block.get((birth_date, name[:1]), ()):
+                score = _similarity(trigrams, entry.trigrams)
+                if score >= best_score:
+                    best, best_score = entry, score
+        if best is not None:
+            log.debug("Matched %s to person %s (%s) by similarity %.2f", name, best.id, best.name, best_score)
+            return best.id
+        return None
+
+
+_enabled = os.getenv("SCRAPER_PERSON_INDEX", "1").lower() not in ("0", "false", "no")
+_index = None
+_load_lock = threading.Lock()
+
+
+def configure_person_index(enabled=None):
+    """Turn the process-wide index on or off (default: SCRAPER_PERSON_INDEX, on); it reloads on next use."""
+    global _enabled, _index
+    if enabled is not None:
+        _enabled = enabled
+    _index = None
+
+
+# function to get the index of the person table, loaded on first use (None when disabled)
+def person_index():
+    global _index
+    if not _enabled:
+        return None
+    if _index is None:
+        with _load_lock:
+            if _index is None:
+                _index = _load()
+    return _index
+
+
+def _load():
+    from .db import connect_db
+
+    index = PersonIndex()
+    conn = connect_db()
+    cursor = conn.cursor()
+    try:
+        cursor.execute("SELECT person_id, first_name, middle_name, last_name, birthDate FROM person")
+        for row in cursor.fetchall():
+            index.add(*row)
+    finally:
+        cursor.close()
+        conn.close()
+    log.info("Loaded %s people into the person index", len(index))
+    return index
@@ -0,0 +1,176 @@
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+from .logs import get_logger, current_edition
+
+log = get_logger("profiling")
+
+# seconds between stack samples while profiling
+SAMPLE_INTERVAL = 0.01
+# functions listed in the merged report
+TOP = 25
+
+# what a sample was doing, by the file of the innermost frame that matches (checked leaf first)
+KINDS = (
+    ("db", ("pymysql",)),
+    ("network", ("requests", "urllib3", "httpx", "httpcore", "h2", "ssl.py", "socket.py")),
+    ("soup", ("bs4", "lxml", "html5lib")),
+    ("text cleanup", (f"wiki_scraper{os.sep}text.py", f"{os.sep}re{os.sep}", "sre_")),
+)
+
+_profiler = None
+
+
+def _frame_name(code):
+    return f"{code.co_qualname} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+def _kind(frame):
+    while frame is not None:
+        path = frame.f_code.co_filename
+        for kind, parts in KINDS:
+            if any(part in path for part in parts):
+                return kind
+        frame = frame.f_back
+    return "scraper"
+
+
+class SamplingProfiler:
+    """
+    Statistical profiler for the hooked scrape functions.
+    A sampler thread reads the stack of every thread that is inside a hook every
+    SAMPLE_INTERVAL and counts it under the edition of the innermost hook (film and person
+    tasks inherit it through the log context, and a worker waiting on its own tasks may
+    run another edition's in between); threads outside a hook, such as idle
+    workers, are not sampled. Nothing runs on the scraping threads themselves, so a
+    profiled crawl runs at close to full speed.
+    """
+
+    def __init__(self, directory, interval=SAMPLE_INTERVAL):
+        self.directory = directory
+        self.interval = interval
+        self.samples = {}  # edition -> Counter of stacks (tuples of frame names, outermost first)
+        self.kinds = Counter()
+        self.ticks = 0
+        self.elapsed = 0.0
+        self._active = {}  # thread id -> editions of the hooks it is inside, innermost last
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._sample_loop, name="profile-sampler", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def enter(self, edition):
+        ident = threading.get_ident()
+        with self._lock:
+            self._active.setdefault(ident, []).append(edition)
+
+    def exit(self):
+        ident = threading.get_ident()
+        with self._lock:
+            editions = self._active[ident]
+            editions.pop()
+            if not editions:
+                del self._active[ident]
+
+    def _sample_loop(self):
+        started = time.perf_counter()
+        while not self._stop.wait(self.interval):
+            self.ticks += 1
+            self.elapsed = time.perf_counter() - started
+            frames = sys._current_frames()
+            with self._lock:
+                active = [(ident, editions[-1]) for ident, editions in self._active.items()]
+            for ident, edition in active:
+                frame = frames.get(ident)
+                if frame is None:
+                    continue
+                self.kinds[_kind(frame)] += 1
+                stack = []
+                while frame is not None:
+                    stack.append(_frame_name(frame.f_code))
+                    frame = frame.f_back
+                self.samples.setdefault(edition, Counter())[tuple(reversed(stack))] += 1
+
+    def write(self):
+        """Write edition-<n>.collapsed per edition (flamegraph.pl / speedscope input) and top.txt."""
+        os.makedirs(self.directory, exist_ok=True)
+        merged = Counter()
+        for edition, stacks in self.samples.items():
+            merged.update(stacks)
+            path = os.path.join(self.directory, f"edition-{edition}.collapsed")
+            with open(path, "w", encoding="utf-8") as f:
+                for stack, count in stacks.most_common():
+                    f.write(f"{';'.join(stack)} {count}\n")
+        lines = self.report(merged)
+        with open(os.path.join(self.directory, "top.txt"), "w", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+        return lines
+
+    def report(self, stacks):
+        total = sum(stacks.values())
+        if not total:
+            return ["No samples taken"]
+        own, inclusive = Counter(), Counter()
+        for stack, count in stacks.items():
+            own[stack[-1]] += count
+            for name in set(stack):
+                inclusive[name] += count
+        # the sampler wakes up a little later than asked under load, so weigh samples by the real tick length
+        seconds = self.elapsed / self.ticks if self.ticks else self.interval
+        lines = [f"{total} samples ({total * seconds:.1f} s of thread time) over {len(self.samples)} editions"]
+        lines.append("time by kind: " + ", ".join(
+            f"{kind} {100 * count / total:.0f}%" for kind, count in self.kinds.most_common()
+        ))
+        lines.append(f"{'self s':>8} {'self %':>7} {'total s':>8}  function")
+        for name, count in own.most_common(TOP):
+            lines.append(f"{count * seconds:8.2f} {100 * count / total:6.1f}% {inclusive[name] * seconds:8.2f}  {name}")
+        return lines
+
+
+@contextmanager
+def profiled():
+    """Sample the block under the current edition (no-op unless profiling is on)."""
+    profiler = _profiler
+    if profiler is None:
+        yield
+        return
+    edition = current_edition()
+    profiler.enter("other" if edition is None else edition)
+    try:
+        yield
+    finally:
+        profiler.exit()
+
+
+def start_profiling(directory=None, interval=SAMPLE_INTERVAL):
+    """Start sampling the hooked functions (directory default: SCRAPER_PROFILE; off if neither is set)."""
+    global _profiler
+    directory = directory or os.getenv("SCRAPER_PROFILE")
+    if not directory:
+        return
+    _profiler = SamplingProfiler(directory, interval)
+    _profiler.start()
+    log.info("Profiling into %s", directory)
+
+
+def finish_profiling():
+    """Stop sampling, write the per-edition stacks and log the merged top functions."""
+    global _profiler
+    profiler, _profiler = _profiler, None
+    if profiler is None:
+        return None
+    profiler.stop()
+    lines = profiler.write()
+    for line in lines:
+        log.info("%s", line)
+    return lines
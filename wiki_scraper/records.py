@@ -0,0 +1,89 @@
+import sys
+from dataclasses import dataclass, field
+from typing import List, NamedTuple, Optional, Tuple
+
+from .text import format_person
+
+
+def intern_text(text):
+    """Intern a short, often repeated string (name parts, categories) so all records share one copy."""
+    return sys.intern(text) if text else text
+
+
+class PersonRef(NamedTuple):
+    """
+    A person as found on a page: the name split into words plus the article link, if any.
+    Indexes like the old [[name parts], link] lists (ref[0][0] is the first name).
+    """
+    parts: Tuple[str, ...]
+    link: Optional[str] = None
+
+    @classmethod
+    def from_text(cls, text, link=None):
+        return cls(tuple(intern_text(p) for p in format_person(text)), link)
+
+    @property
+    def full_name(self):
+        return " ".join(self.parts)
+
+
+class Raw(NamedTuple):
+    """
+    A field value as it was found on a page, left for the batch normalization stage
+    (normalize.normalize_records) to clean together with the rest of its column.
+    context is whatever else the cleanup reads (the person's name for a birthplace).
+    """
+    kind: str
+    text: str
+    context: Optional[str] = None
+
+
+class FilmRef(NamedTuple):
+    """A film title plus the /wiki/ link it was found under (same order as scrape_movie_details' arguments)."""
+    title: str
+    link: Optional[str] = None
+
+
+class Nomination(NamedTuple):
+    """
+    One nominee of a category table.
+    Unpacks like the old [movie_title, producer_list, link] lists; for acting and directing
+    categories title is the person and people holds the film.
+    """
+    title: str
+    people: Tuple[str, ...] = ()
+    link: Optional[str] = None
+
+    @classmethod
+    def build(cls, title, people, link=None):
+        return cls(intern_text(title), tuple(intern_text(p) for p in people), link)
+
+
+@dataclass(slots=True)
+class EditionInfo:
+    """What scrape_award_info_data reads from a ceremony infobox."""
+    edition: int
+    date: Optional[str] = None
+    venues: List[list] = field(default_factory=list)
+    duration: Optional[int] = None
+    network: List[str] = field(default_factory=list)
+    # (position title, PersonRef) for hosts, producers, directors, ...
+    people: List[Tuple[str, PersonRef]] = field(default_factory=list)
+    # position titles of the infobox rows found, in page order
+    positions: List[str] = field(default_factory=list)
+
+
+@dataclass(slots=True)
+class FilmInfo:
+    """What load_film_page reads from a film infobox."""
+    name: str
+    # /wiki/ links of the credited rows, prefetched while the credits are worked through
+    person_links: List[str] = field(default_factory=list)
+    # (position title, entity type, [PersonRef]) per credited row
+    credits: List[Tuple[str, Optional[str], List[PersonRef]]] = field(default_factory=list)
+    positions: List[str] = field(default_factory=list)
+    production_companies: List[str] = field(default_factory=list)
+    release_dates: List[str] = field(default_factory=list)
+    languages: List[str] = field(default_factory=list)
+    running_time: Optional[int] = None
+    countries: List[str] = field(default_factory=list)
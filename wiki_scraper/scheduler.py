@@ -0,0 +1,200 @@
+import os
+import json
+import heapq
+import time
+import itertools
+import threading
+import contextvars
+import concurrent.futures
+
+
+# finer tasks are dispatched first so editions that already started can finish
+# (and spread their films/persons over every idle worker) before new ones begin
+LEVELS = {"person": 0, "film": 1, "edition": 2}
+
+# seconds assumed for a task nobody has timed yet
+DEFAULT_COSTS = {"person": 1.0, "film": 8.0}
+
+_local = threading.local()
+
+
+class CostModel:
+    """
+    Per-task timings from previous runs, kept in a small JSON file.
+    Unknown editions are estimated from the edition number (recent ceremonies have far
+    more nominees, films and people than the early ones).
+    """
+
+    def __init__(self, path=None):
+        self.path = path or os.getenv("SCRAPER_TIMINGS", ".scrape_timings.json")
+        self._timings = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path=None):
+        model = cls(path)
+        try:
+            with open(model.path, encoding="utf-8") as f:
+                model._timings = json.load(f)
+        except (OSError, ValueError):
+            pass
+        return model
+
+    def estimate(self, kind, key):
+        seconds = self._timings.get(f"{kind}:{key}")
+        if seconds is not None:
+            return seconds
+        if kind == "edition":
+            # "97" for the Academy Awards, "<key>:82" for another award body
+            return 30.0 + 2.0 * int(str(key).rsplit(":", 1)[-1])
+        return DEFAULT_COSTS.get(kind, 1.0)
+
+    def record(self, kind, key, seconds):
+        name = f"{kind}:{key}"
+        with self._lock:
+            old = self._timings.get(name)
+            # moving average, so one slow network moment does not dominate the next run
+            self._timings[name] = seconds if old is None else 0.7 * old + 0.3 * seconds
+
+    def save(self):
+        with self._lock:
+            data = dict(self._timings)
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=0, sort_keys=True)
+        os.replace(tmp, self.path)
+
+
+class _Task:
+    __slots__ = ("kind", "key", "fn", "args", "kwargs", "future", "context")
+
+    def __init__(self, kind, key, fn, args, kwargs):
+        self.kind = kind
+        self.key = key
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.future = concurrent.futures.Future()
+        # run in a copy of the submitter's context, so a film scraped for edition 96
+        # on another worker still logs with edition=96
+        self.context = contextvars.copy_context()
+
+
+class Scheduler:
+    """
+    Priority thread pool for edition, film and person tasks.
+    The queue is ordered by (level, -estimated cost): the finest pending work goes first and,
+    within a level, the longest task starts first so the run does not end on a long tail.
+    A thread waiting on sub-tasks (see wait) runs queued film/person tasks itself instead of
+    blocking, which keeps every worker busy and rules out pool deadlocks.
+    """
+
+    def __init__(self, workers=15, costs=None):
+        self.costs = costs or CostModel()
+        self._heap = []
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._shutdown = False
+        self._threads = [
+            threading.Thread(target=self._worker, name=f"scraper-{i}", daemon=True)
+            for i in range(max(1, workers))
+        ]
+        for t in self._threads:
+            t.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown()
+
+    def submit(self, kind, key, fn, *args, cost=None, **kwargs):
+        task = _Task(kind, key, fn, args, kwargs)
+        if cost is None:
+            cost = self.costs.estimate(kind, key)
+        with self._cond:
+            if self._shutdown:
+                raise RuntimeError("Scheduler is shut down")
+            heapq.heappush(self._heap, (LEVELS.get(kind, 0), -cost, next(self._seq), task))
+            self._cond.notify()
+        return task.future
+
+    def map(self, kind, fn, items, keys=None):
+        """Run fn over items as separate tasks and return the results in order."""
+        keys = keys or [None] * len(items)
+        futures = [self.submit(kind, key, fn, item) for item, key in zip(items, keys)]
+        self.wait(futures)
+        return [f.result() for f in futures]
+
+    def wait(self, futures):
+        pending = [f for f in futures if not f.done()]
+        while pending:
+            task = self._pop(max_level=LEVELS["film"])
+            if task is not None:
+                self._run(task)
+            else:
+                concurrent.futures.wait(pending, timeout=0.05, return_when=concurrent.futures.FIRST_COMPLETED)
+            pending = [f for f in pending if not f.done()]
+
+    def shutdown(self, wait=True):
+        with self._cond:
+            self._shutdown = True
+            self._cond.notify_all()
+        if wait:
+            for t in self._threads:
+                t.join()
+
+    def _pop(self, max_level=None):
+        with self._cond:
+            if self._heap and (max_level is None or self._heap[0][0] <= max_level):
+                return heapq.heappop(self._heap)[-1]
+        return None
+
+    def _worker(self):
+        _local.scheduler = self
+        while True:
+            with self._cond:
+                while not self._heap and not self._shutdown:
+                    self._cond.wait()
+                if not self._heap:
+                    return
+                task = heapq.heappop(self._heap)[-1]
+            self._run(task)
+
+    def _run(self, task):
+        if not task.future.set_running_or_notify_cancel():
+            return
+        start = time.perf_counter()
+        try:
+            result = task.context.run(task.fn, *task.args, **task.kwargs)
+        except BaseException as e:
+            task.future.set_exception(e)
+        else:
+            task.future.set_result(result)
+        finally:
+            if task.key is not None:
+                self.costs.record(task.kind, task.key, time.perf_counter() - start)
+
+
+def current_scheduler():
+    """The scheduler whose worker is running the caller, or None outside of one."""
+    return getattr(_local, "scheduler", None)
+
+
+def set_remote(remote):
+    """Route run_tasks calls of this thread through a shared work queue (see workqueue.QueueWorker)."""
+    _local.remote = remote
+
+
+# function to fan items out as separate tasks when running under a scheduler (serially otherwise)
+def run_tasks(kind, fn, items, keys=None):
+    items = list(items)
+    remote = getattr(_local, "remote", None)
+    if remote is not None and items and remote.handles(kind):
+        # the items may run on another machine, so fn has to be the handler registered
+        # for kind and the items plain JSON-able values
+        return remote.map(kind, items, keys)
+    scheduler = current_scheduler()
+    if scheduler is None or len(items) < 2:
+        return [fn(item) for item in items]
+    return scheduler.map(kind, fn, items, keys)
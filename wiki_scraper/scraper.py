@@ -0,0 +1,1296 @@
+import re
+from urllib.parse import unquote
+
+from . import STAGES
+from .logs import get_logger, edition_context
+from .scheduler import run_tasks
+from .fetch import fetch, parse_page, load_page, prefetch, canonical_title
+from .wikidata import lookup_person
+from .memory import stage
+from .profiling import profiled
+from .session import edition_session
+from .seen import is_done, mark_done
+from .awards import ACADEMY_AWARDS, current_source, source_context, get_source
+from .extracts import extracted
+from .normalize import normalized, normalize_records, batch_normalizing
+from .records import PersonRef, FilmRef, Nomination, EditionInfo, FilmInfo, intern_text
+from .text import (
+    flatten, normalize_movie_name, format_date, format_site_multi, format_movie_name,
+    clean_producers, clean_text, clean_category,
+)
+from .db import (
+    insert_venue, insert_person, insert_people, get_venue_id, insert_award, insert_position,
+    insert_person_connection, insert_movie_person, insert_movie, insert_noinfobox_movie,
+    insert_category, insert_production_company, award_edition_exists, movie_exists,
+    person_exists, insert_nomination_one, insert_nomination_person,
+)
+
+log = get_logger("scraper")
+
+
+# function to check if the link is valid
+def can_follow_link(entity_type, article):
+    """
+    Given an entity type (e.g. "director") and an article name (e.g. "Hamish_Hamilton"),
+    this function checks whether the Wikipedia page at:
+         https://en.wikipedia.org/wiki/{article}
+    actually corresponds to the desired person.
+    
+    If the page contains a disambiguation note (e.g., "This article is about ..."),
+    it will try an alternate URL by appending _({entity_type}) to the article name.
+    Returns the URL that appears valid.
+    """
+    base_url = "https://en.wikipedia.org/wiki/"
+    url = f"{base_url}{article}"
+    response = fetch(url, "disambiguation")
+    
+    if response.status_code != 200:
+        log.warning("Error: Could not fetch %s", url)
+        return None
+
+    soup = parse_page(response.content, "disambiguation")
+
+    # find disambiguation or hatnote
+    hatnotes = soup.find_all("div", {'class': 'hatnote navigation-not-searchable'})
+
+    if hatnotes:
+        log.debug("Potential disambiguation found for %s", article)
+        for hatnote in hatnotes:
+            if entity_type and entity_type.lower() in hatnote.text.lower():
+                log.debug("Disambiguation detected, switching to specific entity type: %s", entity_type)
+                alt_article = f"{article}_({entity_type})"
+                alt_url = f"{base_url}{alt_article}"
+                
+                # Check if alternative URL is valid
+                alt_response = fetch(alt_url, "disambiguation")
+                if alt_response.status_code == 200 and "Wikipedia does not have an article" not in alt_response.text:
+                    return alt_url
+                else:
+                    log.debug("Alternative URL not found: %s, sticking with original.", alt_url)
+
+    return url
+
+
+def scrape_person_list(person_list, entity_type=None):
+    return scrape_people([(person, entity_type) for person in person_list])
+
+
+# function to get (birth date, birth country, death date) of (person, entity type) pairs
+def scrape_people(people):
+    with profiled():
+        return _scrape_people(people)
+
+
+def _scrape_people(people):
+    # Remove any empty list entries (and person refs whose name came out empty)
+    people = [
+        (p, entity_type) for p, entity_type in people
+        if not (isinstance(p, list) and not p) and not (isinstance(p, PersonRef) and not p.parts)
+    ]
+    
+    # people in the Wikidata index (if one is configured) need no page at all
+    details = [lookup_person(*person_name_and_link(person), entity_type) for person, entity_type in people]
+    missing = [i for i, found in enumerate(details) if found is None]
+
+    # every other person is a separate task, so under the scheduler idle workers fetch them in parallel
+    scraped = run_tasks("person", _scrape_person_task, [people[i] for i in missing])
+    for i, found in zip(missing, scraped):
+        details[i] = found
+    # with the batch stage on, the birth countries of the whole batch are cleaned together
+    return normalize_records(details)
+
+
+def _scrape_person_task(item):
+    person, entity_type = item
+    return scrape_person(person, entity_type)
+
+
+# function to split a person entry into the article name and the link it came with (if any)
+def person_name_and_link(person):
+    provided_url = None
+    if isinstance(person, (list, tuple)):
+        # Check if the last element is a URL (either starting with "http" or "/")
+        if isinstance(person[-1], str) and (person[-1].startswith("http") or person[-1].startswith("/")):
+            provided_url = person[-1]
+            # Join all preceding parts to form the full name, flattening each part.
+            name = "_".join(flatten(part) for part in person[:-1] if part)
+        else:
+            # Fallback: flatten the list to get the name.
+            name = flatten(person)
+    else:
+        name = person.strip()
+    return name, provided_url
+
+
+# function to scrape birth date, birth country and death date of a single person
+def scrape_person(person, entity_type=None):
+    name, provided_url = person_name_and_link(person)
+    
+    log.debug("Person: %s", person)
+    log.debug("Full Name: %s", name)
+    
+    # If a provided URL exists and starts with "/", prepend the Wikipedia base URL.
+    if provided_url:
+        if provided_url.startswith("/"):
+            url = "https://en.wikipedia.org" + provided_url
+        else:
+            url = provided_url
+    else:
+        url = can_follow_link(entity_type, name)
+        # If can_follow_link fails to generate a URL, build one manually.
+        if not url:
+            # Replace spaces with underscores for the Wikipedia URL.
+            url = "https://en.wikipedia.org/wiki/" + name.replace(" ", "_")
+    
+    if not url:
+        log.debug("Skipping %s as no valid URL could be determined.", name)
+        return (None, None, None)
+    
+    log.debug("URL: %s", url)
+    with stage("person"), profiled():
+        return _scrape_person_page(url, name)
+
+
+def _scrape_person_page(url, name):
+    content = fetch(url, "person").content
+    # the birth country is checked against the name, so the name is part of the key
+    return tuple(extracted("person", content, lambda: extract_person(parse_page(content, "person"), name), name))
+
+
+# function to read birth date, birth country and death date from a person page
+def extract_person(soup, name):
+    person_infobox = soup.find("table", class_=lambda c: c and "infobox" in c and "vcard" in c)
+    
+    person_birth_date = None
+    person_birth_country = None
+    person_death_date = None
+
+    if person_infobox:
+        person_details = person_infobox.find_all("tr")
+        for row in person_details:
+            header = row.find("th")
+            if header:
+                header_text = header.text.strip()
+                if "Born" in header_text:
+                    born_cell = row.find("td")
+                    birth_date_span = row.find("span", {'class': 'bday'})
+                    if birth_date_span:
+                        person_birth_date = birth_date_span.text.strip()
+                        # if only a year is provided, append "-01-01" to form a complete date
+                        if len(person_birth_date) == 4:
+                            person_birth_date = person_birth_date + "-01-01"
+                        # if year and month are provided (e.g., "1967-12"), append "-01" to form a complete date
+                        elif len(person_birth_date) == 7:
+                            person_birth_date = person_birth_date + "-01"
+                        log.debug("Birth Date: %s", person_birth_date)
+                    birthplace_div = row.find("div", {'class': 'birthplace'})
+                    if birthplace_div:
+                        person_birth_country = normalized("birth_country", birthplace_div.text, name)
+                    else:
+                        born_text = born_cell.get_text(" ", strip=True)
+                        if person_birth_date:
+                            born_text = born_text.replace(person_birth_date, "").strip()
+                        born_text = re.sub(r'\(.*?\)', '', born_text).strip()
+                        born_text = re.sub(r'\[.*?\]', '', born_text).strip()
+                        parts = [p.strip() for p in born_text.split(",") if p.strip()]
+                        if parts:
+                            person_birth_country = parts[-1]
+                            # Remove any trailing closing parenthesis
+                            person_birth_country = person_birth_country.rstrip(')')
+                            log.debug("Birth Country (fallback): %s", person_birth_country)
+                            # Remove "citation needed" (case-insensitive)
+                            person_birth_country = re.sub(r'\bcitation needed\b', '', person_birth_country, flags=re.I).strip()
+                            # If person_birth_country contains digits or the person's name, set it to None
+                            if person_birth_country and (re.search(r'\d', person_birth_country) or name.lower() in person_birth_country.lower()):
+                                person_birth_country = None
+                if "Died" in header_text:
+                    death_date_span = row.find("span", class_="dday")
+                    if death_date_span:
+                        person_death_date = death_date_span.text.strip()
+                        log.debug("Death Date: %s", person_death_date)
+    else:
+        log.debug("No infobox found for %s", name)
+
+    return (person_birth_date, person_birth_country, person_death_date)
+
+
+# infobox rows whose links scrape_movie_details follows to person pages
+PERSON_ROWS = ("directed by", "written by", "produced by", "starring", "cinematography", "edited by", "music by")
+
+
+def infobox_person_links(infobox):
+    links = []
+    for row in infobox.find_all("tr"):
+        header = row.find("th")
+        td = row.find("td")
+        if header and td and any(name in header.text.strip().lower() for name in PERSON_ROWS):
+            links.extend(a.get("href") for a in td.find_all("a") if not a.find_parent("sup"))
+    return links
+
+
+# page: the (article title, FilmInfo) load_film_page already read, to store without fetching again
+def scrape_movie_details(movie_title=None, movie_link=None, page=None):
+    if not movie_title and not movie_link:
+        log.debug("Empty list. No movies provided.")
+        return
+
+    with stage("film"), profiled():
+        movie_page, info = page or load_film_page(movie_title, movie_link)
+        film = _store_film(movie_page, info, movie_title, movie_link)
+    mark_done(film_key(movie_title, movie_link))
+    return film
+
+
+# function to get the key a scraped film is recorded under in the seen filter
+def film_key(movie_title, movie_link):
+    return f"film:{movie_link or movie_title}"
+
+
+# function to fetch and extract a film page: (article title, FilmInfo or None without an infobox)
+def load_film_page(movie_title, movie_link):
+    if movie_link:
+        url = f"https://en.wikipedia.org{movie_link}"
+    else: 
+        url = f"https://en.wikipedia.org/wiki/{format_movie_name(movie_title)}"
+
+    response = fetch(url, "film")
+    # the article identifies the film, whatever title or redirect it was linked under
+    movie_page = canonical_title(response)
+    return movie_page, extracted("film", response.content, lambda: extract_film(parse_page(response.content, "film")))
+
+
+def _store_film(movie_page, film, movie_title, movie_link):
+    if film is None:
+        log.debug("Movie %s has no infobox. Skipping scrape.", (movie_title, movie_link))
+        insert_noinfobox_movie(movie_title, movie_page)
+        return FilmRef(movie_title, movie_link)
+
+    # a film loaded on its own still has its fields raw with the batch stage on
+    normalize_records(film)
+    # start fetching the people of this film while their credits are worked through
+    prefetch(film.person_links)
+    log.debug("Movie %s: release dates %s, country %s", film.name, film.release_dates, film.countries)
+    connections = credit_people(film.name, movie_page, film.credits)
+    insert_position(film.positions)
+    insert_production_company(film.production_companies)
+    insert_movie(film.name, film.release_dates, film.languages, film.running_time, film.countries,
+                 film.production_companies, movie_page)
+    insert_movie_person(connections)
+    # the page heading is the name the movie row was stored under
+    return FilmRef(film.name, movie_link)
+
+
+# function to read the name and infobox of a film page (None when it has no infobox)
+def extract_film(soup):
+    # Get the movie name from the page's main heading
+    movie_name = soup.find("h1", id="firstHeading").text.strip()
+    log.debug("Movie Name: %s", movie_name)
+
+    movie_infobox = soup.find("table", {'class': 'infobox vevent'})
+    '''
+    if not movie_infobox:
+        print(f"Could not find movie infobox for {movie_title} at {url}")
+        url = f"https://en.wikipedia.org/wiki/{format_movie_name(movie_title)}_(film)"
+        print(f"Using (film) keyword for {movie_title} at {url}")
+        page = requests.get(url)
+        soup = BeautifulSoup(page.content, 'lxml')
+
+        # Get the movie name from the page's main heading
+        movie_name = soup.find("h1", id="firstHeading").text.strip()
+        print("Movie Name:", movie_name)
+        movie_infobox = soup.find("table", {'class': 'infobox vevent'})
+    '''
+
+    if not movie_infobox:
+        return None
+
+    movie_details = movie_infobox.find_all("tr")
+
+    # Initialize lists for details
+    in_language = []
+    country = []
+
+    movie_directors = []
+    movie_producers = []
+    movie_writers = []
+    movie_stars = []
+    movie_cinematography = []
+    movie_editor = []
+    movie_music = []
+    production_companies = []
+    release_dates = []
+    running_time = []
+
+    positions = []
+    credits = []  # (position, entity type, people) per credited infobox row
+
+    for row in movie_details:
+        header = row.find("th")
+        if header:
+            header_text = header.text.strip().lower()
+            td = row.find("td")
+            if not td:
+                continue
+
+            # --- Directors ---
+            if "directed by" in header_text:
+                positions.append("Director")
+                li_items = td.find_all("li")
+                if li_items:
+                    for li in li_items:
+                        a_tags = li.find_all("a")
+                        if a_tags:
+                            for a_tag in a_tags:
+                                if a_tag.find_parent("sup"):
+                                    continue
+                                director_text = a_tag.text.strip()
+                                link = a_tag.get("href", None)
+                                movie_directors.append(PersonRef.from_text(director_text, link))
+                        else:
+                            director_text = li.get_text(strip=True)
+                            movie_directors.append(PersonRef.from_text(director_text))
+                else:
+                    links = td.find_all("a")
+                    if links:
+                        for a in links:
+                            if a.find_parent("sup"):
+                                continue
+                            director_text = a.text.strip()
+                            link = a.get("href", None)
+                            movie_directors.append(PersonRef.from_text(director_text, link))
+                    else:
+                        movie_directors.append(PersonRef.from_text(td.text.strip()))
+                if movie_directors:
+                    log.debug("Formatted Director: %s", movie_directors)
+                    credits.append(("Director", "director", movie_directors))
+
+            # --- Writers ---
+            if "written by" in header_text:
+                positions.append("Writer")
+                li_items = td.find_all("li")
+                if li_items:
+                    for li in li_items:
+                        a_tags = li.find_all("a")
+                        if a_tags:
+                            for a_tag in a_tags:
+                                if a_tag.find_parent("sup"):
+                                    continue
+                                writer_text = a_tag.text.strip()
+                                link = a_tag.get("href", None)
+                                movie_writers.append(PersonRef.from_text(writer_text, link))
+                        else:
+                            writer_text = li.get_text(strip=True)
+                            movie_writers.append(PersonRef.from_text(writer_text))
+                else:
+                    links = td.find_all("a")
+                    if links:
+                        for a in links:
+                            if a.find_parent("sup"):
+                                continue
+                            writer_text = a.text.strip()
+                            link = a.get("href", None)
+                            movie_writers.append(PersonRef.from_text(writer_text, link))
+                    else:
+                        movie_writers.append(PersonRef.from_text(td.text.strip()))
+                if movie_writers:
+                    log.debug("Formatted Writer: %s", movie_writers)
+                    credits.append(("Writer", "writer", movie_writers))
+
+            # --- Producers ---
+            if "produced by" in header_text:
+                positions.append("Producer")
+                li_items = td.find_all("li")
+                if li_items:
+                    for li in li_items:
+                        a_tags = li.find_all("a")
+                        if a_tags:
+                            for a_tag in a_tags:
+                                if a_tag.find_parent("sup"):
+                                    continue
+                                prod_text = a_tag.text.strip()
+                                link = a_tag.get("href", None)
+                                movie_producers.append(PersonRef.from_text(prod_text, link))
+                        else:
+                            prod_text = li.get_text(strip=True)
+                            movie_producers.append(PersonRef.from_text(prod_text))
+                else:
+                    links = td.find_all("a")
+                    if links:
+                        for a in links:
+                            if a.find_parent("sup"):
+                                continue
+                            prod_text = a.text.strip()
+                            link = a.get("href", None)
+                            movie_producers.append(PersonRef.from_text(prod_text, link))
+                    else:
+                        movie_producers.append(PersonRef.from_text(td.text.strip()))
+                if movie_producers:
+                    # filter out any producer entries where the formatted name is an empty list.
+                    movie_producers = [producer for producer in movie_producers if producer[0]]
+                    log.debug("Formatted Producer: %s", movie_producers)
+                    credits.append(("Producer", "producer", movie_producers))
+
+            # --- Stars ---
+            if "starring" in header_text:
+                positions.append("Star")
+                li_items = td.find_all("li")
+                if li_items:
+                    for li in li_items:
+                        a_tags = li.find_all("a")
+                        if a_tags:
+                            for a_tag in a_tags:
+                                if a_tag.find_parent("sup"):
+                                    continue
+                                star_text = a_tag.text.strip()
+                                link = a_tag.get("href", None)
+                                movie_stars.append(PersonRef.from_text(star_text, link))
+                        else:
+                            star_text = li.get_text(strip=True)
+                            movie_stars.append(PersonRef.from_text(star_text))
+                else:
+                    links = td.find_all("a")
+                    if links:
+                        for a in links:
+                            if a.find_parent("sup"):
+                                continue
+                            star_text = a.text.strip()
+                            link = a.get("href", None)
+                            movie_stars.append(PersonRef.from_text(star_text, link))
+                    else:
+                        movie_stars.append(PersonRef.from_text(td.text.strip()))
+                if movie_stars:
+                    log.debug("Formatted Stars: %s", movie_stars)
+                    credits.append(("Star", None, movie_stars))
+                            
+            # --- Cinematography ---
+            if "cinematography" in header_text:
+                positions.append("Cinematographer")
+                li_items = td.find_all("li")
+                if li_items:
+                    for li in li_items:
+                        a_tags = li.find_all("a")
+                        if a_tags:
+                            for a_tag in a_tags:
+                                # Skip if the <a> is within a <sup> element.
+                                if a_tag.find_parent("sup"):
+                                    continue
+                                cine_text = a_tag.text.strip()
+                                link = a_tag.get("href", None)
+                                movie_cinematography.append(PersonRef.from_text(cine_text, link))
+                        else:
+                            cine_text = li.get_text(strip=True)
+                            movie_cinematography.append(PersonRef.from_text(cine_text))
+                else:
+                    links = td.find_all("a")
+                    if links:
+                        for a in links:
+                            # Skip if the <a> is within a <sup> element.
+                            if a.find_parent("sup"):
+                                continue
+                            cine_text = a.text.strip()
+                            link = a.get("href", None)
+                            movie_cinematography.append(PersonRef.from_text(cine_text, link))
+                    else:
+                        movie_cinematography.append(PersonRef.from_text(td.text.strip()))
+                if movie_cinematography:
+                    log.debug("Formatted Cinematographer: %s", movie_cinematography)
+                    credits.append(("Cinematographer", None, movie_cinematography))
+
+            # --- Editors ---
+            if "edited by" in header_text:
+                positions.append("Editor")
+                li_items = td.find_all("li")
+                if li_items:
+                    for li in li_items:
+                        a_tags = li.find_all("a")
+                        if a_tags:
+                            for a_tag in a_tags:
+                                editor_text = a_tag.text.strip()
+                                link = a_tag.get("href", None)
+                                movie_editor.append(PersonRef.from_text(editor_text, link))
+                        else:
+                            editor_text = li.get_text(strip=True)
+                            movie_editor.append(PersonRef.from_text(editor_text))
+                else:
+                    links = td.find_all("a")
+                    if links:
+                        for a in links:
+                            editor_text = a.text.strip()
+                            link = a.get("href", None)
+                            movie_editor.append(PersonRef.from_text(editor_text, link))
+                    else:
+                        movie_editor.append(PersonRef.from_text(td.text.strip()))
+                if movie_editor:
+                    log.debug("Formatted Editor: %s", movie_editor)
+                    credits.append(("Editor", "editor", movie_editor))
+            # --- Composers (Music By) ---
+            if "music by" in header_text:
+                positions.append("Composer")
+                li_items = td.find_all("li")
+                if li_items:
+                    for li in li_items:
+                        a_tags = li.find_all("a")
+                        if a_tags:
+                            for a_tag in a_tags:
+                                # Skip if the <a> is inside a <sup> tag.
+                                if a_tag.find_parent("sup"):
+                                    continue
+                                composer_text = a_tag.text.strip()
+                                link = a_tag.get("href", None)
+                                movie_music.append(PersonRef.from_text(composer_text, link))
+                        else:
+                            composer_text = li.get_text(strip=True)
+                            movie_music.append(PersonRef.from_text(composer_text))
+                else:
+                    links = td.find_all("a")
+                    if links:
+                        for a in links:
+                            # Skip any <a> that is within a <sup> tag.
+                            if a.find_parent("sup"):
+                                continue
+                            composer_text = a.text.strip()
+                            link = a.get("href", None)
+                            movie_music.append(PersonRef.from_text(composer_text, link))
+                    else:
+                        movie_music.append(PersonRef.from_text(td.text.strip()))
+                if movie_music:
+                    log.debug("Formatted Composer: %s", movie_music)
+                    credits.append(("Composer", "composer", movie_music))
+
+            # --- Production Companies ---
+            if "production" in header_text:
+                production_companies = []  # Ensure it's an empty list before appending
+                li_items = td.find_all("li")
+                if li_items:
+                    for li in li_items:
+                        text = li.get_text(strip=True)
+                        text = re.sub(r'\[.*?\]', '', text)  # Remove text inside []
+                        production_companies.append(text)
+                else:
+                    links = td.find_all("a")
+                    if links:
+                        for a in links:
+                            text = a.text.strip()
+                            text = re.sub(r'\[.*?\]', '', text)  # Remove text inside []
+                            production_companies.append(text)
+                    else:
+                        text = td.text.strip()
+                        text = re.sub(r'\[.*?\]', '', text)  # Remove text inside []
+                        production_companies = [text]
+                if production_companies:
+                    log.debug("Formatted Production Companies: %s", production_companies)
+
+            # --- Release Dates ---
+            if "release dates" in header_text:
+                td_element = td  # The <td> that contains the release dates
+                release_dates = []  # Reset for each movie
+                if td_element:
+                    ul_element = td_element.find("ul")
+                    if ul_element:
+                        dates_list = [li.text.strip() for li in ul_element.find_all("li")]
+                    else:
+                        dates_text = td_element.text.strip()
+                        dates_list = re.split(r'\n+', dates_text)
+                    for date in dates_list:
+                        date = date.strip()
+                        if date:
+                            try:
+                                formatted_date = normalized("release_date", date)
+                                release_dates.append(formatted_date)
+                            except Exception as e:
+                                log.warning("Error formatting date '%s': %s", date, e)
+                    for release in release_dates:
+                        log.debug("Release Date: %s", release)
+
+            # --- Running Time ---
+            if "running time" in header_text:
+                running_time = normalized("running_time", td.text)
+                log.debug("Running Time: %s", running_time)
+            
+            # --- Languages ---
+            if "language" in header_text or "languages" in header_text:
+                in_language = normalized("languages", td.text)
+                log.debug("Language: %s", in_language)
+            
+            # --- Countries ---
+            if "country" in header_text or "countries" in header_text:
+                if td.find("ul"):
+                    country = [clean_text(li.get_text(strip=True)) for li in td.find_all("li") if li.get_text(strip=True)]
+                else:
+                    country = normalized("countries", td.text)
+                log.debug("Country: %s", country)
+
+    return FilmInfo(movie_name, infobox_person_links(movie_infobox), credits, positions, production_companies,
+                    release_dates, in_language, running_time, country)
+
+
+# function to scrape and insert everyone credited on a film, returning the movie_person rows
+def credit_people(movie_name, movie_page, credits):
+    # people credited in several rows (director-writers, producer-stars) are one person:
+    # the same article, or the same name when a row does not link it
+    linked = {person.parts: person.link for _, _, people in credits for person in people if person.link}
+
+    def key(person):
+        return person.link or linked.get(person.parts) or person.parts
+
+    unique = {}
+    for _, entity_type, people in credits:
+        for person in people:
+            if person.parts:
+                unique.setdefault(key(person), (person, entity_type))
+    # the whole cast and crew go out as one batch, so their pages are fetched in parallel
+    details = dict(zip(unique, scrape_people(list(unique.values()))))
+    insert_people([(person, details[k]) for k, (person, _) in unique.items()])
+
+    connections = []
+    for position, _, people in credits:
+        for person in people:
+            if not person.parts:
+                continue
+            # split the way insert_person stores the name: a single word is a first name only
+            first_name = person.parts[0]
+            last_name = person.parts[-1] if len(person.parts) > 1 else ""
+            k = key(person)
+            connections.append((movie_name, first_name, last_name, details[k][0], position, movie_page, unique[k][0].link))
+    return connections
+
+
+# function to tell categories listing "person – film" apart from "film – people" ones
+def is_person_category(cat):
+    return "actor" in cat.lower() or "actress" in cat.lower() or "directing" in cat.lower()
+
+
+# function to work out which film a nomination refers to and the link to scrape it from
+def nomination_film(cat, nomination, link_by):
+    if is_person_category(cat):
+        if not nomination[1]:
+            return None, None
+        movie_name = normalize_movie_name(nomination[1])
+        return movie_name, link_by.get(re.sub(r'\s*\(.*?\)', '', movie_name))
+
+    movie_name = nomination[0]
+    link = link_by.get(movie_name)
+    if link is None:
+        movie_name = normalize_movie_name(movie_name)
+        link = link_by.get(re.sub(r'\s*\(.*?\)', '', movie_name))
+        if link is None:
+            # try finding a link from the person list if movie link is missing.
+            for person in nomination[1]:
+                log.debug("No movie link for %s, trying the link of %s.", movie_name, person)
+                link = link_by.get(person)
+                if link:
+                    break
+    return movie_name, link
+
+
+# function to look up a movie right after scraping it, falling back to the title in its link
+def find_scraped_movie(movie_name, movie_link):
+    movie_id_row = movie_exists(movie_name, movie_link)
+    if not movie_id_row and movie_link:
+        movie_name_redefined = unquote(movie_link.replace("/wiki/", "").replace("_", " "))
+        movie_id_row = movie_exists(movie_name_redefined)
+    return movie_id_row
+
+
+def insert_nominations(award_no, nominations_by_category, link_by):
+    # This list collects persons that need scraping.
+    persons_to_scrape = []
+
+    award_id_row = award_edition_exists(award_no)
+    if not award_id_row:
+        log.warning("No award edition found for award number %s", award_no)
+        return
+    award_id = award_id_row[0]
+
+    log.debug("nominations_by_category: %s", nominations_by_category)
+    
+    for cat, nominations in nominations_by_category.items():
+        log.debug("Category: %s", cat)
+        # Insert category and retrieve category_id.
+        category_id = insert_category(cat)
+        
+        # For categories with a different nomination structure.
+        if is_person_category(cat):
+            for i, nomination in enumerate(nominations):
+                won_flag = 1 if i == 0 else 0  # First nominee wins, others don't
+                if len(nomination) == 4:
+                    person_name, movie_name, status, _ = nomination  # discard provided link
+                elif len(nomination) == 3:
+                    person_name, movie_name, _ = nomination
+                    status = None  # default value
+                else:
+                    log.warning("Unexpected format in nomination: %s", nomination)
+                    continue
+
+                # Check if movie details already exist before scraping.
+                movie_id_row = movie_exists(movie_name, nomination_film(cat, nomination, link_by)[1])
+                if not movie_id_row:
+                    movie_name, movie_link = nomination_film(cat, nomination, link_by)
+                    log.debug("Movie name: %s", movie_name)
+                    log.debug("Movie link: %s", movie_link)
+                    scrape_movie_details(movie_title=movie_name, movie_link=movie_link)
+                    movie_id_row = find_scraped_movie(movie_name, movie_link)
+                    if not movie_id_row:
+                        log.warning("Failed to get movie id for '%s'. Skipping nomination.", movie_name)
+                        continue
+                else:
+                    log.debug("Movie '%s' already exists, skipping scrape.", movie_name)
+
+                # Extract movie_id from the row.
+                movie_id = movie_id_row[0]
+
+                log.debug("Status: %s", status)
+
+                # Insert the nomination record using the correct won_flag.
+                nomination_id = insert_nomination_one(award_id, movie_id, category_id, won_flag, None)
+                log.debug("Inserted nomination record (ID: %s) for movie '%s' in category '%s'.", nomination_id, movie_name, cat)
+
+                # Always add the person for scraping.
+                persons_to_scrape.append(PersonRef.from_text(person_name, link_by.get(person_name)))
+                log.debug("Nomination: %s", nomination)
+
+                # If we have accumulated persons to scrape, process them.
+                if persons_to_scrape:
+                    # Scrape and obtain details (including birth_date).
+                    person_details = scrape_person_list([p.parts for p in persons_to_scrape], "director")
+                    for person_ref, (birth_date, birth_country, death_date) in zip(persons_to_scrape, person_details):
+                        # Ensure that birth_date is a scalar value.
+                        bd = birth_date[0] if isinstance(birth_date, (tuple, list)) else birth_date
+                        log.debug("Scraped birth date: %s", bd)
+
+                        # Now check if this person already exists using the scraped birth_date.
+                        person_id = person_exists(person_ref, bd)
+                        if person_id:
+                            log.debug("Person '%s' (born %s) already exists, skipping insertion.", person_ref.full_name, bd)
+                        else:
+                            # Insert the new person record if desired.
+                            # For example: insert_person(fname, lname, bd, birth_country, death_date)
+                            log.debug("Inserting person '%s' with birth date %s", person_ref.full_name, bd)
+                        # If person exists, link them with the nomination.
+                        if person_id:
+                            insert_nomination_person(nomination_id, person_id)
+                            log.debug("Linked person (ID: %s) with nomination (ID: %s).", person_id, nomination_id)
+                    persons_to_scrape.clear()
+
+        else:
+            # For categories where nominations come with a list of persons.
+            for i, nomination in enumerate(nominations):
+                won_flag = 1 if i == 0 else 0  # First nominee wins, others don't
+                if len(nomination) == 4:
+                    movie_name, person_list, status, _ = nomination  # discard provided link
+                elif len(nomination) == 3:
+                    movie_name, person_list, _ = nomination
+                    status = None  # default value
+                else:
+                    log.warning("Unexpected format in nomination: %s", nomination)
+                    continue
+
+                # Check if movie exists before scraping.
+                movie_id_row = movie_exists(movie_name, nomination_film(cat, nomination, link_by)[1])
+                if not movie_id_row:
+                    movie_name, link = nomination_film(cat, nomination, link_by)
+                    log.debug("Link used: %s", link)
+                    scrape_movie_details(movie_title=movie_name, movie_link=link)
+                    movie_id_row = find_scraped_movie(movie_name, link)
+                    if not movie_id_row:
+                        log.warning("Failed to get movie id for '%s'. Skipping nomination.", movie_name)
+                        continue
+                else:
+                    log.debug("Movie '%s' already exists, skipping scrape.", movie_name)
+
+                movie_id = movie_id_row[0]
+                nomination_id = insert_nomination_one(award_id, movie_id, category_id, won_flag, None)
+                log.debug("Inserted nomination record (ID: %s) for movie '%s' in category '%s'.", nomination_id, movie_name, cat)
+
+                # Process each person in the list.
+                for person in person_list:
+                    persons_to_scrape.append(PersonRef.from_text(person, link_by.get(person)))
+
+                if persons_to_scrape:
+                    person_details = scrape_person_list([p.parts for p in persons_to_scrape], "director")
+                    for person_ref, (birth_date, birth_country, death_date) in zip(persons_to_scrape, person_details):
+                        bd = birth_date[0] if isinstance(birth_date, (tuple, list)) else birth_date
+                        person_id = person_exists(person_ref, bd)
+                        if person_id:
+                            log.debug("Person '%s' (born %s) already exists, skipping insertion.", person_ref.full_name, bd)
+                        else:
+                            log.debug("Inserting person '%s' with birth date %s", person_ref.full_name, bd)
+                        if person_id:
+                            insert_nomination_person(nomination_id, person_id)
+                            log.debug("Linked person (ID: %s) with nomination (ID: %s).", person_id, nomination_id)
+                    persons_to_scrape.clear()
+                log.debug("Nomination: %s", nomination)
+
+
+def scrape_awards(n):
+    url = current_source().ceremony_url(n)
+    content = fetch(url, "ceremony").content
+    found = extracted("nominations", content, lambda: extract_nominations(parse_page(content, "ceremony")))
+    if found is None:
+        return {}
+    nominations_by_category, link_by_person = found
+
+    for cat, nominations in nominations_by_category.items():
+        log.debug("Category: %s", cat)
+        for nomination in nominations:
+            log.debug("Nomination: %s", nomination)
+    
+    for person, link in link_by_person.items():
+        log.debug("Person: %s, Link: %s", person, link)
+    # every nominee film and person page starts downloading now, before the per-film work
+    prefetch(link_by_person.values(), "film")
+    scrape_nominated_films(nominations_by_category, link_by_person)
+    insert_nominations(n, nominations_by_category, link_by_person)
+    return nominations_by_category
+
+
+# function to read the nominees of a ceremony page: (nominations by category, link by
+# linked name), or None when the page has no awards table.
+# in low-memory mode only the infobox and wikitables survive, so the last-resort
+# "whole page" search below only sees those
+def extract_nominations(soup):
+    all_tables = soup.find_all("table")
+    awards_tables = [
+        table for table in all_tables 
+        if table.get("class") is not None and set(table.get("class")) == {"wikitable"}
+    ]
+    
+    if len(awards_tables) >= 2:
+        awards_table = awards_tables[1]
+    elif awards_tables:
+        awards_table = awards_tables[0]
+    else:
+        log.debug("No strictly 'wikitable' found on the page.")
+        return None
+
+    awards_details = awards_table.find_all("tr")
+    nominations_by_category = {}
+    link_by_person = {}
+
+    for row in awards_details:
+        tds = row.find_all("td")
+        for td in tds:
+            div = td.find("div")
+            if div and div.find("b"):
+                category = intern_text(clean_category(div.text.strip()))
+                if category not in nominations_by_category:
+                    nominations_by_category[category] = []
+                
+                ul = td.find("ul")
+                if ul:
+                    nominees = ul.find_all("li")
+                    for nominee in nominees:
+                        a_tags = nominee.find_all("a")
+                        for a_tag in a_tags:
+                            link = a_tag["href"] if a_tag.has_attr("href") else None
+                            person_name = a_tag.text.strip()
+                            link_by_person[person_name] = link
+                        
+                        won_tag = nominee.find("b") or nominee.find("i")
+                        producer_list = []
+                        movie_title = ""
+                        if won_tag:
+                            movie_i = won_tag.find("i")
+                            if movie_i:
+                                # extract movie title only from the first <a> before normal text
+                                movie_links = movie_i.find_all("a")
+                                if movie_links:
+                                    movie_title = movie_links[0].get_text(strip=True)  # take the first hyperlinked text
+                                else:
+                                    movie_title = movie_i.get_text(strip=True)  # fallback to the full text if no hyperlink
+                            full_text = won_tag.get_text(" ", strip=True)
+                            full_text = re.sub(r'[–‡]', '', full_text).strip()
+                            if movie_title:
+                                producer_text = full_text.replace(movie_title, "").strip()
+                                producer_list = clean_producers(producer_text, movie_title)
+                            else:
+                                movie_title = full_text
+                        
+                        # extract producers from sibling <a> tags if necessary
+                        if not producer_list:
+                            sibling_producers = []
+                            for sibling in nominee.find_all_next():
+                                if sibling.name == 'a':
+                                    sibling_producers.append(sibling.text.strip())
+                                elif sibling.name == 'li':
+                                    break  # Stop when reaching a new nominee
+                            if sibling_producers:
+                                producer_list = clean_producers(", ".join(sibling_producers), movie_title)
+
+                        if movie_title:
+                            nominations_by_category[category].append(Nomination.build(movie_title, producer_list, link))
+    if not nominations_by_category:
+        log.debug("Switching Method.")
+        
+        divs = awards_table.find_all("div")
+        if not divs:
+            log.debug("No <div> elements found in the awards table; searching entire page.")
+            divs = soup.find_all("div")
+
+        for div in divs:
+            b_tag = div.find("b")
+            ul = div.find_next_sibling("ul")
+
+            if b_tag and b_tag.text.strip() and ul:
+                header_text = b_tag.text.strip()
+                log.debug("Found header div with text: %s", header_text)
+                category = intern_text(clean_category(header_text))
+
+                if category not in nominations_by_category:
+                    nominations_by_category[category] = []
+                
+                nominees = ul.find_all("li")
+                for nominee in nominees:
+                    a_tags = nominee.find_all("a")
+                    for a_tag in a_tags:
+                        link = a_tag.get("href")
+                        person_name = a_tag.text.strip()
+                        link_by_person[person_name] = link
+                    
+                    won_tag = nominee.find("b") or nominee.find("i")
+                    if won_tag:
+                        movie_title = won_tag.text.strip()
+
+                        if "–" in movie_title and ("‡" in movie_title or "*" in movie_title):
+                            parts = movie_title.split("–")
+                            if len(parts) > 1:  # Fix: Check if splitting was successful
+                                movie_title = parts[0].strip()
+                                producer_text = parts[1].strip() if len(parts) > 1 and parts[1] else ""
+                                producer_list = clean_producers(producer_text) if producer_text else []
+                            else:
+                                log.warning("Unexpected format for movie title: %s", movie_title)
+                                producer_list = []
+
+                    normal_tag = nominee.find("ul")
+                    if normal_tag:
+                        details = normal_tag.text.strip()
+                        lines = details.splitlines()
+                        for line in lines:
+                            parts = re.split(r'\s*–\s*', line, maxsplit=1)
+                            if len(parts) > 1:  # Fix: Ensure splitting is successful
+                                title = parts[0].strip()
+                                producer_text = parts[1].strip()
+                                producer_list = clean_producers(producer_text)
+                                nominations_by_category[category].append(Nomination.build(title, producer_list, link))
+                            else:
+                                log.warning("Skipping unexpected format for line: %s", line)
+
+    return nominations_by_category, link_by_person
+
+
+# function to scrape every nominated film that is not in the db yet, one task per film.
+# under the scheduler the films of a big ceremony spread over all idle workers instead of
+# being scraped one after another inside insert_nominations (which then finds them in the db)
+def scrape_nominated_films(nominations_by_category, link_by):
+    films = {}
+    for cat, nominations in nominations_by_category.items():
+        for nomination in nominations:
+            movie_name, movie_link = nomination_film(cat, nomination, link_by)
+            if movie_name and movie_name not in films:
+                films[movie_name] = movie_link
+    # films scraped in an earlier run need no db lookup either
+    missing = [
+        FilmRef(title, link) for title, link in films.items()
+        if not is_done(film_key(title, link)) and not movie_exists(title, link)
+    ]
+    keys = [film.link or film.title for film in missing]
+    if batch_normalizing() and len(missing) > 1:
+        # every film page of the edition is read first, so their dates, running times,
+        # languages and countries are cleaned as one batch before any film is stored
+        pages = normalize_records(run_tasks("film", _load_film_task, missing, keys=keys))
+        loaded = [(film, page) for film, page in zip(missing, pages) if page is not None]
+        run_tasks("film", _store_film_task, loaded, keys=[f"{film.link or film.title}:store" for film, _ in loaded])
+        return
+    run_tasks("film", _scrape_film_task, missing, keys=keys)
+
+
+def _load_film_task(film):
+    # a film that fails here is left to insert_nominations, which retries it
+    try:
+        with stage("film"), profiled():
+            return load_film_page(film.title, film.link)
+    except Exception as e:
+        log.warning("Failed to load film %s (%s): %s", film.title, film.link, e)
+        return None
+
+
+def _store_film_task(item):
+    film, page = item
+    try:
+        return scrape_movie_details(film.title, film.link, page)
+    except Exception as e:
+        log.warning("Failed to scrape film %s (%s): %s", film.title, film.link, e)
+        return None
+
+
+def _scrape_film_task(film):
+    # film arrives as a plain [title, link] list when it comes from the shared work queue
+    film = FilmRef(*film)
+    # a failed film must not take the whole edition down; insert_nominations retries it
+    try:
+        return scrape_movie_details(film.title, film.link)
+    except Exception as e:
+        log.warning("Failed to scrape film %s (%s): %s", film.title, film.link, e)
+        return None
+
+
+# infobox rows of a ceremony whose people are scraped, with the entity type their pages are looked up as
+CEREMONY_ROLES = {"Host": None, "Preshow Host": None, "Producer": None, "Director": "director"}
+
+
+# actual function to scrape award info data (mainly follows the infobox and gets more data whenever required)
+def scrape_award_info_data(n):
+    if award_edition_exists(n) is None:
+        url = current_source().ceremony_url(n)
+        content = fetch(url, "ceremony").content
+        info = extracted("ceremony_info", content, lambda: extract_ceremony_info(parse_page(content, "ceremony"), n))
+        info.edition = n
+        normalize_records(info)
+
+        venue_id = []
+        if info.venues:
+            insert_venue(info.venues)
+            for site in info.venues:
+                venue_id.append(get_venue_id(site[0]))
+
+        connections = []
+        for position, entity_type in CEREMONY_ROLES.items():
+            refs = [ref for role, ref in info.people if role == position]
+            if not refs:
+                continue
+            person_details = scrape_person_list(refs, entity_type)
+            for i, (birth_date, birth_country, death_date) in enumerate(person_details):
+                log.debug("(%s) Birth Date: %s", position, birth_date)
+                log.debug("(%s) Birth Country: %s", position, birth_country)
+                log.debug("(%s) Death Date: %s", position, death_date)
+                if i < len(refs):
+                    insert_person([refs[i]], [birth_date, birth_country, death_date])
+                    connections.append((n, refs[i][0][0], refs[i][0][-1], birth_date, position, refs[i].link))
+
+        insert_position(info.positions)
+        insert_award(n, info.date, venue_id, info.duration, info.network or None)
+        insert_person_connection(connections)
+        return info
+    else:
+        log.info("Award edition iteration already completed (award infobox), %s", n)
+        return None
+
+
+# function to read date, venues, people, network and duration from a ceremony infobox
+def extract_ceremony_info(soup, n):
+    award_infobox = soup.find("table", {'class': 'infobox vevent'})
+    award_details = award_infobox.find_all("tr")
+
+    event_date = None
+    event_site = None
+    event_host = None
+    event_preshowhost = None
+    event_producer = None
+    event_director = None
+    event_network = None
+    event_duration = None
+
+    positions = []
+
+    # dynamically find the indices for date, site, and host
+    for row in award_details:
+        header = row.find("th")
+        if header:
+            header_text = header.text.strip()
+            if "date" in header_text.lower():
+                event_date = row.find("td").text.strip()
+                log.debug("Date: %s", format_date(event_date))
+
+            if "site" in header_text.lower():
+                td = row.find("td")
+                # get the raw text while preserving newlines and remove bracketed content
+                raw_text = re.sub(r'\[.*?\]', '', td.get_text(separator="\n").strip()).strip()
+                #print("Raw Site (full text):", raw_text)
+                links = td.find_all("a")
+                # if there are exactly 2 links, assume one location
+                if links and len(links) == 2 | 3:
+                    #return a flat list
+                    event_site = normalized("site", raw_text)
+                #if there are more than 2 links, assume multiple locations
+                elif links and len(links) > 3:
+                    event_site = format_site_multi(raw_text)
+                else:
+                    event_site = normalized("site", raw_text)
+                log.debug("Formatted Site: %s", event_site)
+            
+            if "hosted by" in header_text.lower():
+                positions.append("Host")
+                td = row.find("td")
+                event_host = []
+                # First check for <li> tags
+                li_items = td.find_all("li")
+                if li_items:
+                    for li in li_items:
+                        host_text = li.get_text(strip=True)
+                        if 'emcee' in host_text.lower():
+                            continue
+                        event_host.append(PersonRef.from_text(host_text))
+                else:
+                    links = td.find_all("a")
+                    if links:
+                        for a in links:
+                            host_text = a.text.strip()
+                            if 'emcee' in host_text.lower():
+                                continue
+                            event_host.append(PersonRef.from_text(host_text))
+                    else:
+                        event_host = [PersonRef.from_text(td.text.strip())]
+                if event_host:
+                    log.debug("Formatted Host: %s", event_host)
+
+            if "preshow hosts" in header_text.lower():
+                positions.append("Preshow Host")
+                td = row.find("td")
+                # get raw text (stop at the first bracket)
+                raw_text = re.split(r'\[', td.get_text(separator="\n").strip(), 1)[0].strip()
+                event_preshowhost = []
+                li_items = td.find_all("li")
+                if li_items:
+                    for li in li_items:
+                        preshowhost_text = li.get_text(strip=True)
+                        if 'emcee' in preshowhost_text.lower():
+                            continue
+                        formatted_host = PersonRef.from_text(preshowhost_text)
+                        if formatted_host.parts:  # Ensure it's not empty
+                            event_preshowhost.append(formatted_host)
+                else:
+                    links = td.find_all("a")
+                    if links:
+                        for a in links:
+                            preshowhost_text = a.text.strip()
+                            if 'emcee' in preshowhost_text.lower():
+                                continue
+                            formatted_host = PersonRef.from_text(preshowhost_text)
+                            if formatted_host.parts:
+                                event_preshowhost.append(formatted_host)
+                    else:
+                        # Fallback: use the raw text.
+                        formatted_host = PersonRef.from_text(raw_text)
+                        if formatted_host.parts:
+                            event_preshowhost.append(formatted_host)
+                if event_preshowhost:
+                    log.debug("Formatted Preshow Host: %s", event_preshowhost)
+
+            if "produced by" in header_text.lower():
+                positions.append("Producer")
+                td = row.find("td")
+                event_producer = []
+                li_items = td.find_all("li")
+                if li_items:
+                    for li in li_items:
+                        prod_text = li.get_text(strip=True)
+                        if 'emcee' in prod_text.lower():
+                            continue
+                        event_producer.append(PersonRef.from_text(prod_text))
+                else:
+                    links = td.find_all("a")
+                    if links:
+                        for a in links:
+                            prod_text = a.text.strip()
+                            if 'emcee' in prod_text.lower():
+                                continue
+                            event_producer.append(PersonRef.from_text(prod_text))
+                    else:
+                        raw_text = td.text.strip()
+                        # separate lowercase from uppercase (e.g., KapoorKaty -> Kapoor\nKaty)
+                        separated_text = re.sub(r'(?<=[a-z])(?=[A-Z])', r'\n', raw_text)
+                        # split names by commas or newlines and format each name individually
+                        names = [name.strip() for name in re.split(r'[,\n]+', separated_text) if name.strip()]
+                        # build a PersonRef for each name individually
+                        event_producer = [PersonRef.from_text(name) for name in names]
+                if event_producer:
+                    log.debug("Formatted Producer: %s", event_producer)
+
+            if "directed by" in header_text.lower():
+                positions.append("Director")
+                td = row.find("td")
+                event_director = []
+                li_items = td.find_all("li")
+                if li_items:
+                    for li in li_items:
+                        prod_text = li.get_text(strip=True)
+                        if 'emcee' in prod_text.lower():
+                            continue
+                        event_director.append(PersonRef.from_text(prod_text))
+                else:
+                    links = td.find_all("a")
+                    if links:
+                        for a in links:
+                            prod_text = a.text.strip()
+                            if 'emcee' in prod_text.lower():
+                                continue
+                            event_director.append(PersonRef.from_text(prod_text))
+                    else:
+                        event_director = [PersonRef.from_text(td.text.strip())]
+                if event_director:
+                    log.debug("Formatted Director: %s", event_director)
+
+            if "network" in header_text.lower():
+                td = row.find("td")
+                # Extract all <a> tags for network names
+                links = td.find_all("a")
+                event_network = [link.text.strip() for link in links if link.text.strip()]
+                log.debug("Network Names: %s", event_network)
+
+            if "duration" in header_text.lower():
+                td = row.find("td")
+                raw_duration = td.text.strip()
+                event_duration = normalized("duration", raw_duration)
+                log.debug("Duration: %s minutes", event_duration) 
+
+            #best picture to be dealt with in scrape_award(n)
+            '''if "best picture" in header_text.lower():
+                td = row.find("td")
+                raw_best_picture = td.text.strip()
+                scrape_movie_details(raw_best_picture)'''
+
+    people = []
+    for position, refs in (("Host", event_host), ("Preshow Host", event_preshowhost),
+                           ("Producer", event_producer), ("Director", event_director)):
+        people.extend((position, ref) for ref in refs or [])
+    return EditionInfo(n, event_date, event_site or [], event_duration, event_network or [], people, positions)
+
+
+# function to scrape more detailed data, such as movie infos and nominations
+def scrape_detailed_data(n):
+    url = current_source().ceremony_url(n)
+    soup = load_page(url)
+
+
+def scrape_data(n, stages=STAGES, source=ACADEMY_AWARDS):
+    # every record logged while scraping this edition carries edition=n (or e.g. <key>:82
+    # for another award body), and with write-behind on its rows are written together once
+    # the edition is complete
+    key = source.edition_key(n)
+    with edition_context(key), source_context(source):
+        done = [name for name in stages if is_done(f"edition:{key}:{name}")]
+        if done:
+            log.info("Skipping %s, finished in an earlier run", ", ".join(done))
+        with profiled(), edition_session(f"Edition {key}"):
+            if "info" in stages and "info" not in done:
+                with stage("info"):
+                    source.scrape_info(n)
+                mark_done(f"edition:{key}:info")
+            if "awards" in stages and "awards" not in done:
+                with stage("awards"):
+                    source.scrape_awards(n)
+                mark_done(f"edition:{key}:awards")
+
+
+def _scrape_edition_task(item):
+    # [n, stages] for the Academy Awards, [n, stages, award body key] for the others
+    n, stages, *source = item
+    return scrape_data(n, tuple(stages), get_source(source[0]) if source else ACADEMY_AWARDS)
+
+
+# handlers for the work items of a shared queue (see workqueue.QueueWorker)
+TASK_HANDLERS = {
+    "edition": _scrape_edition_task,
+    "film": _scrape_film_task,
+    "person": _scrape_person_task,
+}
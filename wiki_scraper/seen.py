@@ -0,0 +1,200 @@
+import os
+import math
+import mmap
+import array
+import bisect
+import struct
+import hashlib
+import threading
+
+from .logs import get_logger
+from .session import current_session
+
+log = get_logger("seen")
+
+# header of the filter file: magic, bit count, hash count; the bits follow
+_MAGIC = b"WSSEEN01"
+_HEADER = struct.Struct("<8sQI")
+_MASK = 2**64 - 1
+
+# false positive rate the filter is sized for, and keys it has room for at least
+ERROR_RATE = 0.01
+MIN_CAPACITY = 100_000
+
+
+def _hash(key):
+    h = int.from_bytes(hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest(), "little")
+    return h or 1
+
+
+def _positions(h, bits, hashes):
+    # double hashing; the second hash is derived from the first, so the filter can be
+    # rebuilt from the exact set's hashes alone
+    step = (((h >> 29) | (h << 35)) & _MASK) | 1
+    return [(h + i * step) % bits for i in range(hashes)]
+
+
+class SeenFilter:
+    """
+    Work finished in earlier runs (editions' stages, films), as strings like "film:/wiki/Up".
+    A Bloom filter in a memory-mapped file answers "certainly not done" from a handful of
+    bits; a possible hit is confirmed against the exact set, a sorted array of the keys'
+    64-bit hashes in <path>.keys that is binary-searched in place, plus the keys added this
+    run. save() merges those into the array (and regrows the filter when it fills up).
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._added = set()
+        self._keys = ()
+        self._keys_map = None
+        self._map = None
+        self._open()
+
+    def _open(self):
+        keys_path = f"{self.path}.keys"
+        if os.path.exists(keys_path) and os.path.getsize(keys_path):
+            with open(keys_path, "rb") as f:
+                self._keys_map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            self._keys = memoryview(self._keys_map).cast("Q")
+        if not os.path.exists(self.path):
+            self._create(MIN_CAPACITY)
+        with open(self.path, "r+b") as f:
+            self._map = mmap.mmap(f.fileno(), 0)
+        magic, self._bits, self._hashes = _HEADER.unpack_from(self._map)
+        if magic != _MAGIC:
+            raise ValueError(f"{self.path} is not a seen filter")
+
+    def _create(self, capacity):
+        bits = max(8, math.ceil(-capacity * math.log(ERROR_RATE) / math.log(2) ** 2))
+        bits = (bits + 7) // 8 * 8
+        hashes = max(1, round(bits / capacity * math.log(2)))
+        bitmap = bytearray(bits // 8)
+        for h in self._keys:
+            for p in _positions(h, bits, hashes):
+                bitmap[p >> 3] |= 1 << (p & 7)
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(_HEADER.pack(_MAGIC, bits, hashes))
+            f.write(bitmap)
+        os.replace(tmp, self.path)
+
+    def _close_maps(self):
+        if isinstance(self._keys, memoryview):
+            self._keys.release()
+        self._keys = ()
+        if self._keys_map is not None:
+            self._keys_map.close()
+            self._keys_map = None
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+
+    def __len__(self):
+        return len(self._keys) + len(self._added)
+
+    def maybe(self, h):
+        """False if the hash was certainly never added (the filter alone)."""
+        data, start = self._map, _HEADER.size
+        for p in _positions(h, self._bits, self._hashes):
+            if not data[start + (p >> 3)] & (1 << (p & 7)):
+                return False
+        return True
+
+    def __contains__(self, key):
+        h = _hash(key)
+        if not self.maybe(h):
+            return False
+        if h in self._added:
+            return True
+        i = bisect.bisect_left(self._keys, h)
+        return i < len(self._keys) and self._keys[i] == h
+
+    def add(self, key):
+        h = _hash(key)
+        with self._lock:
+            if h in self._added:
+                return
+            self._added.add(h)
+            start = _HEADER.size
+            for p in _positions(h, self._bits, self._hashes):
+                self._map[start + (p >> 3)] |= 1 << (p & 7)
+
+    def save(self):
+        """Merge this run's keys into the exact set, regrowing the filter if it is over capacity."""
+        with self._lock:
+            if not self._added:
+                self._map.flush()
+                return
+            keys = array.array("Q", sorted(set(self._keys).union(self._added)))
+            self._close_maps()
+            tmp = f"{self.path}.keys.tmp"
+            with open(tmp, "wb") as f:
+                keys.tofile(f)
+            os.replace(tmp, f"{self.path}.keys")
+            self._added = set()
+            self._keys = keys
+            capacity = self._capacity()
+            if len(keys) > capacity:
+                self._create(max(MIN_CAPACITY, 2 * len(keys)))
+                log.info("Grew %s to %s keys", self.path, 2 * len(keys))
+            self._open()
+        log.debug("Saved %s keys to %s", len(self), self.path)
+
+    def _capacity(self):
+        with open(self.path, "rb") as f:
+            _, bits, _ = _HEADER.unpack(f.read(_HEADER.size))
+        return int(-bits * math.log(2) ** 2 / math.log(ERROR_RATE))
+
+    def close(self):
+        with self._lock:
+            self._close_maps()
+
+
+_filter = None
+
+
+def configure_seen(path=None):
+    """Open the filter of finished work (default: SCRAPER_SEEN; off when neither is set)."""
+    global _filter
+    close_seen(save=False)
+    path = path or os.getenv("SCRAPER_SEEN")
+    if path:
+        _filter = SeenFilter(path)
+        log.info("Skipping work recorded in %s (%s keys)", path, len(_filter))
+
+
+def close_seen(save=True):
+    global _filter
+    seen, _filter = _filter, None
+    if seen is None:
+        return
+    if save:
+        seen.save()
+    seen.close()
+
+
+# function to tell whether work was finished in this or an earlier run (False when the filter is off)
+def is_done(key):
+    seen = _filter
+    return seen is not None and key in seen
+
+
+# function to record finished work; inside a write-behind session only once its rows are committed
+def mark_done(key):
+    if _filter is None:
+        return
+    session = current_session()
+    if session is not None:
+        session.after_flush(record_done, [key])
+        return
+    record_done([key])
+
+
+def record_done(keys):
+    seen = _filter
+    if seen is None:
+        return
+    for key in keys:
+        seen.add(key)
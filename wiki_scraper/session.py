@@ -0,0 +1,441 @@
+import os
+import re
+import threading
+import contextvars
+from contextlib import contextmanager
+
+from .logs import get_logger
+from .people import PersonIndex, person_index
+from .pages import PAGE_TABLES, page_index
+
+log = get_logger("session")
+
+_enabled = os.getenv("SCRAPER_WRITE_BEHIND", "").lower() in ("1", "true", "yes")
+_shared = None
+_current = contextvars.ContextVar("wiki_scraper_session", default=None)
+# flushes of different editions run one at a time, so two editions that both found the
+# same new film or person cannot insert it twice
+_flush_lock = threading.Lock()
+
+# rows per IN (...) list / executemany batch
+CHUNK = int(os.getenv("SCRAPER_BATCH_SIZE", "500"))
+
+# relationship tables: columns, and the column whose values the existence check selects on
+LINK_TABLES = {
+    "award_edition_person": (("award_id", "person_id", "position_id"), "award_id"),
+    "movie_crew": (("movie_id", "person_id", "position_id"), "movie_id"),
+    "movie_release_date": (("movie_id", "release_date"), "movie_id"),
+    "movie_language": (("movie_id", "in_language"), "movie_id"),
+    "movie_country": (("movie_id", "country"), "movie_id"),
+    "movie_produced_by": (("movie_id", "pd_id"), "movie_id"),
+    "nomination_person": (("nomination_id", "person_id"), "nomination_id"),
+}
+
+# single-name entity tables: id column, name column, further columns
+NAMED_TABLES = {
+    "positions": ("position_id", "title", ()),
+    "category": ("category_id", "category_name", ()),
+    "production_company": ("pd_id", "company_name", ()),
+    "movie": ("movie_id", "movie_name", ("run_time",)),
+}
+
+
+class Ref:
+    """
+    Id of a row the session has not written yet. The db helpers hand it out where they used
+    to return a fresh id, and it is filled in (ref.id) when the session flushes.
+    """
+
+    __slots__ = ("table", "row", "id")
+
+    def __init__(self, table, row, id=None):
+        self.table = table
+        self.row = row
+        self.id = id
+
+    def __repr__(self):
+        return f"<{self.table} {self.id if self.id is not None else 'new'}>"
+
+
+def resolve(value):
+    return value.id if isinstance(value, Ref) else value
+
+
+def _key(value):
+    # dates come back from MySQL as date objects, the scraper has them as YYYY-MM-DD strings
+    return None if value is None else str(value)
+
+
+def _norm_venue(name):
+    return re.sub(r'^the\s+', '', name, flags=re.IGNORECASE).lower()
+
+
+def _chunks(values):
+    values = list(values)
+    for i in range(0, len(values), CHUNK):
+        yield values[i:i + CHUNK]
+
+
+class _SessionConnection:
+    """A thread's read connection for the session's lifetime (close() keeps it open)."""
+
+    def __init__(self, conn):
+        self._conn = conn
+
+    def cursor(self):
+        return self._conn.cursor()
+
+    def commit(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class EditionSession:
+    """
+    Unit of work for one edition: the db helpers record new rows and relationships here
+    instead of writing them, foreign keys between new rows are Refs, and flush() writes
+    everything in dependency order in one transaction (entities in bulk, then relationships).
+    Lookups (movie_exists, person_exists, ...) see the session's pending rows first and the
+    database otherwise. Scheduler tasks inherit the session with the edition's context, so
+    the edition's films and people run on several threads: every method takes the lock.
+    """
+
+    def __init__(self, label):
+        self.label = label
+        self.statements = 0
+        self._lock = threading.RLock()
+        self._local = threading.local()
+        self._connections = []
+        self.venues = {}
+        self.persons = {}
+        self.people = PersonIndex()
+        self.named = {table: {} for table in NAMED_TABLES}
+        self.editions = {}
+        self.nominations = []
+        self.links = {table: {} for table in LINK_TABLES}
+        # (table, article title) -> row id or Ref, and back
+        self.pages = {}
+        self.page_titles = {}
+        self._after_flush = []
+
+    def after_flush(self, fn, *args):
+        """Call fn(*args) once the session's rows are committed (never if the edition fails)."""
+        with self._lock:
+            self._after_flush.append((fn, args))
+
+    def _flushed(self):
+        for fn, args in self._after_flush:
+            fn(*args)
+        self._after_flush.clear()
+
+    # --- reads -----------------------------------------------------------------------------
+
+    def connection(self):
+        """Read connection of the calling thread (autocommit, so it sees other editions' flushes)."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            from .db import connect_db
+            raw = connect_db()
+            raw.autocommit(True)
+            with self._lock:
+                self._connections.append(raw)
+            conn = self._local.conn = _SessionConnection(raw)
+        return conn
+
+    def named_ref(self, table, name):
+        with self._lock:
+            return self.named[table].get(name)
+
+    def venue(self, venue_name):
+        with self._lock:
+            return self.venues.get(_norm_venue(venue_name))
+
+    def page(self, table, title):
+        with self._lock:
+            return self.pages.get((table, title))
+
+    def edition(self, n, body):
+        with self._lock:
+            return next((ref for (b, edition, _, _), ref in self.editions.items() if (b, edition) == (body, n)), None)
+
+    def find_person(self, first, middle, last, birth_date, any_birth_date=False):
+        """Pending person by the rules person_exists / the connection helpers use."""
+        return self.people.find(first, middle, last, birth_date, any_birth_date)
+
+    # --- writes ----------------------------------------------------------------------------
+
+    def _new(self, table, row):
+        return Ref(table, row)
+
+    def add_venue(self, venue_name, neighborhood, city, state, country):
+        with self._lock:
+            key = _norm_venue(venue_name)
+            if key not in self.venues:
+                self.venues[key] = self._new("venue", (venue_name, neighborhood, city, state, country))
+
+    def add_person(self, first, middle, last, birth_date, country, death_date):
+        with self._lock:
+            # same rule as insert_person: without a birth date any namesake counts as existing
+            found = self.find_person(first, middle, last, birth_date, any_birth_date=not birth_date)
+            if found is not None:
+                return found
+            ref = self._new("person", (first, middle, last, birth_date, country, death_date))
+            self.persons[(first, last, birth_date)] = ref
+            self.people.add(ref, first, middle, last, birth_date)
+            return ref
+
+    def add_named(self, table, name, *extra):
+        with self._lock:
+            ref = self.named[table].get(name)
+            if ref is None:
+                ref = self.named[table][name] = self._new(table, (name, *extra))
+            return ref
+
+    def set_page(self, table, row_id, title):
+        """Store the article title with a row (new or existing) when the session flushes."""
+        if title and row_id is not None:
+            with self._lock:
+                self.pages.setdefault((table, title), row_id)
+                self.page_titles.setdefault((table, row_id), title)
+
+    def add_edition(self, n, year, date, venue_id, duration, network, body):
+        with self._lock:
+            key = (body, n, venue_id, network)
+            if key not in self.editions:
+                self.editions[key] = self._new("award_edition", (n, year, date, venue_id, duration, network, body))
+
+    def add_nomination(self, award_edition_id, movie_id, category_id, won, submitted_by):
+        with self._lock:
+            ref = self._new("nomination", (award_edition_id, movie_id, category_id, won, submitted_by))
+            self.nominations.append(ref)
+            return ref
+
+    def add_link(self, table, *values):
+        with self._lock:
+            self.links[table].setdefault(values, None)
+
+    # --- flush -----------------------------------------------------------------------------
+
+    def _execute(self, cursor, query, params=()):
+        self.statements += 1
+        cursor.execute(query, params)
+        return cursor.fetchall()
+
+    def _executemany(self, cursor, query, rows):
+        for chunk in _chunks(rows):
+            self.statements += 1
+            cursor.executemany(query, chunk)
+
+    def _select_in(self, cursor, query, values):
+        rows = []
+        for chunk in _chunks(values):
+            rows.extend(self._execute(cursor, query.format(", ".join(["%s"] * len(chunk))), chunk))
+        return rows
+
+    def flush(self):
+        with self._lock, _flush_lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections.clear()
+            from .db import connect_db
+            conn = connect_db()
+            cursor = conn.cursor()
+            try:
+                self._flush_venues(cursor)
+                self._flush_persons(cursor)
+                for table in NAMED_TABLES:
+                    self._flush_named(cursor, table)
+                self._flush_editions(cursor)
+                self._flush_nominations(cursor)
+                self._flush_titles(cursor)
+                rows = sum(len(links) for links in self.links.values())
+                for table in LINK_TABLES:
+                    self._flush_links(cursor, table)
+                conn.commit()
+                index = person_index()
+                if index is not None:
+                    for ref in self.persons.values():
+                        if ref.id is not None:
+                            index.add(ref.id, *ref.row[:4])
+                pages = page_index()
+                for (table, title), row_id in self.pages.items():
+                    pages.add(table, title, resolve(row_id))
+                self._flushed()
+            except BaseException:
+                conn.rollback()
+                raise
+            finally:
+                cursor.close()
+                conn.close()
+        log.info("%s: flushed %s rows and %s links in %s statements and 1 commit",
+                 self.label, self.pending_rows(), rows, self.statements)
+
+    def pending_rows(self):
+        refs = [*self.venues.values(), *self.persons.values(), *self.editions.values(), *self.nominations]
+        refs.extend(ref for table in self.named.values() for ref in table.values())
+        return len(refs)
+
+    def close(self):
+        with self._lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections.clear()
+
+    def _flush_venues(self, cursor):
+        pending = {key: ref for key, ref in self.venues.items() if ref.id is None}
+        if not pending:
+            return
+        query = "SELECT venue_id, venue_name FROM venue WHERE LOWER(venue_name) IN ({})"
+        variants = [v for key in pending for v in (key, "the " + key)]
+        found = {_norm_venue(name): id for id, name in self._select_in(cursor, query, variants)}
+        new = [ref.row for key, ref in pending.items() if key not in found]
+        self._executemany(cursor, "INSERT INTO venue (venue_name, neighborhood, city, state, country) "
+                                  "VALUES (%s, %s, %s, %s, %s)", new)
+        if new:
+            found.update({_norm_venue(name): id for id, name in self._select_in(cursor, query, variants)})
+        for key, ref in pending.items():
+            ref.id = found.get(key)
+
+    def _flush_persons(self, cursor):
+        pending = [ref for ref in self.persons.values() if ref.id is None]
+        if not pending:
+            return
+        query = "SELECT person_id, first_name, last_name, birthDate FROM person WHERE last_name IN ({})"
+        last_names = sorted({ref.row[2] for ref in pending})
+
+        def match(rows, ref, exact):
+            first, _, last, dob = ref.row[:4]
+            ids = [id for id, f, l, d in rows
+                   if f == first and l == last and (_key(d) == dob if exact or dob else True)]
+            return max(ids) if ids else None
+
+        rows = self._select_in(cursor, query, last_names)
+        new = []
+        for ref in pending:
+            ref.id = match(rows, ref, exact=False)
+            if ref.id is None:
+                new.append(ref)
+        self._executemany(cursor, "INSERT INTO person (first_name, middle_name, last_name, birthDate, country, deathDate) "
+                                  "VALUES (%s, %s, %s, %s, %s, %s)", [ref.row for ref in new])
+        if new:
+            rows = self._select_in(cursor, query, sorted({ref.row[2] for ref in new}))
+            for ref in new:
+                ref.id = match(rows, ref, exact=True)
+
+    def _flush_named(self, cursor, table):
+        id_col, name_col, extra = NAMED_TABLES[table]
+        pending = {name: ref for name, ref in self.named[table].items() if ref.id is None}
+        if not pending:
+            return
+        query = f"SELECT {id_col}, {name_col} FROM {table} WHERE {name_col} IN ({{}})"
+        found = dict((name, id) for id, name in self._select_in(cursor, query, list(pending)))
+        new = [ref.row for name, ref in pending.items() if name not in found]
+        columns = (name_col, *extra)
+        self._executemany(cursor, f"INSERT INTO {table} ({', '.join(columns)}) "
+                                  f"VALUES ({', '.join(['%s'] * len(columns))})", new)
+        if new:
+            found.update((name, id) for id, name in self._select_in(cursor, query, [row[0] for row in new]))
+        for name, ref in pending.items():
+            ref.id = found.get(name)
+
+    def _flush_editions(self, cursor):
+        pending = {key: ref for key, ref in self.editions.items() if ref.id is None}
+        for body, n in sorted({key[:2] for key in pending}):
+            query = "SELECT award_edition_id, venue_id, network FROM award_edition WHERE award_body = %s AND edition = %s"
+            found = {(venue, network): id for id, venue, network in self._execute(cursor, query, (body, n))}
+            new = []
+            for (b, edition, venue, network), ref in pending.items():
+                if (b, edition) == (body, n) and (resolve(venue), network) not in found:
+                    new.append(ref)
+            self._executemany(cursor, "INSERT INTO award_edition (edition, aYear, cDate, venue_id, duration, network, "
+                                      "award_body) VALUES (%s, %s, %s, %s, %s, %s, %s)",
+                              [(*ref.row[:3], resolve(ref.row[3]), *ref.row[4:]) for ref in new])
+            if new:
+                found = {(venue, network): id for id, venue, network in self._execute(cursor, query, (body, n))}
+            for (b, edition, venue, network), ref in pending.items():
+                if (b, edition) == (body, n):
+                    ref.id = found.get((resolve(venue), network))
+
+    def _flush_nominations(self, cursor):
+        # one by one: the ids of a multi-row insert are not guaranteed to be consecutive,
+        # and nomination_person needs each new nomination's id
+        for ref in self.nominations:
+            if ref.id is None:
+                self.statements += 1
+                cursor.execute(
+                    "INSERT INTO nomination (award_edition_id, movie_id, category_id, won, submitted_by) "
+                    "VALUES (%s, %s, %s, %s, %s)", tuple(resolve(v) for v in ref.row)
+                )
+                ref.id = cursor.lastrowid
+
+    def _flush_titles(self, cursor):
+        # one UPDATE per chunk; rows that already have a title keep it
+        for table, id_col in PAGE_TABLES.items():
+            rows = [(resolve(row_id), title) for (t, row_id), title in self.page_titles.items()
+                    if t == table and resolve(row_id) is not None]
+            for chunk in _chunks(rows):
+                cases = " ".join(["WHEN %s THEN %s"] * len(chunk))
+                ids = ", ".join(["%s"] * len(chunk))
+                self._execute(cursor, f"UPDATE {table} SET wiki_title = CASE {id_col} {cases} END "
+                                      f"WHERE {id_col} IN ({ids}) AND wiki_title IS NULL",
+                              [v for row in chunk for v in row] + [row[0] for row in chunk])
+
+    def _flush_links(self, cursor, table):
+        columns, key_col = LINK_TABLES[table]
+        rows = {tuple(resolve(v) for v in values) for values in self.links[table]}
+        rows = {row for row in rows if None not in row}
+        if not rows:
+            return
+        index = columns.index(key_col)
+        query = f"SELECT {', '.join(columns)} FROM {table} WHERE {key_col} IN ({{}})"
+        existing = {tuple(_key(v) for v in row) for row in self._select_in(cursor, query, sorted({r[index] for r in rows}))}
+        new = sorted((row for row in rows if tuple(_key(v) for v in row) not in existing), key=str)
+        self._executemany(cursor, f"INSERT INTO {table} ({', '.join(columns)}) "
+                                  f"VALUES ({', '.join(['%s'] * len(columns))})", new)
+
+
+def configure_write_behind(enabled=None, batch_size=None):
+    """Turn per-edition write-behind on or off; batch_size: rows per IN list / executemany (default: SCRAPER_BATCH_SIZE or 500)."""
+    global _enabled, CHUNK
+    if enabled is not None:
+        _enabled = enabled
+    if batch_size is not None:
+        CHUNK = max(1, batch_size)
+
+
+def share_session(session):
+    """Make every edition use `session` (e.g. one bulk load for the whole crawl), or stop with None."""
+    global _shared
+    _shared = session
+
+
+def current_session():
+    return _current.get()
+
+
+@contextmanager
+def edition_session(label):
+    """Collect the writes of the block in one EditionSession and flush them if it completes."""
+    if _shared is not None:
+        token = _current.set(_shared)
+        try:
+            yield _shared
+        finally:
+            _current.reset(token)
+        return
+    if not _enabled:
+        yield None
+        return
+    session = EditionSession(label)
+    token = _current.set(session)
+    try:
+        yield session
+    except BaseException:
+        session.close()
+        log.warning("%s failed, %s pending rows discarded", label, session.pending_rows())
+        raise
+    finally:
+        _current.reset(token)
+    session.flush()
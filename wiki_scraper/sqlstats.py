@@ -0,0 +1,173 @@
+import os
+import re
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+from functools import lru_cache
+
+from .logs import get_logger, current_edition
+
+log = get_logger("sqlstats")
+
+# a call site issuing one statement shape this many times within an edition is a loop
+# that should be batched (the "N+1" pattern)
+N_PLUS_ONE = 10
+# shapes and call sites listed in the report
+TOP = 20
+
+_PACKAGE = os.path.dirname(os.path.abspath(__file__))
+# frames of these files are the plumbing between a call site and the server
+_PLUMBING = (os.path.join(_PACKAGE, "sqlstats.py"), f"{os.sep}pymysql{os.sep}")
+# files whose functions only wrap statements for someone else: the call site is their caller
+_HELPERS = tuple(os.path.join(_PACKAGE, name) for name in ("db.py", "session.py", "bulkload.py", "pages.py"))
+
+_STRING = re.compile(r"'(?:[^'\\]|\\.|'')*'|\"(?:[^\"\\]|\\.|\"\")*\"")
+_NUMBER = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?(?:e[-+]?\d+)?\b", re.IGNORECASE)
+_NULL = re.compile(r"\bNULL\b", re.IGNORECASE)
+_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_ROWS = re.compile(r"(\(\?(?:, \.\.\.)?\))(?:\s*,\s*\1)+")
+_SPACE = re.compile(r"\s+")
+
+_stats = None
+
+
+# function to reduce a statement to its shape: literals become ?, lists and VALUES rows collapse
+def sql_shape(sql):
+    if isinstance(sql, bytes):
+        sql = sql.decode("utf-8", "replace")
+    shape = _STRING.sub("?", sql)
+    shape = _NUMBER.sub("?", shape)
+    shape = _NULL.sub("?", shape)
+    shape = _SPACE.sub(" ", shape).strip()
+    shape = _LIST.sub("(?, ...)", shape)
+    shape = _ROWS.sub(r"\1, ...", shape)
+    return shape
+
+
+def _site(frame):
+    """(helper, call site) of a statement: the function that ran it and the code that called that."""
+    while frame is not None and any(part in frame.f_code.co_filename for part in _PLUMBING):
+        frame = frame.f_back
+    if frame is None:
+        return "?", "?"
+    helper = frame
+    while frame is not None and frame.f_code.co_filename in _HELPERS:
+        frame = frame.f_back
+    return _label(helper), _label(frame if frame is not None else helper)
+
+
+def _label(frame):
+    return f"{frame.f_code.co_name} ({os.path.basename(frame.f_code.co_filename)}:{frame.f_lineno})"
+
+
+class SqlStats:
+    """
+    Every statement sent to the server, with its time, the helper that ran it, the code
+    that called the helper and the edition it ran for. Statements are grouped by shape,
+    so `SELECT ... WHERE movie_name = 'Up'` and `... = 'Jaws'` count as one. A call site
+    that repeats a shape N_PLUS_ONE times or more within one edition is reported as a loop
+    to batch, along with how many connections the helpers opened on the way.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.statements = 0
+        self.seconds = 0.0
+        self.connections = Counter()  # call site -> connections opened
+        self.shapes = defaultdict(lambda: [0, 0.0])  # shape -> [count, seconds]
+        self.sites = defaultdict(lambda: [0, 0.0, Counter()])  # (site, helper, shape) -> [count, seconds, per edition]
+
+    def record(self, sql, seconds):
+        helper, site = _site(sys._getframe(1))
+        shape = sql_shape(sql)
+        edition = current_edition()
+        with self._lock:
+            self.statements += 1
+            self.seconds += seconds
+            entry = self.shapes[shape]
+            entry[0] += 1
+            entry[1] += seconds
+            entry = self.sites[(site, helper, shape)]
+            entry[0] += 1
+            entry[1] += seconds
+            entry[2][edition] += 1
+
+    def connected(self):
+        site = _site(sys._getframe(1))[1]
+        with self._lock:
+            self.connections[site] += 1
+
+    def loops(self):
+        """(site, helper, shape, count, seconds, most in one edition) of every N+1 pattern, costliest first."""
+        found = []
+        with self._lock:
+            for (site, helper, shape), (count, seconds, editions) in self.sites.items():
+                most = max(editions.values())
+                if most >= N_PLUS_ONE:
+                    found.append((site, helper, shape, count, seconds, most))
+        return sorted(found, key=lambda loop: loop[4], reverse=True)
+
+    def report(self):
+        lines = [f"{self.statements} statements in {self.seconds:.2f} s, "
+                 f"{sum(self.connections.values())} connections opened"]
+        lines.append("by shape:")
+        ranked = sorted(self.shapes.items(), key=lambda item: item[1][1], reverse=True)
+        for shape, (count, seconds) in ranked[:TOP]:
+            lines.append(f"  {count:7d} x {seconds * 1000 / count:6.2f} ms = {seconds:7.2f} s  {shape[:160]}")
+        loops = self.loops()
+        if loops:
+            lines.append(f"call sites repeating a statement ({N_PLUS_ONE}+ times in one edition), batch these:")
+        for site, helper, shape, count, seconds, most in loops[:TOP]:
+            opened = f", {self.connections[site]} connections" if self.connections[site] else ""
+            called = site if site == helper else f"{site} -> {helper}"
+            lines.append(f"  {called}: {count} statements ({most} in one edition{opened}), "
+                         f"{seconds:.2f} s  {shape[:120]}")
+        return lines
+
+
+@lru_cache(maxsize=None)
+def cursor_class():
+    """pymysql cursor class that times every round trip into the running report."""
+    import pymysql.cursors
+
+    class TimedCursor(pymysql.cursors.Cursor):
+        # _query is the one place a cursor talks to the server: execute, executemany
+        # (one call for a multi-row INSERT) and callproc all end up here
+        def _query(self, q):
+            stats = _stats
+            if stats is None:
+                return super()._query(q)
+            start = time.perf_counter()
+            try:
+                return super()._query(q)
+            finally:
+                stats.record(q, time.perf_counter() - start)
+
+    return TimedCursor
+
+
+# function to get the running report (None unless SQL accounting is on)
+def sql_stats():
+    return _stats
+
+
+def start_report(enabled=None):
+    """Start counting statements (default: SCRAPER_SQL_REPORT); connections opened from now on are timed."""
+    global _stats
+    if enabled is None:
+        enabled = os.getenv("SCRAPER_SQL_REPORT", "").lower() in ("1", "true", "yes")
+    if enabled:
+        _stats = SqlStats()
+
+
+def finish_report():
+    """Stop counting and log the statements by shape and the call sites to batch."""
+    global _stats
+    stats, _stats = _stats, None
+    if stats is None:
+        return None
+    lines = stats.report()
+    for line in lines:
+        log.info("%s", line)
+    return lines
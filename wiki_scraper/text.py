@@ -0,0 +1,442 @@
+import re
+import unicodedata
+from datetime import datetime
+from functools import lru_cache
+from urllib.parse import unquote
+
+from .logs import get_logger
+
+log = get_logger("text")
+
+# upper bound on memoized results per helper; category names, recurring people and
+# dates repeat thousands of times per crawl, so this comfortably covers a full run
+CACHE_SIZE = 8192
+
+# patterns shared by the format_* / clean_* helpers, compiled once
+_LINK = re.compile(r'https?://\S+|^/wiki/|^/w/')
+_BRACKETS = re.compile(r'\[.*?\]')
+_BRACKETS_DOTALL = re.compile(r'\[.*?\]', re.DOTALL)
+_PARENS = re.compile(r'\(.*?\)')
+_PARENS_KEEP = re.compile(r'\((.*?)\)')
+_MOVIE_DATE_NOISE = re.compile(r'\[\d+\]|\(.*?\)')
+_YEAR = re.compile(r'\b\d{4}\b')
+_SPACED_IN = re.compile(r'\s+in\s+')
+_BRACKET_LINE = re.compile(r'\n\[\s*.*?\s*\]\n', re.DOTALL)
+_BLANK_LINE = re.compile(r'\n\s*\n')
+_COMMA_SPLIT = re.compile(r',\s*')
+_PAREN_CHARS = str.maketrans("", "", "()")
+_COMMA_OR_NEWLINE = re.compile(r'[,\n]+')
+_HOURS = re.compile(r'(\d+)\s*h')
+_MINUTES = re.compile(r'(\d+)\s*m')
+_MINUTE_WORD = re.compile(r'(\d+)\s*minute', re.IGNORECASE)
+_NOT_WORD = re.compile(r'[\W_]+')
+_RUNNING_TIME = re.compile(r'(\d+)\s*minutes?', re.IGNORECASE)
+_LANGUAGE_WORD = re.compile(r'[A-Z][a-z]*')
+_BRACKETS_OR_DIGITS = re.compile(r'[\[\]\d]')
+_DIGIT = re.compile(r'\d')
+_CITATION_NEEDED = re.compile(r'\bcitation needed\b', re.IGNORECASE)
+# letters NFKD does not decompose into a base letter and an accent
+_FOLD_LETTERS = str.maketrans({"ø": "o", "æ": "ae", "œ": "oe", "ł": "l", "đ": "d", "ð": "d", "þ": "th", "ı": "i"})
+_TRAILING_ROLE = re.compile(r'\s*(producers?|directors?)$', re.IGNORECASE)
+_PRODUCER_NOISE = re.compile(
+    r'music and lyrics by|production design:|directed by|screenplay by|story by|set decoration:'
+    r'|\[.*?\]|\(.*?\)',
+    re.IGNORECASE,
+)
+_PRODUCER_SYMBOLS = str.maketrans("", "", "–‡*")
+_CAPITALIZED_NAME = re.compile(r'([A-Z][a-zA-Z]*(?:\s+[A-Z][a-zA-Z]+)+)')
+_CAPITALIZED_WORD = re.compile(r'[A-Z][a-z]*(?=[A-Z]|$)')
+
+# fast-path date shapes; anything they do not match falls back to strptime probing
+_MONTHS = {
+    name: i for i, name in enumerate(
+        ("january", "february", "march", "april", "may", "june", "july",
+         "august", "september", "october", "november", "december"), 1)
+}
+_MONTH_NAME = r'(?P<month>' + "|".join(_MONTHS) + r')'
+_DAY_MONTH_YEAR = re.compile(r'(?P<day>\d{1,2})\s+' + _MONTH_NAME + r'\s+(?P<year>\d{4})', re.IGNORECASE)
+_MONTH_DAY_YEAR = re.compile(_MONTH_NAME + r'\s+(?P<day>\d{1,2}),\s+(?P<year>\d{4})', re.IGNORECASE)
+_MONTH_DAY_YEAR_NO_COMMA = re.compile(_MONTH_NAME + r'\s+(?P<day>\d{1,2})\s+(?P<year>\d{4})', re.IGNORECASE)
+_MONTH_YEAR = re.compile(_MONTH_NAME + r'\s+(?P<year>\d{4})', re.IGNORECASE)
+
+
+# function to parse the common date shapes without raising; returns None when nothing matches
+def _fast_date(text, *shapes):
+    for shape in shapes:
+        m = shape.fullmatch(text)
+        if m:
+            try:
+                return datetime(int(m["year"]), _MONTHS[m["month"].lower()], int(m.groupdict().get("day") or 1))
+            except ValueError:
+                return None
+    return None
+
+
+def is_link(text):
+    """Check if a string is a URL or a Wikipedia link (/wiki/ or /w/)."""
+    if not isinstance(text, str):  # Ensure text is a string before matching
+        return False
+    return bool(_LINK.match(text))  # Detects full URLs, /wiki/, and /w/
+
+
+def flatten(item):
+    """Recursively flattens nested lists into a single string, skipping None values."""
+    if isinstance(item, (list, tuple)):
+        return " ".join(flatten(subitem) for subitem in item if subitem is not None)
+    elif isinstance(item, str):
+        return item.strip()
+    else:
+        return str(item)
+
+
+def normalize_movie_name(movie_name):
+    """
+    Normalize movie_name to always be a string.
+    If movie_name is a list with one element, return that element.
+    If movie_name is a list with multiple elements, you can decide:
+      - to join them (e.g., ", ".join(movie_name))
+      - or simply pick the first element.
+    """
+    if isinstance(movie_name, (list, tuple)):
+        if len(movie_name) == 1:
+            return movie_name[0]
+        else:
+            # Depending on your needs, you might join them or simply choose the first element.
+            # Here we choose the first element.
+            return movie_name[0]
+    return movie_name
+
+
+# function to get the ordinal of a number which will be used in the url
+def ordinal(n):
+    if 11 <= n <= 13:
+        return f'{n}th'
+    else: 
+        return f'{n}{["th","st","nd","rd","th","th","th","th","th","th"][n % 10]}'
+
+
+# function to convert date into the formatted input for the database
+@lru_cache(maxsize=CACHE_SIZE)
+def format_date(date_str):
+    # remove brackets and their content if present
+    date_clean = _BRACKETS.sub('', date_str)
+    # remove parenthesized content
+    date_full_clean = _PARENS.sub('', " ".join(date_clean.split()).replace(',', '')).strip()
+    dt = _fast_date(date_full_clean, _DAY_MONTH_YEAR, _MONTH_DAY_YEAR_NO_COMMA)
+    if dt is None:
+        try:
+            dt = datetime.strptime(date_full_clean, '%d %B %Y')
+        except ValueError:
+            try:
+                dt = datetime.strptime(date_full_clean, '%B %d %Y')  # handle 'March 2 2025' format
+            except ValueError:
+                raise ValueError(f"Date format not recognized: {date_full_clean}")
+    return dt.strftime("%Y-%m-%d")
+
+
+# function to convert a film's release date into the formatted input for the database (None,
+# with a warning every time, when it is not a date)
+def format_movie_date(date_str):
+    formatted, cleaned = _format_movie_date(date_str)
+    if formatted is None:
+        log.warning("Error formatting date '%s': Date format not recognized: %s", date_str, cleaned)
+    return formatted
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _format_movie_date(date_str):
+    # Remove citation references like [2], [3] and any parenthesized content
+    # (ISO dates such as (2023-5-21) or venues such as (Tribeca)) in one pass
+    cleaned = _MOVIE_DATE_NOISE.sub('', date_str).strip()
+
+    # Remove any trailing commas or extra spaces
+    cleaned = cleaned.strip(', ')
+
+    # Ensure the cleaned date contains a valid year
+    if not _YEAR.search(cleaned):
+        return None, cleaned
+
+    dt = _fast_date(cleaned, _MONTH_DAY_YEAR, _DAY_MONTH_YEAR, _MONTH_YEAR)
+    if dt is not None:
+        return dt.strftime("%Y-%m-%d"), cleaned
+
+    # Try three common formats: complete and incomplete dates.
+    possible_formats = ["%B %d, %Y", "%d %B %Y", "%B %Y"]
+    for fmt in possible_formats:
+        try:
+            dt = datetime.strptime(cleaned, fmt)
+            return dt.strftime("%Y-%m-%d"), cleaned  # Always return in YYYY-MM-DD format.
+        except ValueError:
+            continue
+
+    return None, cleaned
+
+
+# function to format the site location
+def format_site(site_str):
+    return list(_format_site(site_str))
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _format_site(site_str):
+    # remove any bracketed content (including newlines)
+    site_clean = _BRACKETS_DOTALL.sub('', site_str)
+    # remove parentheses while keeping their content intact
+    site_clean = _PARENS_KEEP.sub(r'\1', site_clean)
+    # replace any occurrence of "in" surrounded by whitespace (including newlines) with a comma
+    site_clean = _SPACED_IN.sub(', ', site_clean)
+    # split on both commas and newlines, strip extra whitespace and remove empty strings
+    return tuple(p.strip() for p in _COMMA_OR_NEWLINE.split(site_clean) if p.strip())
+
+
+def format_person(host_str):
+    if isinstance(host_str, list):
+        formatted_hosts = []
+        for host in host_str:
+            formatted_hosts.extend(_format_person(host))  # extend the list instead of appending
+        return formatted_hosts
+    else:
+        return list(_format_person(host_str))
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _format_person(host_str):
+    # remove citations and extra characters
+    host_clean = _BRACKETS.sub('', host_str).strip()
+    # If the host string starts with '#', ignore it
+    if host_clean.startswith("#"):
+        return ()
+    return tuple(host_clean.split())
+
+
+# function to format raw text into multiple locations
+def format_site_multi(raw_text):
+    # remove bracketed text that appears on its own lines (including its surrounding newline characters)
+    raw_text = _BRACKET_LINE.sub('\n', raw_text)
+    
+    # step 1: split raw_text into blocks separated by blank lines
+    blocks = _BLANK_LINE.split(raw_text.strip())
+
+    locations = []
+    for block in blocks:
+        # split each block into lines and strip unnecessary whitespace
+        lines = [line.strip() for line in block.splitlines() if line.strip()]
+
+        # remove "and", "in" (case insensitive)
+        lines = [line for line in lines if line.lower() not in {"and", "in"}]
+
+        if not lines:
+            continue
+
+        # merge lines that are only punctuation, but if a line starts with a comma and has text,
+        # then treat it as a new entry rather than merging.
+        cleaned_lines = []
+        for line in lines:
+            if line.startswith(","):
+                stripped = line.lstrip(",").strip()
+                # Only merge if nothing remains after stripping
+                if stripped == "":
+                    if cleaned_lines:
+                        cleaned_lines[-1] += " " + stripped
+                    else:
+                        cleaned_lines.append(line)
+                else:
+                    # Append the stripped content as a separate element
+                    cleaned_lines.append(stripped)
+            elif all(char in ",.;:" for char in line):
+                if cleaned_lines:
+                    cleaned_lines[-1] += " " + line.lstrip(",").strip()
+                else:
+                    cleaned_lines.append(line)
+            else:
+                cleaned_lines.append(line)
+
+        # remove parentheses but keep the content inside them
+        cleaned_lines = [line.translate(_PAREN_CHARS).strip() for line in cleaned_lines]
+
+        # assume the first line is the venue name, and subsequent lines are location details
+        venue = cleaned_lines[0]
+        details = []
+        for line in cleaned_lines[1:]:
+            # split correctly on commas and ensure proper separation of city and state
+            parts = [part.strip() for part in _COMMA_SPLIT.split(line) if part.strip()]
+            details.extend(parts)
+        
+        locations.append([venue] + details)
+
+    return locations
+
+
+def format_movie_name(movie_title):
+    #print("this right")
+    # if movie_title is a list, take the first element.
+    if isinstance(movie_title, (list, tuple)):
+        movie_title = movie_title[0]
+    return movie_title.replace(" ", "_")
+
+
+def title_key(title):
+    """Compare page titles the way Wikipedia does (underscores are spaces, first letter is case-insensitive)."""
+    title = unquote(title).replace("_", " ").strip()
+    return title[:1].upper() + title[1:]
+
+
+# function to get the page title of a /wiki/ link (None for File:, Help:, ... and other links)
+def link_title(link):
+    if not link or not link.startswith("/wiki/"):
+        return None
+    title = link[len("/wiki/"):].split("#", 1)[0]
+    if not title or ":" in title:
+        return None
+    return title_key(title)
+
+
+# function to compare names regardless of case, accents and punctuation ("Penélope" == "penelope")
+@lru_cache(maxsize=CACHE_SIZE)
+def fold_name(name):
+    if not name:
+        return ""
+    decomposed = unicodedata.normalize("NFKD", name)
+    stripped = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return " ".join(_NOT_WORD.sub(" ", stripped.casefold().translate(_FOLD_LETTERS)).split())
+
+
+# function to convert the duration strictly into minutes
+@lru_cache(maxsize=CACHE_SIZE)
+def convert_duration_to_minutes(duration_str):
+    total_minutes = 0
+    # look for a pattern like "Xh" (hours)
+    m = _HOURS.search(duration_str)
+    if m:
+        hours = int(m.group(1))
+        total_minutes += hours * 60
+    # look for a pattern like "Ym" (minutes)
+    m = _MINUTES.search(duration_str)
+    if m:
+        minutes = int(m.group(1))
+        total_minutes += minutes
+    # fallback: if no hours/minutes pattern, try to extract a number followed by "minute"
+    if total_minutes == 0:
+        m = _MINUTE_WORD.search(duration_str)
+        if m:
+            total_minutes = int(m.group(1))
+    return total_minutes
+
+
+# function to read a film's running time ("96 minutes[1]") as minutes, None without one
+@lru_cache(maxsize=CACHE_SIZE)
+def running_time_minutes(text):
+    m = _RUNNING_TIME.search(text.strip())
+    return int(m.group(1)) if m else None
+
+
+# function to split the languages of a film infobox row ("EnglishSpanish" or "English Spanish")
+def split_languages(text):
+    return list(_split_languages(text))
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _split_languages(text):
+    language_text = _BRACKETS.sub('', text.strip())
+    if " " not in language_text:
+        return tuple(split_by_capitals(language_text))
+    return tuple(_LANGUAGE_WORD.findall(language_text))
+
+
+# function to split the countries of a film infobox row that is not a list
+def split_countries(text):
+    return list(_split_countries(text))
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _split_countries(text):
+    country_text = clean_text(text.strip())
+    # If there is no whitespace and splitting by capitals yields multiple parts, use that:
+    if " " not in country_text and len(split_by_capitals(country_text)) > 1:
+        return tuple(split_by_capitals(country_text))
+    return tuple(c.strip() for c in country_text.splitlines() if c.strip())
+
+
+# function to get the country out of a person's birthplace ("Bloomington, Minnesota, U.S.[1]")
+@lru_cache(maxsize=CACHE_SIZE)
+def format_birth_country(birthplace, name):
+    country = _BRACKETS_OR_DIGITS.sub('', birthplace.strip()).strip()
+    parts = [part.strip() for part in country.split(",") if part.strip()]
+    if not parts:
+        return None
+    # Remove any trailing closing parenthesis and "citation needed" (case-insensitive)
+    country = _CITATION_NEEDED.sub('', parts[-1].rstrip(')')).strip()
+    # If the country contains digits or the person's name, it is not a country
+    if country and (_DIGIT.search(country) or name.lower() in country.lower()):
+        return None
+    return country
+
+
+def clean_producers(producer_text, movie_title=""):
+    """
+    Cleans producer names by removing extra spaces, unwanted phrases, 
+    and ensuring the movie title is not included.
+    """
+    return list(_clean_producers(producer_text, movie_title))
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _clean_producers(producer_text, movie_title):
+    # Remove trailing "producer(s)" if present
+    producer_text = _TRAILING_ROLE.sub('', producer_text).strip()
+
+    # Remove unwanted phrases and text in parentheses or square brackets (e.g., citations like [32])
+    producer_text = _PRODUCER_NOISE.sub('', producer_text)
+
+    # Standardize delimiters
+    producer_text = producer_text.replace(" and ", ", ")
+    
+    # Remove movie title if present
+    if movie_title:
+        producer_text = producer_text.replace(movie_title, "").strip()
+
+    # Remove unwanted symbols
+    producer_text = producer_text.translate(_PRODUCER_SYMBOLS).strip()
+
+    # Extract names
+    if "," in producer_text:
+        producers = [p.strip() for p in producer_text.split(",") if p.strip()]
+    else:
+        # Extract names in "First Last" or similar format
+        producers = _CAPITALIZED_NAME.findall(producer_text)
+
+    # Remove unwanted strings (e.g., "edit" or citation markers)
+    return tuple(p for p in producers if p.lower() != "edit" and not p.isdecimal())
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def clean_text(text):
+    """Removes bracketed content like [1], [citation needed] from a string."""
+    return _BRACKETS.sub('', text).strip()
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def clean_category(category_text):
+    # Remove any content in square brackets, then strip and lowercase.
+    return _BRACKETS.sub('', category_text).strip().lower()
+
+
+def split_by_capitals(text):
+    return _CAPITALIZED_WORD.findall(text)
+
+
+# function to report hit rates of the memoized helpers (useful after a run)
+def cache_stats():
+    return {f.__name__.lstrip("_"): f.cache_info() for f in _MEMOIZED}
+
+
+def clear_caches():
+    for f in _MEMOIZED:
+        f.cache_clear()
+
+
+_MEMOIZED = (
+    format_date, _format_movie_date, _format_site, _format_person,
+    convert_duration_to_minutes, _clean_producers, clean_text, clean_category, fold_name,
+    running_time_minutes, _split_languages, _split_countries, format_birth_country,
+)
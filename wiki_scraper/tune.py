@@ -0,0 +1,284 @@
+import os
+import sys
+import json
+import time
+import argparse
+import statistics
+from contextlib import contextmanager
+from dataclasses import dataclass
+
+from . import STAGES
+from .logs import get_logger, configure_logging
+from .scheduler import CostModel
+
+log = get_logger("tune")
+
+# tunable options: environment variable that overrides a tuned value, and the value used
+# when neither that, the command line nor a tuning file says otherwise (None: the option's
+# own configure_* default)
+TUNABLE = {
+    "workers": (None, 15),
+    "prefetch": ("SCRAPER_PREFETCH", None),
+    "max_parsed": ("SCRAPER_MAX_PARSED", None),
+    "batch_size": ("SCRAPER_BATCH_SIZE", None),
+    "http2_connections": (None, None),
+}
+
+# values tried per option, in order; the search moves one step up or down at a time
+LADDERS = {
+    "workers": (2, 4, 8, 15, 24, 32, 48, 64),
+    "prefetch": (0, 2, 4, 8, 16, 32),
+    "max_parsed": (1, 2, 4, 8, 16),
+    "batch_size": (100, 250, 500, 1000, 2000),
+    "http2_connections": (1, 2, 4, 8),
+}
+STARTS = {"workers": 15, "prefetch": 0, "max_parsed": 4, "batch_size": 500, "http2_connections": 4}
+
+# a change has to beat the best throughput by this much to count as better, less is noise
+MIN_GAIN = 0.05
+
+
+def _path(path=None):
+    return path or os.getenv("SCRAPER_TUNING", ".scrape_tuning.json")
+
+
+# function to read the recommended settings of the last tuning run (empty when there is none)
+def load_tuning(path=None):
+    try:
+        with open(_path(path), encoding="utf-8") as f:
+            return json.load(f).get("settings", {})
+    except (OSError, ValueError):
+        return {}
+
+
+# function to fill the options not given on the command line (or in their environment variable)
+def apply_tuning(args, settings):
+    for name, (env, default) in TUNABLE.items():
+        if getattr(args, name, None) is not None or (env and env in os.environ):
+            continue
+        setattr(args, name, settings.get(name, default))
+
+
+@dataclass(slots=True)
+class Trial:
+    """One short crawl: the settings it ran with and what came out."""
+    settings: dict
+    seconds: float
+    pages: int
+    p50: float  # film task duration (fetch, parse, people, inserts)
+    p95: float
+
+    @property
+    def throughput(self):
+        return self.pages / self.seconds if self.seconds else 0.0
+
+    def describe(self):
+        knobs = " ".join(f"{name}={value}" for name, value in sorted(self.settings.items()))
+        return (f"{knobs}: {self.throughput:6.1f} pages/s, film p50 {self.p50:5.2f} s, p95 {self.p95:5.2f} s "
+                f"({self.pages} pages in {self.seconds:.1f} s)")
+
+
+class _TrialCosts(CostModel):
+    """The saved timings for ordering the queue, unchanged by the trial; task durations are only collected."""
+
+    def __init__(self, path=None):
+        super().__init__(path)
+        self.durations = {}
+
+    def record(self, kind, key, seconds):
+        with self._lock:
+            self.durations.setdefault(kind, []).append(seconds)
+
+
+def _configure(settings):
+    from .fetch import configure_memory, configure_prefetch, configure_transport
+    from .session import configure_write_behind
+
+    configure_prefetch(settings.get("prefetch", 0))
+    if "max_parsed" in settings:
+        configure_memory(max_parsed=settings["max_parsed"])
+    if "batch_size" in settings:
+        configure_write_behind(batch_size=settings["batch_size"])
+    if "http2_connections" in settings:
+        configure_transport(http2=True, max_connections=settings["http2_connections"])
+
+
+def _execute(*queries):
+    from .db import connect_db
+
+    conn = connect_db()
+    cursor = conn.cursor()
+    try:
+        rows = []
+        for query in queries:
+            cursor.execute(query)
+            rows = cursor.fetchall()
+        return rows
+    finally:
+        cursor.close()
+        conn.close()
+
+
+# function to run a crawl against empty copies of the configured database's tables, dropped
+# afterwards: every trial scrapes and inserts its editions, films and people from scratch
+@contextmanager
+def scratch_database():
+    from .db import get_db_config, use_database
+
+    base = get_db_config()["database"]
+    scratch = f"{base}_tune_{os.getpid()}"
+    tables = _execute("SELECT TABLE_NAME FROM information_schema.TABLES "
+                      "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_TYPE = 'BASE TABLE'")
+    try:
+        _execute(f"DROP DATABASE IF EXISTS `{scratch}`", f"CREATE DATABASE `{scratch}`",
+                 *(f"CREATE TABLE `{scratch}`.`{table}` LIKE `{base}`.`{table}`" for (table,) in tables))
+        use_database(scratch)
+        yield scratch
+    finally:
+        use_database(base)
+        _execute(f"DROP DATABASE IF EXISTS `{scratch}`")
+
+
+# function to crawl the editions once with the given settings, into a scratch database
+def run_trial(settings, editions, stages=STAGES, timings=None):
+    from .cli import run_crawl
+    from .fetch import fetch_count
+
+    _configure(settings)
+    costs = _TrialCosts.load(timings)
+    with scratch_database():
+        pages = fetch_count()
+        start = time.perf_counter()
+        run_crawl(editions, workers=settings["workers"], stages=stages, costs=costs)
+        seconds = time.perf_counter() - start
+    films = sorted(costs.durations.get("film", ())) or [0.0]
+    return Trial(dict(settings), seconds, fetch_count() - pages,
+                 statistics.median(films), films[max(0, int(len(films) * 0.95) - 1)])
+
+
+def frontier(trials):
+    """Trials no other trial beats on both throughput and film p95, fastest first."""
+    best = []
+    for trial in sorted(trials, key=lambda t: (-t.throughput, t.p95)):
+        if not best or trial.p95 < best[-1].p95:
+            best.append(trial)
+    return best
+
+
+# function to hill-climb from start: try one step up and down on every option, move to
+# any clearly faster setting and repeat until nothing improves or the trials run out
+def tune(editions, start, stages=STAGES, max_trials=12, timings=None):
+    trials = {}
+
+    def measure(settings):
+        key = tuple(sorted(settings.items()))
+        if key not in trials:
+            trials[key] = run_trial(settings, editions, stages, timings)
+            log.info("Trial %s/%s %s", len(trials), max_trials, trials[key].describe())
+        return trials[key]
+
+    # the first crawl fills the OS caches and the process caches, so it would flatter every
+    # trial after it; like the trials it writes to a scratch database of its own, so each
+    # trial still scrapes every film
+    log.info("Warm-up crawl of editions %s", ", ".join(map(str, editions)))
+    run_trial(start, editions, stages, timings)
+    best = measure(start)
+    improved = True
+    while improved and len(trials) < max_trials:
+        improved = False
+        for name in start:
+            ladder = LADDERS[name]
+            value = best.settings[name]
+            i = min(range(len(ladder)), key=lambda j: abs(ladder[j] - value))
+            for j in (i - 1, i + 1):
+                if not 0 <= j < len(ladder) or len(trials) >= max_trials:
+                    continue
+                trial = measure({**best.settings, name: ladder[j]})
+                if trial.throughput > best.throughput * (1 + MIN_GAIN):
+                    best, improved = trial, True
+    return best, list(trials.values())
+
+
+# function to pick the setting to recommend: the lowest-latency frontier point whose
+# throughput is within MIN_GAIN of the best
+def recommend(trials):
+    points = frontier(trials)
+    fast = [t for t in points if t.throughput >= points[0].throughput * (1 - MIN_GAIN)]
+    return min(fast, key=lambda t: t.p95)
+
+
+def write_tuning(trial, editions, path=None):
+    path = _path(path)
+    data = {
+        "settings": trial.settings,
+        "measured": {"pages_per_second": round(trial.throughput, 2), "film_p50": round(trial.p50, 3),
+                     "film_p95": round(trial.p95, 3)},
+        "editions": editions,
+        "tuned_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=1, sort_keys=True)
+    os.replace(tmp, path)
+    log.info("Wrote %s", path)
+
+
+def main(argv=None):
+    from .cli import parse_editions, parse_stages
+    from .fetch import configure_archive, close_archive, configure_memory, configure_prefetch, configure_transport
+    from .session import configure_write_behind
+
+    parser = argparse.ArgumentParser(
+        prog="wiki_scraper.tune",
+        description="Find the worker, prefetch and batch settings with the best throughput by running short "
+                    "crawls, and write them where the crawler picks them up. Every crawl writes to an empty copy "
+                    "of the configured database's tables, created next to it and dropped afterwards.",
+    )
+    parser.add_argument("-e", "--editions", type=parse_editions, default=parse_editions("97"),
+                        help="editions every trial crawls, e.g. 95-97 (default: 97)")
+    parser.add_argument("-s", "--stages", type=parse_stages, default=STAGES)
+    parser.add_argument("--archive", default=None,
+                        help="crawl archive to replay, so trials measure the scraper instead of Wikipedia "
+                             "(without one every trial fetches live)")
+    parser.add_argument("--archive-mode", choices=("replay", "offline"), default="offline",
+                        help="with --archive: fetch what the archive lacks (replay) or not (offline, the default)")
+    parser.add_argument("--trials", type=int, default=12, help="crawls to measure at most (default: 12)")
+    parser.add_argument("--low-memory", action="store_true", help="tune under --low-memory, including --max-parsed")
+    parser.add_argument("--write-behind", action="store_true", help="tune under --write-behind, including --batch-size")
+    parser.add_argument("--http2", action="store_true", help="tune under --http2, including --http2-connections")
+    parser.add_argument("--timings", default=None, help="timings file ordering the queue (only read)")
+    parser.add_argument("--out", default=None, help="file to write (default: SCRAPER_TUNING or .scrape_tuning.json)")
+    args = parser.parse_args(argv)
+    configure_logging()
+
+    knobs = ["workers", "prefetch"]
+    if args.low_memory:
+        knobs.append("max_parsed")
+    if args.write_behind:
+        knobs.append("batch_size")
+    if args.http2:
+        knobs.append("http2_connections")
+    # start from the current recommendation, if there is one
+    current = load_tuning(args.out)
+    start = {name: current.get(name, STARTS[name]) for name in knobs}
+
+    configure_memory(low_memory=args.low_memory or None)
+    configure_write_behind(args.write_behind or None)
+    configure_archive(args.archive, args.archive_mode)
+    try:
+        best, trials = tune(args.editions, start, args.stages, args.trials, args.timings)
+    finally:
+        configure_prefetch(0)
+        configure_transport(http2=False)
+        close_archive()
+    log.info("Fastest %s", best.describe())
+    log.info("Throughput/latency frontier:")
+    for trial in frontier(trials):
+        log.info("  %s", trial.describe())
+    chosen = recommend(trials)
+    log.info("Recommended %s", chosen.describe())
+    write_tuning(chosen, args.editions, args.out)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,213 @@
+import os
+import bz2
+import sys
+import gzip
+import json
+import mmap
+import struct
+import hashlib
+import argparse
+
+from .logs import get_logger, configure_logging
+from .text import title_key
+
+log = get_logger("wikidata")
+
+# header: magic, slot count, country count; then the slots of an open-addressing hash table,
+# then the country names (utf-8, one per line) the slots point to
+_MAGIC = b"WSWD0001"
+_HEADER = struct.Struct("<8sII")
+# title hash, birth year/month/day, death year/month/day, country number (0 = unknown)
+_SLOT = struct.Struct("<QhBBhBBH")
+
+HUMAN = "Q5"
+DATE_OF_BIRTH, DATE_OF_DEATH = "P569", "P570"
+PLACE_OF_BIRTH, CITIZENSHIP, COUNTRY = "P19", "P27", "P17"
+
+
+def _title_hash(title):
+    h = int.from_bytes(hashlib.blake2b(title_key(title).encode("utf-8"), digest_size=8).digest(), "little")
+    return h or 1  # 0 marks an empty slot
+
+
+def _format_date(year, month, day):
+    # same shape scrape_person gives a year-only or year-month infobox date
+    if not year:
+        return None
+    return f"{year:04d}-{month or 1:02d}-{day or 1:02d}"
+
+
+class WikidataIndex:
+    """
+    Birth date, birth country and death date of people, keyed by their English Wikipedia title.
+    The file is memory-mapped and looked up through its hash table in place, so opening it
+    is instant, lookups cost a probe or two and every worker thread shares the same pages.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self._slots, count = _HEADER.unpack_from(self._map)
+        if magic != _MAGIC:
+            raise ValueError(f"{path} is not a Wikidata person index")
+        start = _HEADER.size + self._slots * _SLOT.size
+        self._countries = [None] + self._map[start:].decode("utf-8").split("\n")[:count]
+
+    def lookup(self, title):
+        """(birth date, birth country, death date) like scrape_person returns, or None if not indexed."""
+        key = _title_hash(title)
+        i = key % self._slots
+        while True:
+            slot = _SLOT.unpack_from(self._map, _HEADER.size + i * _SLOT.size)
+            if slot[0] == 0:
+                return None
+            if slot[0] == key:
+                return (_format_date(*slot[1:4]), self._countries[slot[7]], _format_date(*slot[4:7]))
+            i = (i + 1) % self._slots
+
+    def __len__(self):
+        return self._slots
+
+    def close(self):
+        self._map.close()
+
+
+_index = None
+
+
+def configure_wikidata(path=None):
+    """Open the person index scrape_person_list consults first (default: SCRAPER_WIKIDATA)."""
+    global _index
+    path = path or os.getenv("SCRAPER_WIKIDATA")
+    if _index is not None:
+        _index.close()
+        _index = None
+    if path:
+        _index = WikidataIndex(path)
+        log.info("Using Wikidata person index %s", path)
+
+
+# function to find a person in the Wikidata index: by link when there is one, by name otherwise
+def lookup_person(name, link=None, entity_type=None):
+    index = _index
+    if index is None:
+        return None
+    if link:
+        title = link.split("/wiki/", 1)[-1]
+        return index.lookup(title.split("#", 1)[0])
+    if entity_type:
+        # can_follow_link prefers "Name (director)" when the plain name is about someone else
+        found = index.lookup(f"{name} ({entity_type})")
+        if found:
+            return found
+    return index.lookup(name)
+
+
+def _entities(path):
+    """Stream the entities of a Wikidata JSON dump (one entity per line inside a JSON array)."""
+    opener = gzip.open if path.endswith(".gz") else bz2.open if path.endswith(".bz2") else open
+    with opener(path, "rb") as f:
+        for line in f:
+            line = line.strip().rstrip(b",")
+            if line in (b"", b"[", b"]"):
+                continue
+            yield json.loads(line)
+
+
+def _values(entity, prop):
+    """Values of a property, preferred-rank statements first and deprecated ones left out."""
+    claims = [c for c in entity.get("claims", {}).get(prop, ()) if c.get("rank") != "deprecated"]
+    claims.sort(key=lambda c: c.get("rank") != "preferred")
+    for claim in claims:
+        snak = claim.get("mainsnak", {})
+        if snak.get("snaktype") == "value":
+            yield snak["datavalue"]["value"]
+
+
+def _first_item(entity, prop):
+    return next((value["id"] for value in _values(entity, prop)), None)
+
+
+def _first_date(entity, prop):
+    for value in _values(entity, prop):
+        time, precision = value["time"], value.get("precision", 11)
+        if time.startswith("-") or precision < 9:
+            continue
+        year, month, day = (int(part) for part in time[1:11].split("-"))
+        return (year, month if precision >= 10 else 0, day if precision >= 11 else 0)
+    return None
+
+
+def _label(entity):
+    return entity.get("labels", {}).get("en", {}).get("value")
+
+
+# function to build the person index from a Wikidata JSON dump (or a subset of one)
+def build_index(dump_path, out_path):
+    people = {}
+    places, countries = set(), set()
+    # pass 1: people with an English article and their dates, birthplace and citizenship
+    for entity in _entities(dump_path):
+        title = entity.get("sitelinks", {}).get("enwiki", {}).get("title")
+        if not title or HUMAN not in (v["id"] for v in _values(entity, "P31")):
+            continue
+        born, died = _first_date(entity, DATE_OF_BIRTH), _first_date(entity, DATE_OF_DEATH)
+        place, citizenship = _first_item(entity, PLACE_OF_BIRTH), _first_item(entity, CITIZENSHIP)
+        if not (born or died or place or citizenship):
+            continue
+        people[title] = (born, died, place, citizenship)
+        places.add(place)
+        countries.add(citizenship)
+    log.info("%s people with an English article", len(people))
+
+    # pass 2 (and 3 if needed): country of each birthplace, English name of each country
+    place_country, labels = {}, {}
+    for _ in range(2):
+        for entity in _entities(dump_path):
+            qid = entity.get("id")
+            if qid in places and qid not in place_country:
+                place_country[qid] = _first_item(entity, COUNTRY)
+            if qid in countries and qid not in labels:
+                labels[qid] = _label(entity)
+        missing = set(place_country.values()) - set(labels) - {None}
+        if not missing:
+            break
+        countries = missing
+
+    names = sorted({labels[q] for q in labels if labels[q]})
+    number = {name: i + 1 for i, name in enumerate(names)}
+    slots = max(1, len(people) * 2)  # half full: lookups rarely probe more than twice
+    table = bytearray(slots * _SLOT.size)
+    for title, (born, died, place, citizenship) in people.items():
+        # birthplace country first (what the infobox birthplace gives), citizenship otherwise
+        country = labels.get(place_country.get(place)) or labels.get(citizenship)
+        key = _title_hash(title)
+        i = key % slots
+        while _SLOT.unpack_from(table, i * _SLOT.size)[0] not in (0, key):
+            i = (i + 1) % slots
+        _SLOT.pack_into(table, i * _SLOT.size, key, *(born or (0, 0, 0)), *(died or (0, 0, 0)),
+                        number.get(country, 0))
+    tmp = f"{out_path}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(_HEADER.pack(_MAGIC, slots, len(names)))
+        f.write(table)
+        f.write("\n".join(names).encode("utf-8"))
+    os.replace(tmp, out_path)
+    log.info("Wrote %s people and %s countries to %s", len(people), len(names), out_path)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="wiki_scraper.wikidata",
+        description="Build the person index scrape_person_list consults before fetching a page.",
+    )
+    parser.add_argument("dump", help="Wikidata JSON dump (.json, .json.gz or .json.bz2), e.g. a subset of humans")
+    parser.add_argument("index", help="index file to write")
+    args = parser.parse_args(argv)
+    configure_logging()
+    build_index(args.dump, args.index)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
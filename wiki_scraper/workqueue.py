@@ -0,0 +1,334 @@
+import os
+import json
+import time
+import uuid
+import socket
+import hashlib
+import sqlite3
+import threading
+
+from .logs import get_logger
+from .scheduler import LEVELS, set_remote
+
+log = get_logger("workqueue")
+
+# seconds a leased item stays invisible to other workers without a heartbeat
+DEFAULT_LEASE_TIMEOUT = 300
+# a worker that crashes this many times on an item gets it marked failed
+MAX_ATTEMPTS = 3
+# seconds between polls while waiting for work or results
+POLL_INTERVAL = 0.5
+
+_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS work_items (
+        kind VARCHAR(16) NOT NULL,
+        item_key VARCHAR(255) NOT NULL,
+        payload TEXT NOT NULL,
+        level INTEGER NOT NULL DEFAULT 0,
+        priority DOUBLE NOT NULL DEFAULT 0,
+        status VARCHAR(8) NOT NULL DEFAULT 'queued',
+        lease_owner VARCHAR(128),
+        lease_expires DOUBLE,
+        attempts INTEGER NOT NULL DEFAULT 0,
+        result TEXT,
+        error TEXT,
+        PRIMARY KEY (kind, item_key)
+    )
+"""
+
+
+class WorkItem:
+    __slots__ = ("kind", "key", "payload")
+
+    def __init__(self, kind, key, payload):
+        self.kind = kind
+        self.key = key
+        self.payload = payload
+
+
+class SQLWorkQueue:
+    """
+    Lease-based work queue kept in a single SQL table.
+    lease() hands an item to one worker for lease_timeout seconds; the owner keeps it by
+    calling heartbeat(), and an item whose lease ran out (dead worker) becomes visible to
+    everyone again. Results are stored with the item so any node can read them back.
+    Subclasses only provide the connection, the placeholder style and the atomic lease step.
+    """
+
+    placeholder = "?"
+    insert_ignore = "INSERT OR IGNORE"
+
+    def __init__(self, lease_timeout=DEFAULT_LEASE_TIMEOUT, max_attempts=MAX_ATTEMPTS):
+        self.lease_timeout = lease_timeout
+        self.max_attempts = max_attempts
+        self._local = threading.local()
+
+    def _connect(self):
+        raise NotImplementedError
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = self._connect()
+        return conn
+
+    def _sql(self, query):
+        return query.replace("?", self.placeholder)
+
+    def _execute(self, query, params=()):
+        conn = self._conn()
+        cursor = conn.cursor()
+        cursor.execute(self._sql(query), params)
+        rows = cursor.fetchall() if cursor.description else None
+        conn.commit()
+        cursor.close()
+        return rows
+
+    def create(self):
+        self._execute(_SCHEMA)
+
+    def enqueue(self, kind, key, payload, priority=0.0):
+        self._execute(
+            f"{self.insert_ignore} INTO work_items (kind, item_key, payload, level, priority) VALUES (?, ?, ?, ?, ?)",
+            (kind, str(key), json.dumps(payload), LEVELS.get(kind, 0), priority),
+        )
+        return str(key)
+
+    def lease(self, owner, kinds=None):
+        raise NotImplementedError
+
+    def _lease_filter(self, kinds):
+        where = "(status = 'queued' OR (status = 'leased' AND lease_expires < ?)) AND attempts < ?"
+        if kinds:
+            where += " AND kind IN (" + ", ".join("?" for _ in kinds) + ")"
+        return where
+
+    def _expire_exhausted(self, now):
+        # items whose worker died max_attempts times will never finish; stop handing them out
+        self._execute(
+            "UPDATE work_items SET status = 'failed', error = 'lease expired too often' "
+            "WHERE status = 'leased' AND lease_expires < ? AND attempts >= ?",
+            (now, self.max_attempts),
+        )
+
+    def heartbeat(self, owner):
+        """Extend every lease held by owner; one statement however many items it holds."""
+        self._execute(
+            "UPDATE work_items SET lease_expires = ? WHERE status = 'leased' AND lease_owner = ?",
+            (time.time() + self.lease_timeout, owner),
+        )
+
+    def complete(self, item, owner, result=None):
+        self._execute(
+            "UPDATE work_items SET status = 'done', result = ?, lease_owner = NULL, lease_expires = NULL "
+            "WHERE kind = ? AND item_key = ? AND lease_owner = ?",
+            (json.dumps(result, default=list), item.kind, item.key, owner),
+        )
+
+    def fail(self, item, owner, error):
+        self._execute(
+            "UPDATE work_items SET status = CASE WHEN attempts >= ? THEN 'failed' ELSE 'queued' END, "
+            "error = ?, lease_owner = NULL, lease_expires = NULL "
+            "WHERE kind = ? AND item_key = ? AND lease_owner = ?",
+            (self.max_attempts, str(error)[:2000], item.kind, item.key, owner),
+        )
+
+    def results(self, kind, keys):
+        """{key: (status, result, error)} for the given items."""
+        out = {}
+        keys = list(keys)
+        for i in range(0, len(keys), 500):
+            chunk = keys[i:i + 500]
+            rows = self._execute(
+                "SELECT item_key, status, result, error FROM work_items WHERE kind = ? AND item_key IN ("
+                + ", ".join("?" for _ in chunk) + ")",
+                (kind, *chunk),
+            )
+            for key, status, result, error in rows:
+                out[key] = (status, json.loads(result) if result else None, error)
+        return out
+
+    def drained(self):
+        """True when nothing is queued or leased any more."""
+        self._expire_exhausted(time.time())
+        rows = self._execute("SELECT COUNT(*) FROM work_items WHERE status IN ('queued', 'leased')")
+        return rows[0][0] == 0
+
+    def stats(self):
+        return dict(self._execute("SELECT status, COUNT(*) FROM work_items GROUP BY status"))
+
+
+class SQLiteWorkQueue(SQLWorkQueue):
+    """Queue in a SQLite file; fine for several processes on one machine or a local stand-in."""
+
+    def __init__(self, path, **kwargs):
+        super().__init__(**kwargs)
+        self.path = path
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    def _execute(self, query, params=()):
+        # isolation_level=None: every statement commits on its own
+        cursor = self._conn().execute(self._sql(query), params)
+        return cursor.fetchall() if cursor.description else None
+
+    def lease(self, owner, kinds=None):
+        now = time.time()
+        self._expire_exhausted(now)
+        conn = self._conn()
+        # BEGIN IMMEDIATE takes the write lock up front, so two processes cannot pick the same row
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                f"SELECT kind, item_key, payload FROM work_items WHERE {self._lease_filter(kinds)} "
+                "ORDER BY level, priority DESC LIMIT 1",
+                (now, self.max_attempts, *(kinds or ())),
+            ).fetchone()
+            if row:
+                conn.execute(
+                    "UPDATE work_items SET status = 'leased', lease_owner = ?, lease_expires = ?, "
+                    "attempts = attempts + 1 WHERE kind = ? AND item_key = ?",
+                    (owner, now + self.lease_timeout, row[0], row[1]),
+                )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return WorkItem(row[0], row[1], json.loads(row[2])) if row else None
+
+
+class MySQLWorkQueue(SQLWorkQueue):
+    """Queue table in the scraper's own MySQL database, reachable from every crawler machine."""
+
+    placeholder = "%s"
+    insert_ignore = "INSERT IGNORE"
+
+    def _connect(self):
+        from .db import connect_db
+        return connect_db()
+
+    def lease(self, owner, kinds=None):
+        now = time.time()
+        self._expire_exhausted(now)
+        conn = self._conn()
+        cursor = conn.cursor()
+        try:
+            # SKIP LOCKED lets concurrent workers each grab a different row without waiting
+            cursor.execute(
+                self._sql(
+                    f"SELECT kind, item_key, payload FROM work_items WHERE {self._lease_filter(kinds)} "
+                    "ORDER BY level, priority DESC LIMIT 1 FOR UPDATE SKIP LOCKED"
+                ),
+                (now, self.max_attempts, *(kinds or ())),
+            )
+            row = cursor.fetchone()
+            if row:
+                cursor.execute(
+                    self._sql(
+                        "UPDATE work_items SET status = 'leased', lease_owner = ?, lease_expires = ?, "
+                        "attempts = attempts + 1 WHERE kind = ? AND item_key = ?"
+                    ),
+                    (owner, now + self.lease_timeout, row[0], row[1]),
+                )
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+        finally:
+            cursor.close()
+        return WorkItem(row[0], row[1], json.loads(row[2])) if row else None
+
+
+# function to open the queue named on the command line: "mysql" or a SQLite file path
+def open_queue(spec, lease_timeout=DEFAULT_LEASE_TIMEOUT):
+    if spec == "mysql":
+        queue = MySQLWorkQueue(lease_timeout=lease_timeout)
+    else:
+        queue = SQLiteWorkQueue(spec, lease_timeout=lease_timeout)
+    queue.create()
+    return queue
+
+
+def _item_key(item):
+    return hashlib.sha1(json.dumps(item, sort_keys=True, default=list).encode("utf-8")).hexdigest()
+
+
+class QueueWorker:
+    """
+    Pulls items from a shared queue and runs them with the registered handlers
+    ({"edition": fn, "film": fn, "person": fn}), until the queue is drained.
+    While a handler fans out (run_tasks), the sub-items go to the shared queue too, so any
+    node can pick them up; the waiting thread helps by running film/person items itself.
+    """
+
+    def __init__(self, queue, handlers, workers=4, owner=None):
+        self.queue = queue
+        self.handlers = handlers
+        self.workers = max(1, workers)
+        self.owner = owner or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._stop = threading.Event()
+
+    def handles(self, kind):
+        return kind in self.handlers
+
+    def run(self):
+        heartbeat = threading.Thread(target=self._heartbeat, name="queue-heartbeat", daemon=True)
+        heartbeat.start()
+        threads = [threading.Thread(target=self._loop, name=f"queue-worker-{i}") for i in range(self.workers)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self._stop.set()
+        heartbeat.join()
+
+    def _heartbeat(self):
+        while not self._stop.wait(self.queue.lease_timeout / 3):
+            try:
+                self.queue.heartbeat(self.owner)
+            except Exception as e:
+                log.warning("Heartbeat failed: %s", e)
+
+    def _loop(self):
+        set_remote(self)
+        while True:
+            item = self.queue.lease(self.owner)
+            if item is not None:
+                self.execute(item)
+            elif self.queue.drained():
+                return
+            else:
+                # everything left is leased by someone else; wait in case a lease expires
+                time.sleep(POLL_INTERVAL)
+
+    def execute(self, item):
+        try:
+            result = self.handlers[item.kind](item.payload)
+        except Exception as e:
+            log.exception("Work item %s:%s failed: %s", item.kind, item.key, e)
+            self.queue.fail(item, self.owner, e)
+        else:
+            self.queue.complete(item, self.owner, result)
+
+    def map(self, kind, items, keys=None):
+        """Queue items as shared work and return their results in order (called through run_tasks)."""
+        keys = [str(k) for k in keys] if keys else [_item_key(item) for item in items]
+        for item, key in zip(items, keys):
+            self.queue.enqueue(kind, key, item)
+        helpable = [k for k, level in LEVELS.items() if level <= LEVELS["film"]]
+        while True:
+            results = self.queue.results(kind, set(keys))
+            if all(results.get(k, ("queued",))[0] in ("done", "failed") for k in keys):
+                break
+            item = self.queue.lease(self.owner, helpable)
+            if item is not None:
+                self.execute(item)
+            else:
+                time.sleep(POLL_INTERVAL)
+        failed = [k for k in keys if results[k][0] == "failed"]
+        if failed:
+            raise RuntimeError(f"{len(failed)} {kind} item(s) failed, e.g. {results[failed[0]][2]}")
+        return [results[k][1] for k in keys]